@@ -21,8 +21,18 @@ if config.config_file_name is not None:
 
 # Import your Base metadata from your application
 from app.db.base import Base
+import app.models  # noqa: F401  Registers every model on Base.metadata
 target_metadata = Base.metadata
 
+def include_name(name, type_, parent_names):
+    """
+    Only the app's own tables take part in autogenerate. n8n keeps its tables in the same
+    database, and a migration must never drop (or even look at) them.
+    """
+    if type_ == "table":
+        return name in target_metadata.tables
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -44,6 +54,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -58,6 +69,12 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # The app passes its own connection when it migrates on startup (app/db/migrations.py)
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -65,12 +82,15 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+        do_run_migrations(connection)
 
-        with context.begin_transaction():
-            context.run_migrations()
+def do_run_migrations(connection) -> None:
+    context.configure(
+        connection=connection, target_metadata=target_metadata, include_name=include_name
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
 
 
 if context.is_offline_mode():
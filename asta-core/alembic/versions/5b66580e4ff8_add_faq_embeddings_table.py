@@ -0,0 +1,34 @@
+"""add_faq_embeddings_table
+
+Revision ID: 5b66580e4ff8
+Revises: ef114837eaab
+Create Date: 2026-10-18 02:05:11.402913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b66580e4ff8'
+down_revision: Union[str, None] = 'ef114837eaab'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('faq_embeddings',
+    sa.Column('faq_id', sa.Integer(), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('dim', sa.Integer(), nullable=False),
+    sa.Column('vector', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['faq_id'], ['faqs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('faq_id', 'model')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('faq_embeddings')
@@ -0,0 +1,28 @@
+"""add_active_embedding_model
+
+Revision ID: 6e3a9f1c2b84
+Revises: d41f7b2c8e65
+Create Date: 2026-10-18 14:37:05.216734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e3a9f1c2b84'
+down_revision: Union[str, None] = 'd41f7b2c8e65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('faq_corpus', sa.Column('embedding_model', sa.String(length=100), nullable=True))
+    op.add_column('faq_corpus', sa.Column('embedding_source', sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('faq_corpus', 'embedding_source')
+    op.drop_column('faq_corpus', 'embedding_model')
@@ -0,0 +1,36 @@
+"""add_faq_corpus_version
+
+Revision ID: 9c2d4e7a1f30
+Revises: 5b66580e4ff8
+Create Date: 2026-10-18 09:12:44.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c2d4e7a1f30'
+down_revision: Union[str, None] = '5b66580e4ff8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    faq_corpus = op.create_table('faq_corpus',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(faq_corpus, [{'id': 1, 'version': 0}])
+
+    op.add_column('faqs', sa.Column('version', sa.BigInteger(), server_default='0', nullable=False))
+    op.create_index(op.f('ix_faqs_version'), 'faqs', ['version'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_faqs_version'), table_name='faqs')
+    op.drop_column('faqs', 'version')
+    op.drop_table('faq_corpus')
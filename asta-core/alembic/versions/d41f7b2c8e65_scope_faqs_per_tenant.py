@@ -0,0 +1,47 @@
+"""scope_faqs_per_tenant
+
+Revision ID: d41f7b2c8e65
+Revises: 9c2d4e7a1f30
+Create Date: 2026-10-18 11:03:27.540918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f7b2c8e65'
+down_revision: Union[str, None] = '9c2d4e7a1f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Names constraints that were created without one, so batch mode can drop them on SQLite.
+_NAMING_CONVENTION = {"uq": "uq_%(table_name)s_%(column_0_name)s"}
+
+
+def upgrade() -> None:
+    # Existing FAQs become the shared knowledge base (tenant '').
+    op.add_column('faqs', sa.Column('tenant', sa.String(length=255), server_default='', nullable=False))
+    op.create_index(op.f('ix_faqs_tenant'), 'faqs', ['tenant'], unique=False)
+    # The old unique constraint on the question alone: named faqs_question_key by the baseline
+    # (and by PostgreSQL for tables from the old `create_all`), unnamed on SQLite `create_all`
+    # tables, where the naming convention below names it when the table is reflected.
+    question_keys = [
+        constraint['name'] for constraint in sa.inspect(op.get_bind()).get_unique_constraints('faqs')
+        if constraint['column_names'] == ['question']
+    ]
+    # Batch mode: SQLite can't ALTER constraints, so there the table is copied (a plain ALTER elsewhere).
+    with op.batch_alter_table('faqs', naming_convention=_NAMING_CONVENTION) as batch_op:
+        for name in question_keys:
+            batch_op.drop_constraint(name or 'uq_faqs_question', type_='unique')
+        batch_op.create_unique_constraint('uq_faqs_tenant_question', ['tenant', 'question'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('faqs') as batch_op:
+        batch_op.drop_constraint('uq_faqs_tenant_question', type_='unique')
+        batch_op.create_unique_constraint('faqs_question_key', ['question'])
+    op.drop_index(op.f('ix_faqs_tenant'), table_name='faqs')
+    op.drop_column('faqs', 'tenant')
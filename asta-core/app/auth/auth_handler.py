@@ -1,13 +1,22 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
-from app.db.session import get_db
+from app.db.session import get_primary_read_db
 from app.schemas.user import TokenData
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
-from sqlalchemy import select
+from app.auth.principal import Principal, principal_cache
+from app.auth.revocation import token_denylist
+from app.core.cache import TTLCache
+from app.core.executor import BoundedExecutor, ExecutorOverloaded
+from sqlalchemy import bindparam, select
 import os
 from dotenv import load_dotenv
 
@@ -18,11 +27,24 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 
+# Password hashing runs in its own pool: each bcrypt call takes a few hundred milliseconds of CPU.
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", min(4, os.cpu_count() or 2)))
+AUTH_HASH_QUEUE_SIZE = int(os.getenv("AUTH_HASH_QUEUE_SIZE", 32))  # Logins / sign-ups allowed to wait for a worker
+AUTH_HASH_TIMEOUT = float(os.getenv("AUTH_HASH_TIMEOUT", 10.0))    # Seconds, including time spent waiting
+
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", 10000))  # Verified tokens kept; 0 disables the cache
+
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # This tells FastAPI that the tokenUrl is the endpoint for login
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+# Same, for routes that also serve anonymous callers (no token -> None instead of 401)
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login", auto_error=False)
+
+# Runs on every authenticated request, so it is built once with the id as a bound parameter:
+# SQLAlchemy keeps the statement's cache key and compiled SQL, and asyncpg its prepared statement.
+user_by_id_query = select(User).where(User.id == bindparam("user_id"))
 
 def verify_password(plain_password, hashed_password):
     """Verifies a plain text password against a hashed password."""
@@ -32,6 +54,90 @@ def get_password_hash(password):
     """Hashes a plain text password."""
     return pwd_context.hash(password)
 
+def _make_hash_executor(max_workers: int) -> ThreadPoolExecutor:
+    # bcrypt releases the GIL while it hashes, so threads hash in parallel without blocking the event loop.
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+
+hash_pool = BoundedExecutor("password hashing", _make_hash_executor, AUTH_HASH_WORKERS, AUTH_HASH_QUEUE_SIZE, AUTH_HASH_TIMEOUT)
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    """`verify_password` in the hashing pool, off the event loop. Raises ExecutorOverloaded when it is full."""
+    return await hash_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password) -> str:
+    """`get_password_hash` in the hashing pool, off the event loop. Raises ExecutorOverloaded when it is full."""
+    return await hash_pool.run(get_password_hash, password)
+
+@contextmanager
+def hashing_errors():
+    """Turns a full or slow hashing pool into 503 / 504 responses, so a login storm is shed early."""
+    try:
+        yield
+    except ExecutorOverloaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-ins at the moment. Please try again shortly.",
+            headers={"Retry-After": "1"},
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Checking the password took too long. Please try again.",
+        )
+
+# Access tokens whose signature and claims were already verified: sha256(token) -> (user id, exp).
+# Clients send the same token for its whole life, so only its first request pays for the JWT check.
+# Each entry expires with its token, and `exp` and the revocation denylist are checked on every hit.
+token_cache = TTLCache(AUTH_TOKEN_CACHE_SIZE, ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+async def verify_access_token(token: str) -> int:
+    """
+    Checks an access token and returns its user id; raises JWTError if it is invalid,
+    expired or revoked. Tokens seen before are answered from `token_cache`.
+    """
+    digest = _token_digest(token)
+    now = time.time()
+    if await token_denylist.is_revoked(digest):
+        raise JWTError("Token has been revoked.")
+
+    cached = token_cache.get(digest)
+    if cached is not None:
+        user_id, expires_at = cached
+        if expires_at > now:
+            return user_id
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        raise JWTError("Token has no subject.")
+    token_data = TokenData(id=user_id)
+
+    # Tokens without an expiry are accepted (as before) but never cached.
+    expires_at = payload.get("exp")
+    if isinstance(expires_at, (int, float)):
+        token_cache.set(digest, (int(token_data.id), expires_at), ttl=expires_at - now)
+    return int(token_data.id)
+
+async def revoke_token(token: str) -> None:
+    """
+    Rejects a token from now on (e.g. on logout), even though its signature is valid and
+    it may still be cached. It is kept in `token_denylist` until it would have expired.
+    """
+    digest = _token_digest(token)
+    token_cache.pop(digest)
+    try:
+        claims = jwt.get_unverified_claims(token)
+    except JWTError:
+        return  # Not a JWT, so never accepted anyway
+    expires_at = claims.get("exp")
+    await token_denylist.revoke(digest, expires_at if isinstance(expires_at, (int, float)) else float("inf"))
+
+def token_cache_stats() -> dict:
+    return {**token_cache.stats(), "revoked": token_denylist.stats()}
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     """
     Creates a new JWT access token.
@@ -45,9 +151,12 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_primary_read_db)) -> Principal:
     """
-    FastAPI Dependency that will be used to protect routes. Now fully implemented to return a User object.
+    FastAPI Dependency that will be used to protect routes. Returns the authenticated user as a
+    `Principal`, from the principal cache when the user was seen recently (no query then).
+    A token already verified is not checked again (see `verify_access_token`). Deactivated
+    users are refused like invalid tokens.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -55,19 +164,57 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-        token_data = TokenData(id=user_id)
+        user_id = await verify_access_token(token)
     except JWTError:
         raise credentials_exception
 
-    query = select(User).where(User.id == int(token_data.id))
-    result = await db.execute(query)
-    user = result.scalar_one_or_none()
-    
-    if user is None:
-        raise credentials_exception
+    principal = await principal_cache.get(user_id)
+    if principal is None:
+        result = await db.execute(user_by_id_query, {"user_id": user_id})
+        user = result.scalar_one_or_none()
         
+        if user is None:
+            raise credentials_exception
+
+        principal = Principal.from_user(user)
+        await principal_cache.set(principal)
+
+    if not principal.is_active:
+        raise credentials_exception
+    return principal
+
+async def get_current_admin(user: Principal = Depends(get_current_user)) -> Principal:
+    """
+    Like `get_current_user`, for admin routes: users without the superuser flag get a 403.
+    """
+    if not user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can do this.")
     return user
+
+async def get_optional_user(token: str | None = Depends(optional_oauth2_scheme), db: AsyncSession = Depends(get_primary_read_db)):
+    """
+    For public routes: the authenticated user, or None (anonymous) when no token is sent or
+    the token isn't valid (e.g. expired), so a stale token never locks anyone out of them.
+    """
+    if token is None:
+        return None
+    try:
+        return await get_current_user(token, db)
+    except HTTPException as e:
+        if e.status_code != status.HTTP_401_UNAUTHORIZED:
+            raise
+        return None
+
+async def get_optional_user_strict(token: str | None = Depends(optional_oauth2_scheme), db: AsyncSession = Depends(get_primary_read_db)):
+    """
+    Like `get_optional_user`, but an invalid token is rejected (401) instead of treated as
+    anonymous. For writes: a company user whose token expired must not end up writing to
+    the shared FAQ base.
+    """
+    if token is None:
+        return None
+    return await get_current_user(token, db)
+
+def get_tenant(user: Principal | None) -> str:
+    """The FAQ tenant a user belongs to: their company, or "" (the shared FAQ base)."""
+    return (user.company_name or "") if user is not None else ""
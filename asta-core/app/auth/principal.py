@@ -0,0 +1,102 @@
+"""
+Cache of authenticated principals, so a request with a valid token doesn't have to read
+the `users` table: `get_current_user` looks the token's user id up here first.
+
+A principal is the user as routes use it (`Principal`), never the password hash or an
+ORM object. Entries live AUTH_PRINCIPAL_CACHE_TTL seconds, so a change to a user reaches
+every worker within that time. Every path that changes or deactivates a `users` row must
+call `invalidate_principal` once it has committed, to drop it at once; today that is
+`DELETE /users/{id}` (deactivation). Rows changed outside the app (e.g. in psql) are only
+picked up when their entry expires.
+
+AUTH_PRINCIPAL_CACHE_BACKEND selects where principals are kept:
+
+    local              in this worker's memory (a bounded LRU), the default
+    package.module:fn  a backend shared by the workers (e.g. on Redis): `fn(max_size, ttl)`
+                       returns an object with the methods of `PrincipalCacheBackend`.
+                       Invalidations then reach every worker.
+"""
+import importlib
+import os
+from dataclasses import dataclass
+from typing import Optional, Protocol
+from dotenv import load_dotenv
+
+from app.core.cache import TTLCache
+
+load_dotenv()
+
+AUTH_PRINCIPAL_CACHE_SIZE = int(os.getenv("AUTH_PRINCIPAL_CACHE_SIZE", 10000))  # Users kept; 0 disables the cache
+AUTH_PRINCIPAL_CACHE_TTL = float(os.getenv("AUTH_PRINCIPAL_CACHE_TTL", 60))     # Seconds
+AUTH_PRINCIPAL_CACHE_BACKEND = os.getenv("AUTH_PRINCIPAL_CACHE_BACKEND", "local")
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user: the fields routes read, without the password hash."""
+
+    id: int
+    email: str
+    full_name: Optional[str] = None
+    company_name: Optional[str] = None
+    is_active: bool = True
+    is_superuser: bool = False
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            company_name=user.company_name,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+        )
+
+
+class PrincipalCacheBackend(Protocol):
+    async def get(self, user_id: int) -> Optional[Principal]: ...
+
+    async def set(self, principal: Principal) -> None: ...
+
+    async def invalidate(self, user_id: int) -> None: ...
+
+    def stats(self) -> dict: ...
+
+
+class LocalPrincipalCache:
+    """Principals in this worker's memory. Invalidations only reach this worker; others catch up within the TTL."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.cache = TTLCache(max_size, ttl)
+
+    async def get(self, user_id: int) -> Optional[Principal]:
+        return self.cache.get(user_id)
+
+    async def set(self, principal: Principal) -> None:
+        self.cache.set(principal.id, principal)
+
+    async def invalidate(self, user_id: int) -> None:
+        self.cache.pop(user_id)
+
+    def stats(self) -> dict:
+        return {"backend": "local", **self.cache.stats()}
+
+
+def load_backend(spec: str) -> PrincipalCacheBackend:
+    """Creates the backend named by AUTH_PRINCIPAL_CACHE_BACKEND."""
+    if spec == "local":
+        return LocalPrincipalCache(AUTH_PRINCIPAL_CACHE_SIZE, AUTH_PRINCIPAL_CACHE_TTL)
+    module, _, name = spec.partition(":")
+    if not module or not name:
+        raise ValueError(f"AUTH_PRINCIPAL_CACHE_BACKEND must be 'local' or 'package.module:factory', not '{spec}'.")
+    factory = getattr(importlib.import_module(module), name)
+    return factory(AUTH_PRINCIPAL_CACHE_SIZE, AUTH_PRINCIPAL_CACHE_TTL)
+
+
+principal_cache = load_backend(AUTH_PRINCIPAL_CACHE_BACKEND)
+
+
+async def invalidate_principal(user_id: int) -> None:
+    """Drops a user's cached principal; call it after changing or deactivating the user."""
+    await principal_cache.invalidate(user_id)
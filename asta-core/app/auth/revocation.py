@@ -0,0 +1,67 @@
+"""
+Revoked access tokens (e.g. on logout), keyed by the SHA-256 digest of the token. A token
+stays valid until its `exp` otherwise, and `verify_access_token` consults this denylist on
+every request, before the verified-token cache, so a revoked token is rejected even if
+it is still cached.
+
+AUTH_TOKEN_DENYLIST_BACKEND selects where revocations are kept:
+
+    local              in this worker's memory, the default. A revocation only reaches
+                       the worker that received it (fine with a single worker).
+    package.module:fn  a denylist shared by the workers (e.g. on Redis): `fn()` returns an
+                       object with the methods of `TokenDenylistBackend`.
+"""
+import importlib
+import os
+import time
+from typing import Protocol
+from dotenv import load_dotenv
+
+load_dotenv()
+
+AUTH_TOKEN_DENYLIST_BACKEND = os.getenv("AUTH_TOKEN_DENYLIST_BACKEND", "local")
+
+
+class TokenDenylistBackend(Protocol):
+    async def is_revoked(self, digest: bytes) -> bool: ...
+
+    async def revoke(self, digest: bytes, expires_at: float) -> None: ...
+
+    def stats(self) -> dict: ...
+
+
+class LocalTokenDenylist:
+    """
+    Revocations in this worker's memory: digest -> the token's `exp`. Not bounded like the
+    token cache, so a revocation can't be evicted; entries are dropped once the token has
+    expired anyway.
+    """
+
+    def __init__(self):
+        self._revoked: dict[bytes, float] = {}
+
+    async def is_revoked(self, digest: bytes) -> bool:
+        return digest in self._revoked
+
+    async def revoke(self, digest: bytes, expires_at: float) -> None:
+        now = time.time()
+        for revoked, revoked_until in list(self._revoked.items()):
+            if revoked_until <= now:
+                del self._revoked[revoked]
+        self._revoked[digest] = expires_at
+
+    def stats(self) -> dict:
+        return {"backend": "local", "size": len(self._revoked)}
+
+
+def load_backend(spec: str) -> TokenDenylistBackend:
+    """Creates the denylist named by AUTH_TOKEN_DENYLIST_BACKEND."""
+    if spec == "local":
+        return LocalTokenDenylist()
+    module, _, name = spec.partition(":")
+    if not module or not name:
+        raise ValueError(f"AUTH_TOKEN_DENYLIST_BACKEND must be 'local' or 'package.module:factory', not '{spec}'.")
+    return getattr(importlib.import_module(module), name)()
+
+
+token_denylist = load_backend(AUTH_TOKEN_DENYLIST_BACKEND)
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable
+
+
+class ExecutorOverloaded(Exception):
+    """Raised when a BoundedExecutor already has as much work queued as it accepts."""
+
+
+class BoundedExecutor:
+    """
+    Runs blocking or CPU-heavy functions off the event loop, with limits.
+
+    - At most `max_workers` calls run at once, and at most `max_queue` more wait.
+      Anything beyond that is rejected immediately with ExecutorOverloaded, so a
+      burst degrades into fast errors instead of an ever-growing backlog.
+    - Each call is given up on after `timeout` seconds (asyncio.TimeoutError).
+      A call that is already running keeps its worker until it finishes.
+
+    The underlying executor is created on first use by `executor_factory(max_workers)`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        executor_factory: Callable[[int], Executor],
+        max_workers: int,
+        max_queue: int,
+        timeout: float | None = None,
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor_factory = executor_factory
+        self._executor: Executor | None = None
+
+        # Counters for the metrics endpoint.
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._executor_factory(self.max_workers)
+        return self._executor
+
+    def replace_executor(self, executor: Executor) -> Executor | None:
+        """
+        Sends new calls to `executor` from now on and returns the previous executor.
+        Calls already submitted finish on the previous one; the caller shuts it down.
+        """
+        previous, self._executor = self._executor, executor
+        return previous
+
+    @property
+    def queued(self) -> int:
+        return max(0, self.in_flight - self.max_workers)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: float | None = None) -> Any:
+        """Runs `fn(*args)` in the pool and returns its result. `timeout` overrides the pool's for this call."""
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise ExecutorOverloaded(f"The {self.name} pool is busy.")
+
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+            result = await asyncio.wait_for(future, timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+        elapsed = time.perf_counter() - started
+        self.completed += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        return result
+
+    def stats(self) -> dict:
+        """Current queue depth and timing, for monitoring."""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "avg_ms": round(1000 * self.total_seconds / self.completed, 3) if self.completed else 0.0,
+            "max_ms": round(1000 * self.max_seconds, 3),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
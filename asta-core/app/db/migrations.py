@@ -0,0 +1,96 @@
+"""
+Schema check on startup, instead of `Base.metadata.create_all` in every worker.
+
+The Alembic head revision(s) of this code are read from the migration scripts, the
+database's from `alembic_version`: when they match, which is every start but the first
+after a deploy, that one query is all startup costs. Otherwise DB_MIGRATIONS decides:
+
+    upgrade  migrate to the head. On PostgreSQL under an advisory lock, so of several
+             workers starting together one migrates and the others wait for it and then
+             find nothing left to do. (SQLite has no such lock: start one worker first.)
+    check    refuse to start; migrate in a release step with `alembic upgrade head`.
+    off      skip the check.
+"""
+import os
+from functools import lru_cache
+from typing import FrozenSet
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import db_settings
+from app.db.session import engine
+
+_ALEMBIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic")
+
+# Key of the PostgreSQL advisory lock taken while migrating; the same in every worker.
+_MIGRATION_LOCK_ID = 0x41535441  # 'ASTA'
+
+
+def _alembic_config() -> Config:
+    # Built without alembic.ini: loading it would reconfigure the app's logging.
+    config = Config()
+    config.set_main_option("script_location", _ALEMBIC_DIR)
+    return config
+
+
+@lru_cache(maxsize=1)
+def head_revisions() -> FrozenSet[str]:
+    """The head revision(s) of the migration scripts shipped with this code."""
+    return frozenset(ScriptDirectory.from_config(_alembic_config()).get_heads())
+
+
+async def current_revisions(conn: AsyncConnection) -> FrozenSet[str]:
+    """The database's revision(s); empty if it has never been migrated."""
+    try:
+        # In a savepoint, so a missing table doesn't end the transaction (and the lock)
+        async with conn.begin_nested():
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            return frozenset(result.scalars())
+    except DBAPIError:
+        return frozenset()  # No alembic_version table yet
+
+
+def _describe(revisions: FrozenSet[str]) -> str:
+    return ", ".join(sorted(revisions)) or "none"
+
+
+def _upgrade(connection) -> None:
+    config = _alembic_config()
+    config.attributes["connection"] = connection  # env.py migrates on this connection
+    command.upgrade(config, "head")
+
+
+async def migrate_database() -> None:
+    """Makes sure the database is at this code's head revision before requests are served."""
+    if db_settings.migrations == "off":
+        return
+
+    head = head_revisions()
+    async with engine.connect() as conn:
+        current = await current_revisions(conn)
+        if current == head:
+            return
+
+        if db_settings.migrations == "check":
+            raise RuntimeError(
+                f"The database is at revision {_describe(current)}, this code expects {_describe(head)}. "
+                "Run `alembic upgrade head` (or set DB_MIGRATIONS=upgrade)."
+            )
+
+        if engine.dialect.name == "postgresql":
+            # Held until this transaction ends; workers that lose the race wait here.
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": _MIGRATION_LOCK_ID})
+            current = await current_revisions(conn)
+            if current == head:
+                await conn.commit()
+                return
+
+        print(f"Migrating the database from revision {_describe(current)} to {_describe(head)}...")
+        await conn.run_sync(_upgrade)
+        await conn.commit()
+        print("Database migrated.")
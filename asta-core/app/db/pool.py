@@ -0,0 +1,80 @@
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolStats:
+    """
+    Counters for one connection pool: checkouts, time spent waiting for a free
+    connection, timeouts, and connections opened or invalidated (e.g. by pre-ping).
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.waits = 0          # Checkouts that had to wait (no idle connection)
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_checkout(self, seconds: float, timed_out: bool = False) -> None:
+        self.checkouts += 1
+        self.timeouts += timed_out
+        # Handing out an idle connection takes microseconds; anything slower waited or connected.
+        if seconds > 0.001:
+            self.waits += 1
+        self.wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def watch(self, pool: Pool) -> None:
+        """Counts the pool's new and invalidated connections (kept across `engine.dispose()`)."""
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self.invalidations += 1
+
+    def stats(self, pool: Pool) -> dict:
+        """Current pool usage plus the counters, for the metrics endpoint."""
+        stats = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),  # Negative until the pool has opened `size` connections
+                "max_overflow": pool._max_overflow,
+                "timeout_seconds": pool.timeout(),
+            })
+        stats.update({
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "avg_wait_ms": round(1000 * self.wait_seconds / self.checkouts, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait_seconds, 3),
+        })
+        return stats
+
+
+def instrumented_pool(stats: PoolStats) -> type:
+    """An AsyncAdaptedQueuePool class that records every checkout's wait in `stats`."""
+
+    class InstrumentedPool(AsyncAdaptedQueuePool):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeout:
+                stats.record_checkout(time.perf_counter() - started, timed_out=True)
+                raise
+            stats.record_checkout(time.perf_counter() - started)
+            return connection
+
+    return InstrumentedPool
@@ -0,0 +1,68 @@
+import itertools
+import time
+from typing import List
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.db.pool import PoolStats
+
+
+class Replica:
+    """A read replica's engine, with its pool counters and health."""
+
+    def __init__(self, url: str, engine: AsyncEngine, pool_stats: PoolStats):
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.engine = engine
+        self.read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")  # Same pool, no transactions
+        self.pool_stats = pool_stats
+        self.in_use = 0         # Read sessions currently open on it
+        self.failures = 0
+        self.down_until = 0.0   # time.monotonic() until which it is skipped
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+
+class ReplicaSet:
+    """
+    Chooses the replica for each read session, either in turn ("round_robin") or the one
+    with the fewest open read sessions ("least_connections"). A replica that can't be
+    reached is skipped for `retry_seconds`; with none left, reads go to the primary.
+    """
+
+    def __init__(self, replicas: List[Replica], balance: str, retry_seconds: float):
+        self.replicas = replicas
+        self.balance = balance
+        self.retry_seconds = retry_seconds
+        self._turn = itertools.count()
+
+    def candidates(self) -> List[Replica]:
+        """The available replicas, in the order to try them."""
+        available = [replica for replica in self.replicas if replica.available]
+        if not available:
+            return []
+        if self.balance == "least_connections":
+            return sorted(available, key=lambda replica: replica.in_use)
+        start = next(self._turn) % len(available)
+        return available[start:] + available[:start]
+
+    def mark_down(self, replica: Replica, error: Exception) -> None:
+        replica.failures += 1
+        replica.down_until = time.monotonic() + self.retry_seconds
+        print(f"Read replica {replica.name} is unavailable ({error}); skipping it for {self.retry_seconds:g}s.")
+
+    def stats(self) -> dict:
+        return {
+            "balance": self.balance,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "available": replica.available,
+                    "in_use": replica.in_use,
+                    "failures": replica.failures,
+                    "pool": replica.pool_stats.stats(replica.engine.sync_engine.pool),
+                }
+                for replica in self.replicas
+            ],
+        }
@@ -0,0 +1,70 @@
+"""
+Embedded SQLite backend, for load tests and benchmarks on a laptop or CI box without
+PostgreSQL: DATABASE_URL=sqlite+aiosqlite:///./asta.db (put the file on a tmpfs to take
+the disk out of the measurements). Migrations create the schema on startup as usual.
+
+SQLite runs one write transaction at a time, so the engines are set up for that:
+
+- WAL journal: readers don't block the writer, nor the writer them.
+- Writes (`get_db`, CLI tools, index backfills) share a single connection. Concurrent
+  requests queue for it in the pool, visible in `GET /metrics/db`, instead of failing
+  with "database is locked". Its transactions BEGIN IMMEDIATE: they take the write lock
+  up front, so one never has to upgrade a read lock held while another process wrote.
+- Reads (`get_read_db`, authentication, FAQ sync) have a pool of their own (DB_POOL_SIZE).
+- Pragmas (DB_SQLITE_*): synchronous=NORMAL (safe with WAL: a power loss can drop the
+  last commits, never corrupt the file), busy timeout, page cache and memory-mapped I/O.
+
+What PostgreSQL does and SQLite doesn't, and what happens instead: no LISTEN/NOTIFY (other
+workers sync FAQs by polling, FAQ_SYNC_INTERVAL), no advisory lock for migrations (start
+one worker first), no row locks (the single writer serializes FAQ version claims), no
+connection parameters for asyncpg, and foreign keys aren't enforced (SQLite's default;
+batch migrations recreate tables, which would cascade deletes otherwise).
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import db_settings
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def sqlite_engine_options(url: str, writer: bool) -> dict:
+    """Pool options for a SQLite engine: one connection for writing, a pool for reading."""
+    database = make_url(url).database
+    if not database or database == ":memory:" or database.startswith("file::memory:"):
+        raise ValueError(
+            "An in-memory SQLite database isn't shared between the app's connections. "
+            "Use a database file (on a tmpfs, to keep it in memory)."
+        )
+    if writer:
+        return {"pool_size": 1, "max_overflow": 0, "pool_timeout": db_settings.pool_timeout}
+    return {
+        "pool_size": db_settings.pool_size,
+        "max_overflow": db_settings.max_overflow,
+        "pool_timeout": db_settings.pool_timeout,
+    }
+
+
+def configure_sqlite(engine: AsyncEngine, writer: bool) -> None:
+    """Applies the pragmas to every new connection and, for the writer, BEGIN IMMEDIATE."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        # Transactions are begun explicitly (below), not by the driver before the first write.
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={db_settings.sqlite_synchronous.upper()}")
+        cursor.execute(f"PRAGMA busy_timeout={int(db_settings.sqlite_busy_timeout * 1000)}")
+        cursor.execute(f"PRAGMA cache_size={-1024 * db_settings.sqlite_cache_mb}")  # Negative: KiB
+        cursor.execute(f"PRAGMA mmap_size={1024 * 1024 * db_settings.sqlite_mmap_mb}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _on_begin(conn):
+        if conn.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+            conn.exec_driver_sql("BEGIN IMMEDIATE" if writer else "BEGIN")
@@ -1,21 +1,38 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from app.db.session import engine
-from app.db.base import Base  # <-- ADD THIS IMPORT
-from app.routes import auth, user, task, faq
+from app.db.session import dispose_engines
+from app.db.migrations import migrate_database
+from app.auth.auth_handler import hash_pool
+from app.routes import auth, user, task, faq, metrics
+from app.nlp.workers import nlp_pool, start_nlp_pool
+from app.db.session import ReadSessionLocal
+from app.nlp.sync import adopt_embedding_model, start_faq_sync, stop_faq_sync
+from app.nlp.training import stop_index_training
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Create all database tables based on SQLAlchemy models
-    print("Creating database tables if they don't exist...")
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    print("Database tables verified/created!")
+    # Startup: Check the database is at the latest Alembic revision (migrating it if allowed, see DB_MIGRATIONS)
+    await migrate_database()
+    print("Database schema is up to date!")
+
+    # Use the embedding model activated by `app.nlp.reembed`, if it isn't the configured one
+    async with ReadSessionLocal() as db:
+        await adopt_embedding_model(db)
+
+    # Start the NLP workers now, so the first question doesn't pay for loading the model
+    await start_nlp_pool()
+
+    # Keep this worker's FAQ index in step with FAQs written through other workers
+    start_faq_sync()
     
     yield  # The application runs here
     
-    # Shutdown: Close the database engine
-    await engine.dispose()
+    # Shutdown: Stop syncing, index training, the NLP workers and the password hashing threads, then close the database engines
+    await stop_faq_sync()
+    await stop_index_training()
+    nlp_pool.shutdown()
+    hash_pool.shutdown()
+    await dispose_engines()
 
 # Create the FastAPI application instance
 app = FastAPI(
@@ -30,6 +47,7 @@ app.include_router(auth.router)
 app.include_router(user.router, prefix="/users", tags=["users"])
 app.include_router(task.router, prefix="/tasks", tags=["tasks"])
 app.include_router(faq.router, prefix="/faq", tags=["FAQ"])
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 
 # A simple root endpoint to test if the API is running
 @app.get("/")
@@ -1,3 +1,5 @@
 from .user import User
 from .task import Task
 from .faq import FAQ
+from .faq_embedding import FAQEmbedding
+from .faq_corpus import FAQCorpus
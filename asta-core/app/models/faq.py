@@ -1,13 +1,17 @@
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import BigInteger, Column, Integer, String, Text, UniqueConstraint
 from app.db.base import Base
 
 class FAQ(Base):
     __tablename__ = "faqs"
+    # A question is unique within its tenant's knowledge base
+    __table_args__ = (UniqueConstraint("tenant", "question", name="uq_faqs_tenant_question"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    question = Column(String, nullable=False, unique=True)  # The user's likely question
+    tenant = Column(String(255), nullable=False, default="", server_default="", index=True)  # Owner's company_name; "" is the shared FAQ base
+    question = Column(String, nullable=False)               # The user's likely question
     answer = Column(Text, nullable=False)                   # The assistant's response
     category = Column(String, default="general")            # e.g., "finance", "tax", "general"
+    version = Column(BigInteger, nullable=False, default=0, server_default="0", index=True)  # Corpus version of the last write
 
     def __repr__(self):
         return f"<FAQ {self.id}: {self.question}>"
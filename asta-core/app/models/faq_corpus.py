@@ -0,0 +1,23 @@
+from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+class FAQCorpus(Base):
+    """
+    ORM model for the single-row 'faq_corpus' table.
+    `version` is bumped by every FAQ write, and the written FAQs are stamped with the
+    new value, so each API worker can tell cheaply whether its in-memory FAQ index is
+    stale and fetch only the FAQs that changed since.
+
+    `embedding_model` is the model whose vectors answer questions, once one has been
+    activated by `python -m app.nlp.reembed`; until then workers use their configured model.
+    """
+    __tablename__ = "faq_corpus"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)  # Always 1
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    embedding_model: Mapped[str | None] = mapped_column(String(100))   # e.g. 'en_core_web_lg-3.7.1'
+    embedding_source: Mapped[str | None] = mapped_column(String(255))  # How to load it, e.g. 'spacy:en_core_web_lg'
+
+    def __repr__(self):
+        return f"<FAQCorpus(version={self.version})>"
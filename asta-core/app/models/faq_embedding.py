@@ -0,0 +1,24 @@
+from sqlalchemy import ForeignKey, String, Integer, LargeBinary, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+from datetime import datetime
+
+class FAQEmbedding(Base):
+    """
+    ORM model for the 'faq_embeddings' table.
+    Stores the vector of an FAQ question, computed once when the FAQ is written,
+    so workers can load the whole corpus with one bulk read instead of re-parsing it.
+    """
+    __tablename__ = "faq_embeddings"
+
+    # One row per FAQ per embedding model, so vectors from different models never mix.
+    faq_id: Mapped[int] = mapped_column(ForeignKey("faqs.id", ondelete="CASCADE"), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100), primary_key=True)  # e.g. 'en_core_web_md-3.7.0'
+
+    dim: Mapped[int] = mapped_column(Integer, nullable=False)
+    vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # Raw little-endian float32 values
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+    def __repr__(self):
+        return f"<FAQEmbedding(faq_id={self.faq_id}, model={self.model})>"
@@ -0,0 +1,230 @@
+import os
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, List, Sequence, Tuple
+from dotenv import load_dotenv
+
+from app.nlp.index import FAQIndex, normalize_rows
+from app.nlp.storage import FAQ_VECTOR_STORAGE
+
+load_dotenv()
+
+# Which index to build for the FAQ corpus: "exact" (brute force) or "ivf" (approximate).
+FAQ_INDEX = os.getenv("FAQ_INDEX", "ivf")
+# Below this many FAQs the IVF index is not trained and every FAQ is scored (exact results).
+FAQ_IVF_MIN_SIZE = int(os.getenv("FAQ_IVF_MIN_SIZE", 5000))
+# Number of k-means partitions; 0 picks about sqrt(number of FAQs).
+FAQ_IVF_LISTS = int(os.getenv("FAQ_IVF_LISTS", 0))
+# Partitions searched per question. Higher means better recall but more scoring work.
+FAQ_IVF_PROBE = int(os.getenv("FAQ_IVF_PROBE", 8))
+
+# Rows scored at once when assigning FAQs to partitions, to bound temporary memory.
+_ASSIGN_CHUNK = 8192
+
+
+def spherical_kmeans(data: np.ndarray, k: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """
+    k-means on the unit sphere: points are assigned by cosine similarity and
+    centroids are re-normalized after each update. Returns a (k, dim) matrix.
+    """
+    rng = np.random.default_rng(seed)
+    centroids = data[rng.choice(len(data), size=k, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = np.argmax(data @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, data)
+        counts = np.bincount(assignment, minlength=k)
+
+        # Re-seed empty partitions with random points so none stay dead.
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            sums[empty] = data[rng.choice(len(data), size=len(empty), replace=False)]
+
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+
+    return centroids
+
+
+@dataclass
+class IVFClusters:
+    """
+    A trained IVF partitioning: the centroids, the FAQ positions in each partition and
+    each position's partition. An index swaps in a new one as a whole, so a search in a
+    worker thread never pairs new centroids with old lists.
+    """
+    centroids: np.ndarray
+    lists: List[np.ndarray]
+    assignment: np.ndarray
+    trained_size: int  # FAQs it was trained on (positions 0 to trained_size - 1)
+
+
+def assign_partitions(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Nearest partition for each (normalized) vector."""
+    assignment = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), _ASSIGN_CHUNK):
+        chunk = vectors[start:start + _ASSIGN_CHUNK]
+        assignment[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignment
+
+
+def train_clusters(vectors: np.ndarray, k: int, iterations: int = 10, sample: int = 50000) -> IVFClusters:
+    """
+    Clusters the (normalized) FAQ vectors into `k` partitions. Pure CPU work on its
+    arguments, so it can run in the NLP pool while the index keeps serving.
+    """
+    n = len(vectors)
+    if n > sample:
+        rows = np.random.default_rng(0).choice(n, size=sample, replace=False)
+        centroids = spherical_kmeans(vectors[rows], k, iterations)
+    else:
+        centroids = spherical_kmeans(vectors, k, iterations)
+
+    assignment = assign_partitions(vectors, centroids)
+    order = np.argsort(assignment, kind="stable")
+    bounds = np.searchsorted(assignment[order], np.arange(k + 1))
+    lists = [order[bounds[i]:bounds[i + 1]] for i in range(k)]
+    return IVFClusters(centroids, lists, assignment, n)
+
+
+class IVFIndex(FAQIndex):
+    """
+    Inverted-file (IVF) approximate index in pure NumPy.
+    FAQ vectors are clustered with spherical k-means; a question is scored only
+    against the FAQs in its `n_probe` closest partitions.
+
+    Scores are still exact cosine similarities for the FAQs that are looked at,
+    so the 0.6 threshold means the same thing: the index can miss a better FAQ
+    in an unprobed partition, but it never returns a worse match than it reports.
+
+    An index is trained when it is built. Inserts never train (they run on the event
+    loop): once the corpus reaches `min_size` or has doubled, `training_due` is set and
+    `app.nlp.training` retrains it in the background (`training_job`, then `install`).
+    Until then new FAQs join their nearest existing partition, or are all scored.
+    """
+
+    def __init__(
+        self,
+        rows: Sequence[Any],
+        vectors: np.ndarray | None = None,
+        dim: int = 0,
+        n_lists: int = FAQ_IVF_LISTS,
+        n_probe: int = FAQ_IVF_PROBE,
+        min_size: int = FAQ_IVF_MIN_SIZE,
+        train_iterations: int = 10,
+        train_sample: int = 50000,
+        storage: str = FAQ_VECTOR_STORAGE,
+    ):
+        super().__init__(rows, vectors, dim, storage)
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.min_size = min_size
+        self.train_iterations = train_iterations
+        self.train_sample = train_sample
+
+        self.clusters: IVFClusters | None = None
+        self.training = False  # A background training job is running
+
+        if len(self) >= max(self.min_size, 1):
+            self.train()
+
+    @property
+    def is_trained(self) -> bool:
+        return self.clusters is not None
+
+    @property
+    def centroids(self) -> np.ndarray | None:
+        clusters = self.clusters
+        return None if clusters is None else clusters.centroids
+
+    @property
+    def lists(self) -> List[np.ndarray]:
+        clusters = self.clusters
+        return [] if clusters is None else clusters.lists
+
+    @property
+    def training_due(self) -> bool:
+        """Whether the corpus has reached `min_size` or doubled since it was last clustered."""
+        clusters = self.clusters
+        if clusters is None:
+            return len(self) >= max(self.min_size, 1)
+        return len(self) >= 2 * clusters.trained_size
+
+    def training_job(self) -> tuple:
+        """Arguments for `train_clusters` over a copy of the current vectors (safe to use off the loop)."""
+        n = len(self)
+        k = max(1, min(self.n_lists or int(np.sqrt(n)), n))
+        return np.array(self.vectors(slice(0, n))), k, self.train_iterations, self.train_sample
+
+    def train(self) -> None:
+        """(Re)clusters the whole corpus in place, blocking. Used when the index is built."""
+        self.install(train_clusters(*self.training_job()))
+
+    def install(self, clusters: IVFClusters) -> None:
+        """
+        Swaps in a partitioning trained on the first `clusters.trained_size` FAQs.
+        FAQs added meanwhile are assigned to its partitions first.
+        """
+        added = range(clusters.trained_size, len(self))
+        if len(added):
+            extra = assign_partitions(self.vectors(slice(added.start, added.stop)), clusters.centroids)
+            lists = list(clusters.lists)
+            for partition in np.unique(extra):
+                lists[partition] = np.concatenate([lists[partition], np.asarray(added)[extra == partition]])
+            clusters = IVFClusters(
+                clusters.centroids, lists, np.concatenate([clusters.assignment, extra]), clusters.trained_size
+            )
+        self.clusters = clusters
+
+    def candidates(self, query: np.ndarray) -> np.ndarray | None:
+        clusters = self.clusters  # One read: centroids and lists always belong together
+        if clusters is None:
+            return None  # Small corpus: exact search.
+
+        n_probe = min(self.n_probe, len(clusters.lists))
+        if n_probe >= len(clusters.lists):
+            return None
+        centroid_scores = clusters.centroids @ query
+        probe = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+        return np.concatenate([clusters.lists[i] for i in probe])
+
+    def search_many(self, vectors: np.ndarray) -> List[Tuple[Any | None, float]]:
+        if not self.is_trained:
+            return super().search_many(vectors)
+        # Each question probes different partitions, so they are scored one by one.
+        return [self.search(vector) for vector in normalize_rows(vectors)]
+
+    def add(self, row: Any, vector: np.ndarray) -> int:
+        """Inserts one FAQ into its nearest partition (or, untrained, into the exact search)."""
+        position = super().add(row, vector)
+        clusters = self.clusters
+        if clusters is None:
+            return position
+
+        partition = int(assign_partitions(self.vectors(slice(position, position + 1)), clusters.centroids)[0])
+        clusters.assignment = np.append(clusters.assignment, partition)
+        clusters.lists[partition] = np.append(clusters.lists[partition], position)
+        return position
+
+    def _replace_vector(self, position: int, vector: np.ndarray) -> None:
+        super()._replace_vector(position, vector)
+        clusters = self.clusters
+        if clusters is None or position >= len(clusters.assignment):
+            return
+        old = int(clusters.assignment[position])
+        new = int(assign_partitions(self.vectors(slice(position, position + 1)), clusters.centroids)[0])
+        if old != new:
+            clusters.lists[old] = clusters.lists[old][clusters.lists[old] != position]
+            clusters.lists[new] = np.append(clusters.lists[new], position)
+            clusters.assignment[position] = new
+
+
+def make_index(rows: Sequence[Any], vectors: np.ndarray | None = None, dim: int = 0) -> FAQIndex:
+    """Builds the FAQ index type selected by `FAQ_INDEX`."""
+    if FAQ_INDEX == "exact":
+        return FAQIndex(rows, vectors, dim)
+    if FAQ_INDEX == "ivf":
+        return IVFIndex(rows, vectors, dim)
+    raise ValueError(f"Unknown FAQ_INDEX '{FAQ_INDEX}'. Must be 'exact' or 'ivf'.")
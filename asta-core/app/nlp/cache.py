@@ -0,0 +1,23 @@
+import os
+from typing import Optional, Sequence, Tuple
+from dotenv import load_dotenv
+
+from app.core.cache import TTLCache
+from app.nlp.loader import get_corpus_version
+from app.nlp.utils import normalize_question
+
+load_dotenv()
+
+FAQ_CACHE_SIZE = int(os.getenv("FAQ_CACHE_SIZE", 10000))  # Distinct questions kept; 0 disables the cache
+FAQ_CACHE_TTL = float(os.getenv("FAQ_CACHE_TTL", 300))    # Seconds
+
+# Answers to recently asked questions: (tenants searched, normalized question, category hint) -> (matched FAQ id or None, score).
+# Keys include the corpus version of every tenant searched (a company and the shared base), so
+# creating or editing an FAQ (or reloading an index) invalidates the cached answers built on it
+# at once; the old entries are never read again and age out of the LRU. Tenants share the cache
+# but never each other's answers.
+answer_cache = TTLCache(FAQ_CACHE_SIZE, FAQ_CACHE_TTL)
+
+def answer_key(tenants: Sequence[str], question: str, category: Optional[str] = None) -> Tuple:
+    versions = tuple((tenant, get_corpus_version(tenant)) for tenant in tenants)
+    return versions, normalize_question(question), category
@@ -0,0 +1,248 @@
+"""
+Tiered FAQ matching. Each question goes through the cheapest stage that can answer it:
+
+1. exact   - O(1) dict lookup of the normalized question (no embedding, no scoring)
+2. lexical - BM25 keyword shortlist, then vector re-ranking of only those FAQs;
+             accepted if the best shortlisted FAQ reaches the similarity threshold
+3. vector  - the vector index (exact or IVF) of the categories the question is
+             routed to (see `app.nlp.routing`), or of the hinted category only
+
+Stage 2 can accept a shortlisted FAQ while an FAQ with no shared keywords would
+have scored higher. That is the trade-off for scoring tens of FAQs instead of
+the whole corpus; set FAQ_CASCADE=0 to always use the full vector search.
+"""
+import os
+import time
+import numpy as np
+from typing import Any, Dict, List, Sequence, Tuple
+from dotenv import load_dotenv
+
+from app.nlp.lexical import BM25Index
+from app.nlp.routing import CategoryRouter
+from app.nlp.utils import SIMILARITY_THRESHOLD, normalize_question
+
+load_dotenv()
+
+FAQ_CASCADE = os.getenv("FAQ_CASCADE", "1") == "1"
+FAQ_SHORTLIST_SIZE = int(os.getenv("FAQ_SHORTLIST_SIZE", 50))
+
+STAGES = ("exact", "lexical", "vector")
+
+# Rough in-memory cost of one FAQ besides its vector (the row, the exact and keyword
+# lookups), used to keep the loaded tenants within their memory budget.
+_ROW_OVERHEAD_BYTES = 1024
+
+
+class CascadeStats:
+    """Per-stage attempts, hits and time, plus how many FAQ vectors each question cost."""
+
+    def __init__(self):
+        self.attempts = dict.fromkeys(STAGES, 0)
+        self.hits = dict.fromkeys(STAGES, 0)
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.questions = 0
+        self.rows_scored = 0
+
+    def record(self, stage: str, hit: bool, seconds: float) -> None:
+        self.attempts[stage] += 1
+        self.hits[stage] += hit
+        self.seconds[stage] += seconds
+
+    def stats(self, corpus_size: int) -> dict:
+        stages = {}
+        for stage in STAGES:
+            attempts = self.attempts[stage]
+            stages[stage] = {
+                "attempts": attempts,
+                "hits": self.hits[stage],
+                "hit_rate": round(self.hits[stage] / attempts, 4) if attempts else 0.0,
+                "avg_ms": round(1000 * self.seconds[stage] / attempts, 4) if attempts else 0.0,
+            }
+        return {
+            "enabled": FAQ_CASCADE,
+            "stages": stages,
+            "questions": self.questions,
+            "corpus_size": corpus_size,
+            "avg_rows_scored": round(self.rows_scored / self.questions, 2) if self.questions else 0.0,
+        }
+
+
+class FAQMatcher:
+    """
+    The served FAQ corpus: the per-category vector indexes plus an exact-question
+    lookup and a keyword index kept in step with them, matched as a cascade (see module docstring).
+
+    Every stage takes an optional `category`; when given, only FAQs of that category are returned.
+    A matcher serves one tenant's FAQs; matchers can share one `CascadeStats`.
+    """
+
+    def __init__(
+        self,
+        rows: Sequence[Any],
+        vectors: np.ndarray | None,
+        dim: int,
+        tenant: str = "",
+        stats: CascadeStats | None = None,
+    ):
+        self.tenant = tenant
+        self.tenants = (tenant,)
+        self.version = 0  # Database corpus version this matcher reflects (set by the loader)
+        self.index = CategoryRouter(rows, vectors, dim)
+        self.exact: Dict[str, int] = {}
+        self.lexical = BM25Index()
+        self.stats = stats if stats is not None else CascadeStats()
+        for row in rows:
+            self.exact[normalize_question(row.question)] = row.id
+            self.lexical.set(row.id, row.question)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def get(self, faq_id: int) -> Any | None:
+        return self.index.get(faq_id)
+
+    def memory_bytes(self) -> int:
+        """Estimated memory held by this matcher (vectors plus per-FAQ overhead)."""
+        vectors = sum(partition.store.nbytes for partition in self.index.partitions.values())
+        return vectors + len(self) * _ROW_OVERHEAD_BYTES
+
+    def upsert(self, row: Any, vector: np.ndarray | None) -> None:
+        """Adds or replaces an FAQ in every stage."""
+        old = self.index.get(row.id)
+        if old is not None and self.exact.get(normalize_question(old.question)) == row.id:
+            del self.exact[normalize_question(old.question)]
+
+        self.index.upsert(row, vector)
+        self.exact[normalize_question(row.question)] = row.id
+        self.lexical.set(row.id, row.question)
+
+    def match_exact(self, question: str, category: str | None = None) -> Any | None:
+        """Stage 1. Cheap enough to run on the event loop, before any embedding."""
+        started = time.perf_counter()
+        faq_id = self.exact.get(normalize_question(question)) if FAQ_CASCADE else None
+        row = None if faq_id is None else self.index.get(faq_id)
+        if row is not None and category is not None and CategoryRouter.category_of(row) != category:
+            row = None
+        if FAQ_CASCADE:
+            self.stats.record("exact", row is not None, time.perf_counter() - started)
+        if row is not None:
+            self.stats.questions += 1
+        return row
+
+    def _match_lexical(self, question: str, vector: np.ndarray, category: str | None) -> Tuple[Any | None, float]:
+        """Stage 2. Returns (None, score) if the shortlist has no FAQ above the threshold."""
+        started = time.perf_counter()
+        shortlist = self.lexical.shortlist(question, FAQ_SHORTLIST_SIZE)
+        if category is not None:
+            shortlist = [
+                faq_id for faq_id in shortlist.tolist()
+                if CategoryRouter.category_of(self.index.get(faq_id)) == category
+            ]
+        best, score = self.index.search_among(vector, shortlist)
+        accepted = best is not None and score >= SIMILARITY_THRESHOLD
+        self.stats.record("lexical", accepted, time.perf_counter() - started)
+        self.stats.rows_scored += len(shortlist)
+        return (best, score) if accepted else (None, score)
+
+    def match_vector(
+        self, question: str, vector: np.ndarray, category: str | None = None
+    ) -> Tuple[Any | None, float]:
+        """
+        Stages 2 and 3 for an embedded question.
+        Returns (best FAQ or None if below the threshold, similarity score).
+        """
+        self.stats.questions += 1
+        if FAQ_CASCADE:
+            best, score = self._match_lexical(question, vector, category)
+            if best is not None:
+                return best, score
+
+        started = time.perf_counter()
+        scored_before = self.index.rows_scored
+        best, score = self.index.search(vector, category)
+        self.stats.rows_scored += self.index.rows_scored - scored_before
+        accepted = best is not None and score >= SIMILARITY_THRESHOLD
+        self.stats.record("vector", accepted, time.perf_counter() - started)
+        return (best, score) if accepted else (None, score)
+
+    def match_vectors(
+        self, questions: List[str], vectors: np.ndarray, category: str | None = None
+    ) -> List[Tuple[Any | None, float]]:
+        """
+        Batch version of `match_vector`. Questions the keyword stage can't answer
+        are scored together, one matrix-matrix product per routed category.
+        """
+        results: List[Tuple[Any | None, float] | None] = [None] * len(questions)
+        remaining = list(range(len(questions)))
+        self.stats.questions += len(questions)
+
+        if FAQ_CASCADE:
+            remaining = []
+            for position, (question, vector) in enumerate(zip(questions, vectors)):
+                best, score = self._match_lexical(question, vector, category)
+                if best is not None:
+                    results[position] = (best, score)
+                else:
+                    remaining.append(position)
+
+        if remaining:
+            started = time.perf_counter()
+            scored_before = self.index.rows_scored
+            matches = self.index.search_many(vectors[remaining], category)
+            self.stats.rows_scored += self.index.rows_scored - scored_before
+            elapsed = (time.perf_counter() - started) / len(remaining)
+            for position, (best, score) in zip(remaining, matches):
+                accepted = best is not None and score >= SIMILARITY_THRESHOLD
+                self.stats.record("vector", accepted, elapsed)
+                results[position] = (best, score) if accepted else (None, score)
+
+        return results
+
+
+class LayeredMatcher:
+    """
+    A company's matcher searched together with the shared one ("" tenant), with the same
+    methods as `FAQMatcher`. Company users see their own FAQs and the shared base: an exact
+    question is looked up in the company's FAQs first, and for embedded questions the best
+    score of either corpus wins (the company's FAQ on a tie).
+    """
+
+    def __init__(self, matchers: Sequence[FAQMatcher]):
+        self.matchers = list(matchers)
+        self.tenant = self.matchers[0].tenant
+        self.tenants = tuple(matcher.tenant for matcher in self.matchers)
+
+    def __len__(self) -> int:
+        return sum(len(matcher) for matcher in self.matchers)
+
+    def get(self, faq_id: int) -> Any | None:
+        for matcher in self.matchers:
+            row = matcher.get(faq_id)
+            if row is not None:
+                return row
+        return None
+
+    def match_exact(self, question: str, category: str | None = None) -> Any | None:
+        for matcher in self.matchers:
+            row = matcher.match_exact(question, category)
+            if row is not None:
+                return row
+        return None
+
+    @staticmethod
+    def _best(matches: Sequence[Tuple[Any | None, float]]) -> Tuple[Any | None, float]:
+        accepted = [match for match in matches if match[0] is not None]
+        if accepted:
+            return max(accepted, key=lambda match: match[1])  # max() keeps the first on a tie
+        return None, max(score for _, score in matches)
+
+    def match_vector(
+        self, question: str, vector: np.ndarray, category: str | None = None
+    ) -> Tuple[Any | None, float]:
+        return self._best([matcher.match_vector(question, vector, category) for matcher in self.matchers])
+
+    def match_vectors(
+        self, questions: List[str], vectors: np.ndarray, category: str | None = None
+    ) -> List[Tuple[Any | None, float]]:
+        found = [matcher.match_vectors(questions, vectors, category) for matcher in self.matchers]
+        return [self._best(matches) for matches in zip(*found)]
@@ -0,0 +1,157 @@
+"""
+NLP engines turn question text into a document vector (the mean of its word vectors).
+
+- `SpacyEngine` loads the spaCy model but skips the tagger, parser, NER etc.,
+  which similarity never uses.
+- `VectorsEngine` loads only the tokenizer and reads word vectors from .npy files
+  that are memory-mapped, so every uvicorn worker shares one page-cache copy
+  instead of holding a private copy of the vector table.
+
+Both engines produce exactly the same vectors as spaCy's `Doc.vector`. An engine is
+identified by its source, "spacy:<model package>" or "vectors:<path>" (see `load_engine`).
+Export the files for `VectorsEngine` once with:
+
+    python -m app.nlp.engine export en_core_web_md /path/to/vectors
+"""
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Iterable, List
+
+import numpy as np
+import spacy
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# "spacy" (load the model package) or "vectors" (memory-mapped vector files).
+NLP_ENGINE = os.getenv("NLP_ENGINE", "spacy")
+NLP_MODEL = os.getenv("NLP_MODEL", "en_core_web_md")
+NLP_VECTORS_PATH = os.getenv("NLP_VECTORS_PATH", "")
+NLP_BATCH_SIZE = int(os.getenv("NLP_BATCH_SIZE", 256))
+
+# Pipeline components that only add annotations; document vectors don't need them.
+_UNUSED_COMPONENTS = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer", "ner"]
+
+
+def model_id(meta: dict) -> str:
+    """Identifies a vector model, e.g. "en_core_web_md-3.7.0"."""
+    return f"{meta['lang']}_{meta['name']}-{meta['version']}"
+
+
+class SpacyEngine:
+    """Embeds text with a spaCy model loaded without its annotation components."""
+
+    def __init__(self, model: str = NLP_MODEL):
+        self.source = f"spacy:{model}"
+        self.nlp = spacy.load(model, exclude=_UNUSED_COMPONENTS)
+        self.model_id = model_id(self.nlp.meta)
+        self.dim = self.nlp.vocab.vectors_length
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.nlp(text).vector
+
+    def embed_many(self, texts: Iterable[str], batch_size: int = NLP_BATCH_SIZE) -> List[np.ndarray]:
+        return [doc.vector for doc in self.nlp.pipe(texts, batch_size=batch_size)]
+
+
+class VectorsEngine:
+    """
+    Embeds text using only the model's tokenizer and a memory-mapped vector table.
+
+    Files (written by `export_vectors`):
+      - keys.npy:    sorted uint64 string hashes (token.orth) that have a vector
+      - rows.npy:    vector row for each key (many keys share a row)
+      - vectors.npy: float32 (n_rows, dim) vector table
+      - meta.json:   model metadata, used to tag stored embeddings
+      - tokenizer/:  the model's serialized tokenizer, so tokens split identically
+    """
+
+    def __init__(self, path: str = NLP_VECTORS_PATH):
+        if not path:
+            raise ValueError("NLP_ENGINE=vectors requires NLP_VECTORS_PATH to be set.")
+        self.source = f"vectors:{path}"
+        root = Path(path)
+        meta = json.loads((root / "meta.json").read_text())
+
+        self.nlp = spacy.blank(meta["lang"])
+        self.nlp.tokenizer.from_disk(root / "tokenizer")
+        self.keys = np.load(root / "keys.npy", mmap_mode="r")
+        self.rows = np.load(root / "rows.npy", mmap_mode="r")
+        self.vectors = np.load(root / "vectors.npy", mmap_mode="r")
+
+        self.model_id = model_id(meta)
+        self.dim = self.vectors.shape[1]
+
+    def _doc_vector(self, doc) -> np.ndarray:
+        total = np.zeros(self.dim, dtype=np.float32)
+        if len(doc) == 0 or len(self.keys) == 0:
+            return total
+
+        hashes = np.fromiter((token.orth for token in doc), dtype=np.uint64, count=len(doc))
+        positions = np.searchsorted(self.keys, hashes)
+        positions[positions == len(self.keys)] = 0
+        found = self.keys[positions] == hashes
+
+        # Add token vectors one at a time, in order, like `Doc.vector` does,
+        # so the float32 rounding (and therefore every similarity) is identical.
+        for row in self.rows[positions[found]]:
+            total += self.vectors[row]
+        return total / len(doc)
+
+    def embed(self, text: str) -> np.ndarray:
+        return self._doc_vector(self.nlp.make_doc(text))
+
+    def embed_many(self, texts: Iterable[str], batch_size: int = NLP_BATCH_SIZE) -> List[np.ndarray]:
+        return [self._doc_vector(doc) for doc in self.nlp.tokenizer.pipe(texts, batch_size=batch_size)]
+
+
+def configured_source() -> str:
+    """The engine source selected by `NLP_ENGINE`, `NLP_MODEL` and `NLP_VECTORS_PATH`."""
+    if NLP_ENGINE == "spacy":
+        return f"spacy:{NLP_MODEL}"
+    if NLP_ENGINE == "vectors":
+        return f"vectors:{NLP_VECTORS_PATH}"
+    raise ValueError(f"Unknown NLP_ENGINE '{NLP_ENGINE}'. Must be 'spacy' or 'vectors'.")
+
+
+def load_engine(source: str | None = None):
+    """
+    Creates an engine from its source, e.g. "spacy:en_core_web_lg" or "vectors:/srv/vectors".
+    Without one, the engine selected by the environment is created.
+    """
+    kind, _, location = (source or configured_source()).partition(":")
+    if kind == "spacy":
+        return SpacyEngine(location)
+    if kind == "vectors":
+        return VectorsEngine(location)
+    raise ValueError(f"Unknown engine source '{source}'. Must start with 'spacy:' or 'vectors:'.")
+
+
+def export_vectors(model: str, path: str) -> None:
+    """Writes the files `VectorsEngine` needs from an installed spaCy model."""
+    nlp = spacy.load(model, exclude=_UNUSED_COMPONENTS)
+    vectors = nlp.vocab.vectors
+    root = Path(path)
+    root.mkdir(parents=True, exist_ok=True)
+
+    keys = np.fromiter(vectors.key2row.keys(), dtype=np.uint64, count=len(vectors.key2row))
+    rows = np.fromiter(vectors.key2row.values(), dtype=np.int32, count=len(vectors.key2row))
+    order = np.argsort(keys)
+
+    np.save(root / "keys.npy", keys[order])
+    np.save(root / "rows.npy", rows[order])
+    np.save(root / "vectors.npy", np.ascontiguousarray(vectors.data, dtype=np.float32))
+    nlp.tokenizer.to_disk(root / "tokenizer")
+    (root / "meta.json").write_text(json.dumps(
+        {"lang": nlp.meta["lang"], "name": nlp.meta["name"], "version": nlp.meta["version"]}
+    ))
+    print(f"Exported {len(keys)} keys / {vectors.data.shape[0]} vectors to {root}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] != "export":
+        print("Usage: python -m app.nlp.engine export <spacy-model> <output-dir>")
+        sys.exit(1)
+    export_vectors(sys.argv[2], sys.argv[3])
@@ -0,0 +1,263 @@
+"""
+Bulk FAQ import from NDJSON or CSV.
+
+The file is read as a stream and handled in batches of FAQ_IMPORT_BATCH_SIZE rows.
+Each batch is:
+1. validated row by row (invalid rows are reported and skipped)
+2. embedded in one `nlp.pipe` pass in the NLP pool, skipping questions that already
+   have a vector (looked up on a read session), before its write transaction starts
+3. written with one multi-row INSERT ... ON CONFLICT (tenant, question) DO UPDATE
+   for the FAQs and one for their vectors, then committed
+
+So the slow step, embedding, never holds the database write lock (on SQLite, the one
+writer connection) or the GIL of the process serving requests.
+
+Memory use depends on the batch size, not the file size. Run it through
+`POST /faq/import` or from the command line:
+
+    python -m app.nlp.importer faqs.ndjson [company_name]
+
+FAQs go into one tenant's knowledge base (the shared one, "", by default).
+"""
+import asyncio
+import codecs
+import csv
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, Tuple
+from dotenv import load_dotenv
+from pydantic import ValidationError
+from sqlalchemy import select, and_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.executor import ExecutorOverloaded
+from app.models.faq import FAQ
+from app.models.faq_embedding import FAQEmbedding
+from app.nlp.index import vector_to_bytes
+from app.nlp import utils
+from app.nlp.loader import claim_faq_version, load_active_engine
+from app.nlp.utils import embed_questions
+from app.nlp.workers import nlp_pool
+from app.schemas.faq import FAQCreate, FAQImportError, FAQImportReport
+
+load_dotenv()
+
+FAQ_IMPORT_BATCH_SIZE = int(os.getenv("FAQ_IMPORT_BATCH_SIZE", 500))
+FAQ_IMPORT_MAX_ERRORS = int(os.getenv("FAQ_IMPORT_MAX_ERRORS", 1000))  # Errors listed in the report; all are counted
+FAQ_IMPORT_EMBED_TIMEOUT = float(os.getenv("FAQ_IMPORT_EMBED_TIMEOUT", 120))  # Seconds to embed one batch
+
+FORMATS = ("ndjson", "csv")
+
+
+def guess_format(filename: str | None) -> str | None:
+    """'ndjson' or 'csv' from a file name, or None if the extension is unknown."""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension in (".ndjson", ".jsonl"):
+        return "ndjson"
+    if extension == ".csv":
+        return "csv"
+    return None
+
+
+def read_records(lines: Iterable[str], fmt: str) -> Iterator[Tuple[int, Dict[str, Any] | None, str | None]]:
+    """
+    Yields (line number, record, None) for each row, or (line number, None, error)
+    for a row that can't be parsed. CSV files need a header row.
+    """
+    if fmt == "ndjson":
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, "Expected a JSON object."
+                continue
+            yield line_number, record, None
+    elif fmt == "csv":
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, record, None
+    else:
+        raise ValueError(f"Unknown import format '{fmt}'. Must be one of {FORMATS}.")
+
+
+def _validate(record: Dict[str, Any]) -> Dict[str, Any]:
+    # Empty cells fall back to the defaults (or fail, for required fields) instead of being stored as ''.
+    values = {key: value for key, value in record.items() if key is not None and value not in ("", None)}
+    return FAQCreate(**values).dict()
+
+
+def _error_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors())
+
+
+def dialect_insert(db: AsyncSession):
+    """The INSERT construct of the session's dialect, which supports ON CONFLICT (PostgreSQL and SQLite)."""
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise ValueError(f"Bulk upserts are not supported on '{dialect}'.")
+
+
+def _record_error(report: FAQImportReport, row: int, message: str) -> None:
+    report.failed += 1
+    if len(report.errors) < FAQ_IMPORT_MAX_ERRORS:
+        report.errors.append(FAQImportError(row=row, error=message))
+
+
+async def _write_batch(
+    db: AsyncSession,
+    read_db: AsyncSession,
+    batch: Dict[str, Tuple[int, Dict[str, Any]]],
+    tenant: str,
+    report: FAQImportReport,
+) -> None:
+    """Embeds and upserts one batch (question -> (line number, values)) and commits it."""
+    questions = list(batch)
+
+    # The (tenant, question) pair is the conflict key, so a question that already has
+    # a vector from the current model keeps it and is not embedded again.
+    model = utils.EMBEDDING_MODEL
+    result = await read_db.execute(
+        select(FAQ.question)
+        .join(FAQEmbedding, and_(FAQEmbedding.faq_id == FAQ.id, FAQEmbedding.model == model))
+        .where(FAQ.tenant == tenant, FAQ.question.in_(questions))
+    )
+    have_vector = set(result.scalars())
+    to_embed = [question for question in questions if question not in have_vector]
+
+    # Embedded in the NLP pool before the write transaction starts: the slow step holds neither the lock nor the GIL.
+    vectors = []
+    if to_embed:
+        try:
+            vectors = await nlp_pool.run(embed_questions, to_embed, timeout=FAQ_IMPORT_EMBED_TIMEOUT)
+        except (ExecutorOverloaded, asyncio.TimeoutError) as e:
+            for line_number, _ in batch.values():
+                _record_error(report, line_number, f"Embedding failed: {str(e) or 'timed out'}")
+            return
+
+    insert = dialect_insert(db)
+    try:
+        # One corpus version per batch, so other workers sync exactly these rows.
+        version = await claim_faq_version(db)
+        statement = insert(FAQ).values([
+            {**values, "tenant": tenant, "version": version} for _, values in batch.values()
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[FAQ.tenant, FAQ.question],
+            set_={
+                "answer": statement.excluded.answer,
+                "category": statement.excluded.category,
+                "version": statement.excluded.version,
+            },
+        ).returning(FAQ.id, FAQ.question)
+        ids = {question: faq_id for faq_id, question in (await db.execute(statement)).all()}
+
+        if to_embed:
+            statement = insert(FAQEmbedding).values([
+                {"faq_id": ids[question], "model": model, "dim": len(vector), "vector": vector_to_bytes(vector)}
+                for question, vector in zip(to_embed, vectors)
+            ])
+            statement = statement.on_conflict_do_update(
+                index_elements=[FAQEmbedding.faq_id, FAQEmbedding.model],
+                set_={"dim": statement.excluded.dim, "vector": statement.excluded.vector},
+            )
+            await db.execute(statement)
+        await db.commit()
+    except DBAPIError as e:
+        await db.rollback()
+        for line_number, _ in batch.values():
+            _record_error(report, line_number, f"Database error: {e.orig}")
+        return
+
+    report.imported += len(ids)
+    report.embedded += len(to_embed)
+
+
+async def import_faqs(
+    db: AsyncSession,
+    read_db: AsyncSession,
+    lines: Iterable[str],
+    fmt: str,
+    tenant: str = "",
+    on_progress: Callable[[FAQImportReport], None] | None = None,
+) -> FAQImportReport:
+    """
+    Imports FAQs from the lines of an NDJSON or CSV file into a tenant's knowledge base. Existing questions get the new answer
+    and category. Each batch is committed on its own, so a failure only loses that batch.
+    `db` writes; `read_db` (on the primary) looks up which questions already have a vector.
+    `on_progress` is called with the running report after every batch.
+    """
+    report = FAQImportReport()
+    # Keyed by question: a question repeated within a batch keeps its last row, as it would across batches.
+    batch: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+    for line_number, record, error in read_records(lines, fmt):
+        report.rows += 1
+        if error is None:
+            try:
+                values = _validate(record)
+            except ValidationError as e:
+                error = _error_message(e)
+        if error is not None:
+            _record_error(report, line_number, error)
+            continue
+
+        batch[values["question"]] = (line_number, values)
+        if len(batch) >= FAQ_IMPORT_BATCH_SIZE:
+            await _write_batch(db, read_db, batch, tenant, report)
+            batch = {}
+            if on_progress is not None:
+                on_progress(report)
+
+    if batch:
+        await _write_batch(db, read_db, batch, tenant, report)
+        if on_progress is not None:
+            on_progress(report)
+    return report
+
+
+async def _main(path: str, tenant: str) -> None:
+    from app.db.session import AsyncSessionLocal, ReadSessionLocal, dispose_engines
+
+    fmt = guess_format(path)
+    if fmt is None:
+        print("The file must end in .ndjson, .jsonl or .csv")
+        sys.exit(1)
+
+    def progress(report: FAQImportReport) -> None:
+        print(f"{report.rows} rows read, {report.imported} imported, {report.failed} failed", file=sys.stderr)
+
+    try:
+        with open(path, "rb") as file:
+            async with AsyncSessionLocal() as db, ReadSessionLocal() as read_db:
+                # Embed with the model the API answers with, if one was activated (see app.nlp.reembed)
+                active = await load_active_engine(read_db)
+                if active is not None:
+                    utils.use_engine(active)
+                report = await import_faqs(db, read_db, codecs.iterdecode(file, "utf-8-sig"), fmt, tenant, progress)
+    finally:
+        # Also on errors: open connections would keep the process from exiting
+        nlp_pool.shutdown()
+        await dispose_engines()
+
+    for error in report.errors:
+        print(f"line {error.row}: {error.error}")
+    print(f"Done: {report.imported} FAQs imported ({report.embedded} embedded), {report.failed} rows failed.")
+    print("Running API workers pick up the changes on their next FAQ sync (FAQ_SYNC_INTERVAL).")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python -m app.nlp.importer <faqs.ndjson|faqs.csv> [company_name]")
+        sys.exit(1)
+    asyncio.run(_main(sys.argv[1], sys.argv[2] if len(sys.argv) == 3 else ""))
@@ -0,0 +1,219 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, List, Sequence, Tuple
+
+from app.nlp.storage import FAQ_VECTOR_STORAGE, make_store
+
+
+@dataclass
+class FAQEntry:
+    """
+    A lightweight, session-independent snapshot of an FAQ row.
+    Kept in memory by the FAQ index so answering never needs the ORM object.
+    """
+    id: int
+    question: str
+    answer: str
+    category: str = "general"
+
+    @classmethod
+    def from_model(cls, faq) -> "FAQEntry":
+        """Copy the columns we serve out of an ORM `FAQ` (or any FAQ-like object)."""
+        return cls(
+            id=faq.id,
+            question=faq.question,
+            answer=faq.answer,
+            category=getattr(faq, "category", None) or "general",
+        )
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    L2-normalizes each row so a dot product equals cosine similarity.
+    All-zero rows (questions with no known words) stay zero and score 0.0,
+    which is what `Doc.similarity` returns for them.
+    """
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def vector_to_bytes(vector: np.ndarray) -> bytes:
+    """Serializes a vector as raw little-endian float32 for the `faq_embeddings` table."""
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def vectors_from_bytes(blobs: Sequence[bytes], dim: int) -> np.ndarray:
+    """
+    Turns stored embedding blobs into one (n, dim) float32 matrix.
+    The blobs are joined and viewed as floats directly; nothing is parsed per value.
+    """
+    if not blobs:
+        return np.zeros((0, dim), dtype=np.float32)
+    return np.frombuffer(b"".join(blobs), dtype="<f4").reshape(len(blobs), dim)
+
+
+# Questions scored per matrix-matrix product in `search_many`.
+_QUERY_CHUNK = 256
+
+
+class FAQIndex:
+    """
+    In-memory FAQ corpus: the FAQ rows plus an L2-normalized matrix of their vectors.
+    Built once, then every question is scored with a single matrix-vector product.
+    This is the exact (brute-force) index; see `app.nlp.ann` for the approximate one.
+    The vectors are held by a `VectorStore` (float32 by default; see `app.nlp.storage`).
+    """
+
+    def __init__(
+        self,
+        rows: Sequence[Any],
+        vectors: np.ndarray | None = None,
+        dim: int = 0,
+        storage: str = FAQ_VECTOR_STORAGE,
+    ):
+        self.rows: List[Any] = list(rows)
+        if vectors is None or len(self.rows) == 0:
+            matrix = np.zeros((0, dim), dtype=np.float32)
+        else:
+            matrix = normalize_rows(vectors)
+        if len(self.rows) != matrix.shape[0]:
+            raise ValueError("FAQIndex needs exactly one vector per row.")
+
+        self.store = make_store(matrix.shape[1], storage)
+        self.store.fit(matrix)
+        self.store.append(matrix)
+        self._positions = {row.id: position for position, row in enumerate(self.rows)}
+
+        # Total FAQ vectors scored so far, for the metrics endpoint.
+        self.rows_scored = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get(self, faq_id: int) -> Any | None:
+        """Returns the row with this FAQ id, if it is in the index."""
+        position = self._positions.get(faq_id)
+        return None if position is None else self.rows[position]
+
+    def position(self, faq_id: int) -> int | None:
+        """Position of the FAQ's row (and vector) in the index."""
+        return self._positions.get(faq_id)
+
+    @property
+    def dim(self) -> int:
+        return self.store.dim
+
+    @property
+    def training_due(self) -> bool:
+        """Whether the index needs retraining in the background (see `app.nlp.ann`); never for exact search."""
+        return False
+
+    def vectors(self, selection=None) -> np.ndarray:
+        """The normalized FAQ vectors as float32 (approximate for compact storage)."""
+        return self.store.vectors(selection)
+
+    def scores(self, vector: np.ndarray) -> np.ndarray:
+        """Cosine similarity of one question vector against every FAQ."""
+        return self.store.scores(normalize_rows(vector)[0])
+
+    def candidates(self, query: np.ndarray) -> np.ndarray | None:
+        """
+        Positions worth scoring for a normalized query; None means all of them.
+        The exact index always scores everything; approximate indexes override this.
+        """
+        return None
+
+    def _scored(self, vector: np.ndarray) -> Tuple[np.ndarray | None, np.ndarray]:
+        """Scores the candidate rows. Returns (positions or None for all, scores)."""
+        query = normalize_rows(vector)[0]
+        positions = self.candidates(query)
+        if positions is None:
+            self.rows_scored += len(self.store)
+            return None, self.store.scores(query)
+        self.rows_scored += len(positions)
+        return positions, self.store.scores(query, positions)
+
+    def search(self, vector: np.ndarray) -> Tuple[Any | None, float]:
+        """Returns the best matching row and its similarity score."""
+        if not self.rows:
+            return None, -1.0
+        positions, scores = self._scored(vector)
+        if len(scores) == 0:
+            return None, -1.0
+        best = int(np.argmax(scores))
+        position = best if positions is None else int(positions[best])
+        return self.rows[position], float(scores[best])
+
+    def search_among(self, vector: np.ndarray, positions: np.ndarray) -> Tuple[Any | None, float]:
+        """Exact best match among the given positions only (e.g. a keyword shortlist)."""
+        if len(positions) == 0:
+            return None, -1.0
+        scores = self.store.scores(normalize_rows(vector)[0], positions)
+        self.rows_scored += len(positions)
+        best = int(np.argmax(scores))
+        return self.rows[int(positions[best])], float(scores[best])
+
+    def search_many(self, vectors: np.ndarray) -> List[Tuple[Any | None, float]]:
+        """
+        Best row and score for each of several question vectors.
+        All questions are scored with one matrix-matrix product (in chunks, to bound memory).
+        """
+        queries = normalize_rows(vectors)
+        if len(self.store) == 0:
+            return [(None, -1.0)] * len(queries)
+
+        results = []
+        for start in range(0, len(queries), _QUERY_CHUNK):
+            scores = self.store.scores_many(queries[start:start + _QUERY_CHUNK])
+            self.rows_scored += scores.size
+            best = np.argmax(scores, axis=1)
+            best_scores = scores[np.arange(len(best)), best]
+            results.extend((self.rows[i], float(score)) for i, score in zip(best, best_scores))
+        return results
+
+    def top_k(self, vector: np.ndarray, k: int) -> List[Tuple[Any, float]]:
+        """Returns the `k` best rows, highest score first."""
+        if not self.rows or k <= 0:
+            return []
+        positions, scores = self._scored(vector)
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        # argpartition finds the top k in O(n); only those k get sorted.
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        if positions is not None:
+            return [(self.rows[positions[i]], float(scores[i])) for i in best]
+        return [(self.rows[i], float(scores[i])) for i in best]
+
+    def add(self, row: Any, vector: np.ndarray) -> int:
+        """Appends a single FAQ (e.g. right after it is created) and returns its position."""
+        position = len(self.rows)
+        # Append the row before storing its vector: a search running in another
+        # thread may then see one row too many, but never a vector without a row.
+        self.rows.append(row)
+        self._positions[row.id] = position
+        self.store.append(normalize_rows(vector))
+        return position
+
+    def upsert(self, row: Any, vector: np.ndarray | None) -> None:
+        """
+        Replaces the row with the same `id` (e.g. after an edit), or appends it.
+        Pass `vector=None` to keep the existing vector when only the answer changed.
+        """
+        position = self._positions.get(row.id)
+        if position is None:
+            if vector is None:
+                raise ValueError(f"FAQ {row.id} is not in the index and no vector was given.")
+            self.add(row, vector)
+            return
+        self.rows[position] = row
+        if vector is not None:
+            self._replace_vector(position, normalize_rows(vector)[0])
+
+    def _replace_vector(self, position: int, vector: np.ndarray) -> None:
+        self.store.set(position, vector)
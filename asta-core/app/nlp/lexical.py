@@ -0,0 +1,121 @@
+import math
+import re
+import threading
+import numpy as np
+from collections import Counter
+from typing import Dict, List
+from spacy.lang.en.stop_words import STOP_WORDS
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def keywords(text: str) -> List[str]:
+    """Lower-cased word tokens with English stop words removed."""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+class BM25Index:
+    """
+    Inverted index over FAQ questions, scored with Okapi BM25.
+    Used to shortlist the few FAQs that share keywords with a question,
+    so only those need vector scoring. Documents are identified by FAQ id.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, max_df_ratio: float = 0.25):
+        self.k1 = k1
+        self.b = b
+        # Terms found in more than this share of FAQs carry almost no signal and
+        # would make the shortlist (and the scoring loop) huge, so they are skipped.
+        self.max_df_ratio = max_df_ratio
+
+        self._postings: Dict[str, Dict[int, int]] = {}  # term -> {FAQ id: term frequency}
+        self._terms: Dict[int, Counter] = {}            # FAQ id -> its term counts
+        self._lengths: Dict[int, int] = {}              # FAQ id -> number of terms
+        self._total_length = 0
+        self._arrays: Dict[str, tuple] = {}             # term -> (ids, frequencies, lengths) arrays
+        # Shortlists are computed in worker threads while writes happen on the event loop.
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def set(self, doc_id: int, text: str) -> None:
+        """Indexes (or re-indexes) the document with this id."""
+        terms = Counter(keywords(text))
+        with self._lock:
+            self._remove(doc_id)
+            self._add(doc_id, terms)
+
+    def remove(self, doc_id: int) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def _add(self, doc_id: int, terms: Counter) -> None:
+        self._terms[doc_id] = terms
+        self._lengths[doc_id] = sum(terms.values())
+        self._total_length += self._lengths[doc_id]
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+            self._arrays.pop(term, None)
+
+    def _remove(self, doc_id: int) -> None:
+        terms = self._terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+            self._arrays.pop(term, None)
+
+    def _posting_arrays(self, term: str) -> tuple:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self._postings[term]
+            ids = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+            frequencies = np.fromiter(postings.values(), dtype=np.float32, count=len(postings))
+            lengths = np.fromiter(
+                (self._lengths[doc_id] for doc_id in postings), dtype=np.float32, count=len(postings)
+            )
+            arrays = (ids, frequencies, lengths)
+            self._arrays[term] = arrays
+        return arrays
+
+    def shortlist(self, text: str, size: int) -> np.ndarray:
+        """Ids of the `size` best BM25 matches, best first. Empty if no keyword matches."""
+        n = len(self._terms)
+        if n == 0 or size <= 0:
+            return np.zeros(0, dtype=np.int64)
+
+        average_length = self._total_length / n if self._total_length else 1.0
+        # Tiny corpora keep every term; there the cut-off would drop almost everything.
+        max_df = max(int(self.max_df_ratio * n), 20)
+        touched = []
+
+        for term in set(keywords(text)):
+            with self._lock:
+                postings = self._postings.get(term)
+                if not postings or len(postings) > max_df:
+                    continue
+                ids, frequencies, lengths = self._posting_arrays(term)
+            df = len(ids)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            weights = idf * frequencies * (self.k1 + 1) / (
+                frequencies + self.k1 * (1 - self.b + self.b * lengths / average_length)
+            )
+            touched.append((ids, weights))
+
+        if not touched:
+            return np.zeros(0, dtype=np.int64)
+
+        ids = np.concatenate([p for p, _ in touched])
+        weights = np.concatenate([w for _, w in touched])
+        unique, inverse = np.unique(ids, return_inverse=True)
+        totals = np.zeros(len(unique), dtype=np.float32)
+        np.add.at(totals, inverse, weights)
+
+        size = min(size, len(unique))
+        best = np.argpartition(-totals, size - 1)[:size]
+        return unique[best[np.argsort(-totals[best], kind="stable")]]
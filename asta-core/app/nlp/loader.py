@@ -0,0 +1,316 @@
+import asyncio
+import itertools
+import os
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, Tuple
+from dotenv import load_dotenv
+from sqlalchemy import func, select, and_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.models.faq import FAQ
+from app.models.faq_corpus import FAQCorpus
+from app.models.faq_embedding import FAQEmbedding
+from app.nlp.index import FAQEntry, vector_to_bytes, vectors_from_bytes
+from app.nlp import utils
+from app.nlp.engine import load_engine
+from app.nlp.utils import embed_questions
+from app.nlp.cascade import CascadeStats, FAQMatcher, LayeredMatcher
+
+load_dotenv()
+
+# Postgres channel notified on every FAQ write, so other workers sync without waiting for their next poll.
+FAQ_SYNC_CHANNEL = "faq_corpus"
+# A sync that changes more than this share of a tenant's corpus rebuilds its matcher instead of patching it.
+FAQ_SYNC_RELOAD_RATIO = float(os.getenv("FAQ_SYNC_RELOAD_RATIO", 0.1))
+
+# Budget for all loaded tenant matchers together (vectors plus estimated per-FAQ overhead).
+FAQ_TENANT_MEMORY_MB = float(os.getenv("FAQ_TENANT_MEMORY_MB", 512))
+
+# Loaded FAQ matchers, one per tenant (the asking user's `company_name`; "" is the shared
+# corpus), least recently used first. A tenant's matcher is built on its first question and
+# kept up to date in place; when the loaded matchers exceed FAQ_TENANT_MEMORY_MB the least
+# recently used ones are dropped and simply rebuilt on their next question.
+_matchers: "OrderedDict[str, FAQMatcher]" = OrderedDict()
+_load_locks: Dict[str, asyncio.Lock] = {}
+
+# Cascade statistics shared by all tenants, and load/eviction counters for the metrics endpoint.
+cascade_stats = CascadeStats()
+tenant_stats = {"loads": 0, "evictions": 0}
+
+# Per-tenant version of the loaded corpus. Anything derived from a tenant's index (such as
+# cached answers) is tagged with it, so it goes stale automatically. Values come from one
+# process-wide counter, so a tenant that is evicted and reloaded never reuses an old version.
+_corpus_versions: Dict[str, int] = {}
+_version_counter = itertools.count(1)
+
+def get_corpus_version(tenant: str = "") -> int:
+    return _corpus_versions.get(tenant, 0)
+
+def _bump_corpus_version(tenant: str) -> None:
+    _corpus_versions[tenant] = next(_version_counter)
+
+def get_loaded_matcher(tenant: str = "") -> FAQMatcher | None:
+    """The tenant's matcher if it is loaded, without triggering a load."""
+    return _matchers.get(tenant)
+
+def loaded_matchers() -> Dict[str, FAQMatcher]:
+    return dict(_matchers)
+
+def loaded_memory_bytes() -> int:
+    return sum(matcher.memory_bytes() for matcher in _matchers.values())
+
+async def get_faq_matcher(db: AsyncSession, tenant: str = "") -> FAQMatcher:
+    """
+    Returns the tenant's in-memory FAQ matcher, loading it from the database if needed.
+    Concurrent first requests for a tenant wait for a single load instead of each doing one.
+    """
+    matcher = _matchers.get(tenant)
+    if matcher is not None:
+        _matchers.move_to_end(tenant)
+        return matcher
+
+    async with _load_locks.setdefault(tenant, asyncio.Lock()):
+        matcher = _matchers.get(tenant)
+        if matcher is None:
+            matcher = await _load_tenant(db, tenant)
+    return matcher
+
+async def get_search_matcher(db: AsyncSession, tenant: str = "") -> FAQMatcher | LayeredMatcher:
+    """
+    What a member of `tenant` searches: the company's FAQs plus the shared base, or just the
+    shared base for anonymous callers and users without a company.
+    """
+    shared = await get_faq_matcher(db, "")
+    if not tenant:
+        return shared
+    return LayeredMatcher([await get_faq_matcher(db, tenant), shared])
+
+async def reload_faq_matcher(db: AsyncSession, tenant: str = "") -> None:
+    """
+    Rebuilds a tenant's matcher from the database in one pass (e.g. after a bulk import),
+    if it is loaded. Questions are answered from the old matcher until the new one is ready.
+    """
+    if tenant not in _matchers:
+        _bump_corpus_version(tenant)
+        return
+
+    async with _load_locks.setdefault(tenant, asyncio.Lock()):
+        await _load_tenant(db, tenant)
+
+async def _load_tenant(db: AsyncSession, tenant: str) -> FAQMatcher:
+    while True:
+        model = utils.EMBEDDING_MODEL
+        # Read the version first: anything written after it is picked up by the next sync.
+        version = await read_faq_version(db)
+        matcher = await load_faq_matcher(db, tenant)
+        matcher.version = version
+        if model == utils.EMBEDDING_MODEL:
+            break  # Otherwise another model was activated meanwhile: load with that one.
+
+    _matchers[tenant] = matcher
+    _matchers.move_to_end(tenant)
+    _bump_corpus_version(tenant)
+    tenant_stats["loads"] += 1
+    _evict()
+    return matcher
+
+def _evict() -> None:
+    """Drops least recently used tenants until the loaded ones fit the memory budget."""
+    budget = FAQ_TENANT_MEMORY_MB * 1024 * 1024
+    # The most recently used tenant always stays, even if it alone is over budget.
+    while len(_matchers) > 1 and loaded_memory_bytes() > budget:
+        tenant, _ = _matchers.popitem(last=False)
+        _bump_corpus_version(tenant)
+        tenant_stats["evictions"] += 1
+
+async def read_faq_version(db: AsyncSession) -> int:
+    """The current database corpus version (0 before the first FAQ write)."""
+    result = await db.execute(select(FAQCorpus.version).where(FAQCorpus.id == 1))
+    return result.scalar_one_or_none() or 0
+
+async def read_active_embedding(db: AsyncSession) -> Tuple[str, str] | None:
+    """(model id, engine source) of the embedding model activated for FAQ matching, or None to use the configured one."""
+    result = await db.execute(
+        select(FAQCorpus.embedding_model, FAQCorpus.embedding_source).where(FAQCorpus.id == 1)
+    )
+    row = result.one_or_none()
+    return tuple(row) if row is not None and row.embedding_model else None
+
+async def load_active_engine(db: AsyncSession):
+    """The activated embedding engine, if it isn't this process's engine already (else None)."""
+    active = await read_active_embedding(db)
+    if active is None or active[0] == utils.EMBEDDING_MODEL:
+        return None
+    model, source = active
+    engine = await asyncio.to_thread(load_engine, source)
+    if engine.model_id != model:
+        raise RuntimeError(f"'{source}' loads {engine.model_id} here, but {model} is the active FAQ embedding model.")
+    return engine
+
+async def claim_faq_version(db: AsyncSession) -> int:
+    """
+    Bumps the database corpus version for an FAQ write and returns it; stamp the written
+    FAQs with it. The counter row stays locked until the transaction ends, so versions
+    become visible in order and a worker that sees version N also sees every FAQ stamped <= N.
+    """
+    result = await db.execute(
+        update(FAQCorpus)
+        .where(FAQCorpus.id == 1)
+        .values(version=FAQCorpus.version + 1)
+        .returning(FAQCorpus.version)
+    )
+    version = result.scalar_one_or_none()
+    if version is None:
+        # Tables created by `create_all` start without the counter row (migrations insert it).
+        version = 1
+        db.add(FAQCorpus(id=1, version=version))
+        await db.flush()
+
+    if db.bind.dialect.name == "postgresql":
+        # Delivered to listening workers when the transaction commits.
+        await db.execute(select(func.pg_notify(FAQ_SYNC_CHANNEL, str(version))))
+    return version
+
+async def sync_faq_matcher(db: AsyncSession) -> int:
+    """
+    Applies FAQs written by any worker to the loaded tenants' matchers. Only rows stamped
+    after the version a matcher reflects are read (with their stored vectors).
+    Returns how many rows were applied.
+    """
+    matchers = dict(_matchers)
+    if not matchers:
+        return 0
+    version = await read_faq_version(db)
+    since = min(matcher.version for matcher in matchers.values())
+    if version <= since:
+        return 0
+
+    result = await db.execute(
+        _faq_rows_query(utils.EMBEDDING_MODEL).where(FAQ.version > since, FAQ.tenant.in_(list(matchers)))
+    )
+    changed: Dict[str, list] = {}
+    for faq, blob in result.all():
+        if faq.version > matchers[faq.tenant].version:
+            changed.setdefault(faq.tenant, []).append((faq, blob))
+
+    for tenant, rows in changed.items():
+        matcher = matchers[tenant]
+        if len(rows) > FAQ_SYNC_RELOAD_RATIO * len(matcher):
+            # A bulk import elsewhere: one rebuild is cheaper than patching row by row.
+            if _matchers.get(tenant) is matcher:
+                async with _load_locks.setdefault(tenant, asyncio.Lock()):
+                    await _load_tenant(db, tenant)
+            continue
+
+        for faq, blob in rows:
+            if blob is not None:
+                vector = vectors_from_bytes([blob], utils.EMBEDDING_DIM)[0]
+            else:
+                vector = (await asyncio.to_thread(embed_questions, [faq.question]))[0]
+            matcher.upsert(FAQEntry.from_model(faq), vector)
+        _bump_corpus_version(tenant)
+
+    # Only the matchers patched here are marked as synced; one loaded meanwhile keeps its own version.
+    for matcher in matchers.values():
+        matcher.version = max(matcher.version, version)
+    return sum(len(rows) for rows in changed.values())
+
+def _build_matcher(entries, vectors, dim, tenant) -> FAQMatcher:
+    return FAQMatcher(entries, vectors, dim, tenant, cascade_stats)
+
+def _faq_rows_query(model: str):
+    """FAQs with their stored vector for `model` (None if there is none yet)."""
+    return select(FAQ, FAQEmbedding.vector).outerjoin(
+        FAQEmbedding,
+        and_(FAQEmbedding.faq_id == FAQ.id, FAQEmbedding.model == model),
+    )
+
+async def load_faq_matcher(db: AsyncSession, tenant: str = "", engine=None) -> FAQMatcher:
+    """
+    Builds a tenant's FAQ matcher from the database with one bulk read of its FAQs and their stored vectors.
+    FAQs without a vector for the model (older rows, or a model change without re-embedding)
+    are embedded in one batch and written back, so this happens only once.
+    `engine` defaults to the active one.
+    """
+    engine = engine or utils.engine
+    result = await db.execute(_faq_rows_query(engine.model_id).where(FAQ.tenant == tenant))
+    rows = result.all()
+
+    entries = [FAQEntry.from_model(faq) for faq, _ in rows]
+    stored = [blob for _, blob in rows if blob is not None]
+    missing = [position for position, (_, blob) in enumerate(rows) if blob is None]
+
+    # Building (and training an IVF index) is CPU work, so it runs in a thread.
+    if not missing:
+        return await asyncio.to_thread(
+            _build_matcher, entries, vectors_from_bytes(stored, engine.dim), engine.dim, tenant
+        )
+
+    vectors = np.zeros((len(rows), engine.dim), dtype=np.float32)
+    have = [position for position, (_, blob) in enumerate(rows) if blob is not None]
+    vectors[have] = vectors_from_bytes(stored, engine.dim)
+    vectors[missing] = await asyncio.to_thread(
+        embed_questions, [entries[position].question for position in missing], engine
+    )
+
+    # Backfill the missing vectors so the next load is a pure read
+    # (through the primary: `db` may be a read replica).
+    async with AsyncSessionLocal() as primary:
+        for position in missing:
+            primary.add(make_faq_embedding(entries[position].id, vectors[position], engine.model_id))
+        await primary.commit()
+
+    return await asyncio.to_thread(_build_matcher, entries, vectors, engine.dim, tenant)
+
+async def build_matchers(db: AsyncSession, engine) -> Dict[str, FAQMatcher]:
+    """Builds new matchers for the loaded tenants with another engine's vectors, ready for `install_matchers`."""
+    matchers = {}
+    for tenant in list(_matchers):
+        version = await read_faq_version(db)
+        matchers[tenant] = await load_faq_matcher(db, tenant, engine)
+        matchers[tenant].version = version
+    return matchers
+
+def install_matchers(matchers: Dict[str, FAQMatcher]) -> None:
+    """
+    Replaces every loaded matcher at once (after a model switch). Tenants loaded since
+    `build_matchers` are dropped and reload on their next question; every cached answer goes stale.
+    """
+    _matchers.clear()
+    _matchers.update(matchers)
+    for tenant in list(_corpus_versions):
+        _bump_corpus_version(tenant)
+
+def make_faq_embedding(faq_id: int, vector: np.ndarray, model: str | None = None) -> FAQEmbedding:
+    """Creates the `faq_embeddings` row for an FAQ vector from `model` (the active one by default)."""
+    return FAQEmbedding(
+        faq_id=faq_id,
+        model=model or utils.EMBEDDING_MODEL,
+        dim=len(vector),
+        vector=vector_to_bytes(vector),
+    )
+
+def add_faq_to_matcher(faq: FAQ, vector: np.ndarray | None, model: str | None = None) -> None:
+    """
+    Adds a created (or edited) FAQ, embedded by `model`, to its tenant's matcher, if that is loaded.
+    `vector` is None for an edit that kept the question (and so the indexed vector).
+    """
+    _bump_corpus_version(faq.tenant)
+    matcher = _matchers.get(faq.tenant)
+    if matcher is None:
+        return  # It will be picked up by the tenant's next full load.
+    if vector is not None and model not in (None, utils.EMBEDDING_MODEL):
+        return  # Embedded just before a model switch; the next sync re-embeds it with the new model.
+    if vector is None and matcher.get(faq.id) is None:
+        # Edited without a new vector, but written by another worker and not synced here yet:
+        # there's no vector to index it with. The next sync applies it with its stored one.
+        return
+    matcher.upsert(FAQEntry.from_model(faq), vector)
+
+def reset_faq_matcher() -> None:
+    """Drops every in-memory matcher so the next questions reload them from the database."""
+    for tenant in list(_matchers):
+        _bump_corpus_version(tenant)
+    _matchers.clear()
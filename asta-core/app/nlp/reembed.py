@@ -0,0 +1,155 @@
+"""
+Re-embeds the FAQ corpus with another embedding model, without stopping the API.
+
+    python -m app.nlp.reembed spacy:en_core_web_lg
+    python -m app.nlp.reembed vectors:/srv/vectors/en_core_web_lg
+    python -m app.nlp.reembed --prune
+
+1. Every FAQ without a vector from the new model is embedded, FAQ_REEMBED_BATCH_SIZE
+   at a time, and the vectors are stored next to the current model's (`faq_embeddings`
+   holds one row per FAQ per model). API workers keep answering from the current model
+   meanwhile; the job runs in its own process, so it doesn't take their CPU. It can be
+   stopped and run again: it continues with the FAQs that are still missing a vector.
+2. Passes repeat until no FAQ is missing a vector (FAQs created or edited during a pass
+   are caught by the next one), then the model is activated in one transaction.
+3. Each API worker notices on its next FAQ sync, loads the new model and rebuilds its
+   loaded indexes in the background, then switches its NLP pool and indexes over at once.
+   The source given here must load the same model on the API hosts.
+
+`--prune` deletes the stored vectors of every model but the active one; run it once
+all workers have switched.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from typing import Callable
+from dotenv import load_dotenv
+from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.faq import FAQ
+from app.models.faq_corpus import FAQCorpus
+from app.models.faq_embedding import FAQEmbedding
+from app.nlp import utils
+from app.nlp.engine import load_engine
+from app.nlp.importer import dialect_insert
+from app.nlp.index import vector_to_bytes
+from app.nlp.loader import claim_faq_version, read_active_embedding
+from app.nlp.utils import embed_questions
+
+load_dotenv()
+
+FAQ_REEMBED_BATCH_SIZE = int(os.getenv("FAQ_REEMBED_BATCH_SIZE", 500))
+FAQ_REEMBED_PAUSE = float(os.getenv("FAQ_REEMBED_PAUSE", 0.0))  # Seconds between batches, to go easy on the database
+
+
+def _missing_vectors(model: str):
+    """FAQs that have no stored vector from `model`."""
+    return select(FAQ.id, FAQ.question).outerjoin(
+        FAQEmbedding, and_(FAQEmbedding.faq_id == FAQ.id, FAQEmbedding.model == model)
+    ).where(FAQEmbedding.faq_id.is_(None))
+
+
+async def reembed_faqs(db: AsyncSession, engine, on_progress: Callable[[int], None] | None = None) -> int:
+    """
+    One pass over the FAQs missing a vector from `engine`'s model, in batches that are
+    each committed on their own. Returns how many FAQs were embedded.
+    """
+    insert = dialect_insert(db)
+    embedded, last_id = 0, 0
+    while True:
+        result = await db.execute(
+            _missing_vectors(engine.model_id)
+            .where(FAQ.id > last_id)
+            .order_by(FAQ.id)
+            .limit(FAQ_REEMBED_BATCH_SIZE)
+        )
+        rows = result.all()
+        if not rows:
+            return embedded
+
+        vectors = await asyncio.to_thread(embed_questions, [question for _, question in rows], engine)
+        statement = insert(FAQEmbedding).values([
+            {"faq_id": faq_id, "model": engine.model_id, "dim": engine.dim, "vector": vector_to_bytes(vector)}
+            for (faq_id, _), vector in zip(rows, vectors)
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[FAQEmbedding.faq_id, FAQEmbedding.model],
+            set_={"dim": statement.excluded.dim, "vector": statement.excluded.vector},
+        )
+        await db.execute(statement)
+        await db.commit()
+
+        embedded += len(rows)
+        last_id = rows[-1].id
+        if on_progress is not None:
+            on_progress(embedded)
+        if FAQ_REEMBED_PAUSE:
+            await asyncio.sleep(FAQ_REEMBED_PAUSE)
+
+
+async def activate_embedding_model(db: AsyncSession, engine) -> bool:
+    """
+    Makes `engine`'s model the one FAQ questions are answered with, if every FAQ has a
+    vector from it. Returns whether it did. The check and the switch share one transaction.
+    """
+    # Locks the corpus row (so concurrent FAQ writes wait) and, on Postgres, notifies the workers on commit.
+    await claim_faq_version(db)
+    missing = await db.scalar(select(func.count()).select_from(_missing_vectors(engine.model_id).subquery()))
+    if missing:
+        await db.rollback()
+        return False
+
+    await db.execute(
+        update(FAQCorpus)
+        .where(FAQCorpus.id == 1)
+        .values(embedding_model=engine.model_id, embedding_source=engine.source)
+    )
+    await db.commit()
+    return True
+
+
+async def prune_embeddings(db: AsyncSession) -> int:
+    """Deletes stored vectors of every model but the active one. Returns how many were deleted."""
+    active = await read_active_embedding(db)
+    model = active[0] if active is not None else utils.EMBEDDING_MODEL
+    result = await db.execute(delete(FAQEmbedding).where(FAQEmbedding.model != model))
+    await db.commit()
+    return result.rowcount
+
+
+async def _main(source: str | None, activate: bool, prune: bool) -> None:
+    from app.db.session import AsyncSessionLocal, engine as db_engine
+
+    async with AsyncSessionLocal() as db:
+        if prune:
+            print(f"Deleted {await prune_embeddings(db)} vectors of inactive models.")
+        else:
+            engine = load_engine(source)
+            print(f"Embedding FAQs with {engine.model_id} ({engine.dim} dimensions)...", file=sys.stderr)
+
+            def progress(embedded: int) -> None:
+                print(f"  {embedded} FAQs embedded", file=sys.stderr)
+
+            while True:
+                embedded = await reembed_faqs(db, engine, progress)
+                print(f"Pass done: {embedded} FAQs embedded.")
+                if not activate:
+                    break
+                if await activate_embedding_model(db, engine):
+                    print(f"Activated {engine.model_id}. API workers switch over on their next FAQ sync.")
+                    break
+                # FAQs were written during the pass: embed those too, then try again.
+    await db_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-embed the FAQs with another model and switch to it.")
+    parser.add_argument("source", nargs="?", help="Engine source, e.g. spacy:en_core_web_lg or vectors:/path")
+    parser.add_argument("--no-activate", action="store_true", help="Only store the vectors; don't switch to the model")
+    parser.add_argument("--prune", action="store_true", help="Delete vectors of every model but the active one")
+    args = parser.parse_args()
+    if not args.prune and not args.source:
+        parser.error("an engine source is required (unless --prune)")
+    asyncio.run(_main(args.source, not args.no_activate, args.prune))
@@ -0,0 +1,269 @@
+import os
+import numpy as np
+from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple
+from dotenv import load_dotenv
+
+from app.nlp.ann import make_index
+from app.nlp.index import FAQIndex, normalize_rows
+
+load_dotenv()
+
+# Route each question to the categories whose centroid is closest, instead of scoring every category.
+FAQ_CATEGORY_ROUTING = os.getenv("FAQ_CATEGORY_ROUTING", "1") == "1"
+# How many categories a routed question is searched in.
+FAQ_ROUTE_TOP = int(os.getenv("FAQ_ROUTE_TOP", 2))
+
+DEFAULT_CATEGORY = "general"
+
+
+class CategoryRouter:
+    """
+    The FAQ vectors, split into one index per category (the FAQ `category` column).
+
+    Each category keeps a centroid (the normalized mean of its FAQ vectors). A question
+    is scored against the centroids first and then only searched in the best
+    `FAQ_ROUTE_TOP` categories. A caller that already knows the category skips routing.
+    Partitions are separate indexes, so one category can be rebuilt without touching the others.
+
+    Moving an FAQ to another category adds it to the new partition at once and hides it in
+    the old one, whose rebuild without it runs in the background (`app.nlp.training`:
+    `rebuild_job`, then `install_partition`).
+
+    Like the IVF index, routing can miss a better FAQ in a category it did not search,
+    but reported scores are always the exact similarity of the returned FAQ.
+    """
+
+    def __init__(self, rows: Sequence[Any], vectors: np.ndarray | None, dim: int):
+        self.dim = dim
+        self.partitions: Dict[str, FAQIndex] = {}
+        self._category_of: Dict[int, str] = {}
+        self._sums: Dict[str, np.ndarray] = {}
+        # FAQs moved out of a partition that still holds them, until it is rebuilt without them.
+        self._stale: Dict[str, Set[int]] = {}
+        # Writes per partition, so a rebuild started before one is discarded instead of undoing it.
+        self._changes: Dict[str, int] = {}
+        self._rebuilding: Set[str] = set()
+        # (categories, centroid matrix), swapped as one tuple so searches in worker threads see a consistent pair.
+        self._routing: Tuple[List[str], np.ndarray] = ([], np.zeros((0, dim), dtype=np.float32))
+
+        groups: Dict[str, List[int]] = {}
+        for position, row in enumerate(rows):
+            groups.setdefault(self.category_of(row), []).append(position)
+        for category, positions in groups.items():
+            self.rebuild_partition(category, [rows[p] for p in positions], vectors[positions])
+
+    @staticmethod
+    def category_of(row: Any) -> str:
+        return getattr(row, "category", None) or DEFAULT_CATEGORY
+
+    def __len__(self) -> int:
+        return len(self._category_of)
+
+    @property
+    def rows_scored(self) -> int:
+        return sum(partition.rows_scored for partition in self.partitions.values())
+
+    def sizes(self) -> Dict[str, int]:
+        return {
+            category: len(partition) - len(self._stale.get(category, ()))
+            for category, partition in self.partitions.items()
+        }
+
+    def rebuild_partition(self, category: str, rows: Sequence[Any], vectors: np.ndarray) -> None:
+        """(Re)builds one category's index and centroid from scratch."""
+        for faq_id, owner in list(self._category_of.items()):
+            if owner == category:
+                del self._category_of[faq_id]
+
+        self._stale.pop(category, None)
+        self._changes[category] = self._changes.get(category, 0) + 1
+        if len(rows) == 0:
+            self.partitions.pop(category, None)
+            self._sums.pop(category, None)
+        else:
+            partition = make_index(rows, vectors, self.dim)
+            self.partitions[category] = partition
+            self._sums[category] = partition.vectors().sum(axis=0)
+            for row in rows:
+                self._category_of[row.id] = category
+        self._refresh_centroids()
+
+    def _refresh_centroids(self) -> None:
+        categories = list(self._sums)
+        if categories:
+            centroids = normalize_rows(np.stack([self._sums[c] for c in categories]))
+        else:
+            centroids = np.zeros((0, self.dim), dtype=np.float32)
+        self._routing = (categories, centroids)
+
+    def get(self, faq_id: int) -> Any | None:
+        partition = self.partitions.get(self._category_of.get(faq_id))
+        return None if partition is None else partition.get(faq_id)
+
+    def upsert(self, row: Any, vector: np.ndarray | None) -> None:
+        """
+        Adds or replaces an FAQ. Moving it to another category only hides it in the old
+        partition; rebuilding that one without it is left to a background job.
+        """
+        old_category = self._category_of.get(row.id)
+        category = self.category_of(row)
+
+        if old_category is not None and old_category != category:
+            old = self.partitions[old_category]
+            position = old.position(row.id)
+            moved = old.vectors(slice(position, position + 1))[0].copy()
+            if vector is None:
+                vector = moved
+            self._stale.setdefault(old_category, set()).add(row.id)
+            self._changes[old_category] = self._changes.get(old_category, 0) + 1
+            if len(self._stale[old_category]) == len(old):
+                # Nothing left in it: drop it now instead of rebuilding it empty.
+                self.partitions.pop(old_category)
+                self._sums.pop(old_category)
+                self._stale.pop(old_category)
+            else:
+                self._sums[old_category] = self._sums[old_category] - moved
+            del self._category_of[row.id]
+            self._refresh_centroids()
+
+        self._changes[category] = self._changes.get(category, 0) + 1
+        partition = self.partitions.get(category)
+        if partition is None:
+            partition = make_index([row], normalize_rows(vector), self.dim)
+            self.partitions[category] = partition
+            self._sums[category] = partition.vectors().sum(axis=0)
+            self._category_of[row.id] = category
+            self._refresh_centroids()
+            return
+
+        # Moved back before its old partition was rebuilt: it is replaced in place.
+        self._stale.get(category, set()).discard(row.id)
+        position = partition.position(row.id)
+        if position is not None and row.id not in self._category_of and vector is None:
+            vector = partition.vectors(slice(position, position + 1))[0].copy()
+        previous = None
+        if position is not None and row.id in self._category_of and vector is not None:
+            previous = partition.vectors(slice(position, position + 1))[0].copy()
+        partition.upsert(row, vector)
+        self._category_of[row.id] = category
+        if vector is not None:
+            self._sums[category] = self._sums[category] + normalize_rows(vector)[0]
+            if previous is not None:
+                self._sums[category] = self._sums[category] - previous
+            self._refresh_centroids()
+
+    def rebuilds_due(self) -> List[str]:
+        """Categories still holding moved FAQs, without a rebuild running."""
+        return [category for category in self._stale if category not in self._rebuilding]
+
+    def rebuild_job(self, category: str) -> Tuple[List[Any], np.ndarray, int]:
+        """
+        What a rebuild of `category` without its moved FAQs needs: (rows, a copy of their
+        vectors, the change count it starts from). Marks the rebuild as running.
+        """
+        partition = self.partitions[category]
+        stale = self._stale.get(category, set())
+        keep = [position for position, row in enumerate(partition.rows) if row.id not in stale]
+        self._rebuilding.add(category)
+        return [partition.rows[p] for p in keep], np.array(partition.vectors(keep)), self._changes.get(category, 0)
+
+    def install_partition(self, category: str, partition: FAQIndex | None, changes: int) -> bool:
+        """
+        Swaps in a partition rebuilt by a background job, unless the category was written
+        to since the job started (then False: the caller rebuilds again). None gives up.
+        """
+        self._rebuilding.discard(category)
+        if partition is None or self._changes.get(category, 0) != changes or category not in self.partitions:
+            return False
+        partition.rows_scored = self.partitions[category].rows_scored  # Keeps the metrics counter monotonic
+        self.partitions[category] = partition
+        self._stale.pop(category, None)
+        return True
+
+    def route(self, query: np.ndarray) -> List[str]:
+        """The categories to search for a normalized question vector."""
+        categories, centroids = self._routing
+        if not FAQ_CATEGORY_ROUTING or len(categories) <= FAQ_ROUTE_TOP:
+            return list(categories)
+        scores = centroids @ query
+        top = np.argpartition(-scores, FAQ_ROUTE_TOP - 1)[:FAQ_ROUTE_TOP]
+        return [categories[i] for i in top]
+
+    def _targets(self, query: np.ndarray, category: str | None) -> List[str]:
+        if category is not None:
+            return [category] if category in self.partitions else []
+        return self.route(query)
+
+    def _search_partition(self, category: str, query: np.ndarray) -> Tuple[Any | None, float]:
+        """
+        Best FAQ of one partition, skipping FAQs moved out of it. Searches run in the NLP
+        pool while `upsert` may drop the partition on the event loop, after `route` picked
+        it: a category that is gone has nothing to find.
+        """
+        partition = self.partitions.get(category)
+        if partition is None:
+            return None, -1.0
+        stale = self._stale.get(category)
+        if not stale:
+            return partition.search(query)
+        for row, score in partition.top_k(query, len(stale) + 1):
+            if row.id not in stale:
+                return row, score
+        return None, -1.0
+
+    def search(self, vector: np.ndarray, category: str | None = None) -> Tuple[Any | None, float]:
+        """Best FAQ in the routed categories (or only in `category`, if given)."""
+        query = normalize_rows(vector)[0]
+        best, best_score = None, -1.0
+        for target in self._targets(query, category):
+            row, score = self._search_partition(target, query)
+            if row is not None and score > best_score:
+                best, best_score = row, score
+        return best, best_score
+
+    def search_many(self, vectors: np.ndarray, category: str | None = None) -> List[Tuple[Any | None, float]]:
+        """
+        Batch search. Questions routed to the same category are scored together
+        in one matrix-matrix product per category.
+        """
+        queries = normalize_rows(vectors)
+        results: List[Tuple[Any | None, float]] = [(None, -1.0)] * len(queries)
+
+        by_category: Dict[str, List[int]] = {}
+        for i, query in enumerate(queries):
+            for target in self._targets(query, category):
+                by_category.setdefault(target, []).append(i)
+
+        for target, indices in by_category.items():
+            partition = self.partitions.get(target)
+            if partition is None:
+                continue  # Dropped since it was routed to (see `_search_partition`)
+            if self._stale.get(target):
+                found = [self._search_partition(target, queries[i]) for i in indices]
+            else:
+                found = partition.search_many(queries[indices])
+            for i, (row, score) in zip(indices, found):
+                if row is not None and score > results[i][1]:
+                    results[i] = (row, score)
+        return results
+
+    def search_among(self, vector: np.ndarray, faq_ids: Iterable[int]) -> Tuple[Any | None, float]:
+        """Exact best match among the given FAQs only (e.g. a keyword shortlist)."""
+        by_category: Dict[str, List[int]] = {}
+        for faq_id in faq_ids:
+            category = self._category_of.get(faq_id)
+            if category is not None:
+                by_category.setdefault(category, []).append(faq_id)
+
+        best, best_score = None, -1.0
+        for category, ids in by_category.items():
+            partition = self.partitions.get(category)
+            if partition is None:
+                continue  # Dropped meanwhile (see `_search_partition`)
+            candidates = [position for position in map(partition.position, ids) if position is not None]
+            if not candidates:
+                continue
+            row, score = partition.search_among(vector, np.asarray(candidates))
+            if row is not None and score > best_score:
+                best, best_score = row, score
+        return best, best_score
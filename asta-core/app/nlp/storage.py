@@ -0,0 +1,221 @@
+"""
+How the FAQ index holds its (L2-normalized) vectors in memory.
+
+    float32  4 bytes per value; exact. The default.
+    float16  2 bytes per value; scores differ from float32 by ~1e-3.
+    int8     1 byte per value plus one float32 scale per FAQ (symmetric scalar
+             quantization, scale = max |value| / 127); scores differ by ~1e-2.
+    pca      float32, projected onto the FAQ_PCA_DIM principal directions of the corpus
+             (fitted when the index is built). Dot products in the projected space
+             approximate the cosine similarity; the error depends on the corpus.
+
+Compact modes are decoded to float32 a chunk at a time while scoring, so they save
+resident memory but not arithmetic: on NumPy they trade some speed for size.
+Scores from the compact modes are approximations, also the ones compared against
+the similarity threshold. `benchmark_storage.py` reports the accuracy and speed of
+each mode against spaCy's `Doc.similarity` on your FAQs.
+"""
+import os
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+FAQ_VECTOR_STORAGE = os.getenv("FAQ_VECTOR_STORAGE", "float32")
+FAQ_PCA_DIM = int(os.getenv("FAQ_PCA_DIM", 128))
+
+# Rows decoded to float32 at once while scoring compact storage, to bound temporary memory.
+_DECODE_CHUNK = 16384
+# Rows the PCA projection is fitted on, at most.
+_PCA_SAMPLE = 50000
+
+
+class VectorStore:
+    """Growable (n, dim) matrix of FAQ vectors, stored as float32 (exact)."""
+
+    name = "float32"
+    dtype = np.float32
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._buffer = np.zeros((0, self.code_dim), dtype=self.dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def code_dim(self) -> int:
+        """Values stored per vector."""
+        return self.dim
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self._buffer[:self._size]
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes
+
+    def fit(self, vectors: np.ndarray) -> None:
+        """Learns what the encoding needs from the corpus; only PCA needs anything."""
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return np.asarray(vectors, dtype=self.dtype)
+
+    def decode(self, codes: np.ndarray, selection) -> np.ndarray:
+        """float32 vectors (in scoring space) for `codes`, the stored rows at `selection`."""
+        return np.asarray(codes, dtype=np.float32)
+
+    def prepare(self, queries: np.ndarray) -> np.ndarray:
+        """Normalized (m, dim) questions mapped into the space the codes are scored in."""
+        return queries
+
+    def append(self, vectors: np.ndarray) -> None:
+        codes = self.encode(vectors)
+        needed = self._size + len(codes)
+        if needed > self._buffer.shape[0]:
+            # Grows geometrically so single inserts don't copy the whole corpus.
+            grown = np.zeros((max(16, 2 * needed), self.code_dim), dtype=self.dtype)
+            grown[:self._size] = self.codes
+            self._buffer = grown
+        self._buffer[self._size:needed] = codes
+        self._size = needed
+
+    def set(self, position: int, vector: np.ndarray) -> None:
+        self._buffer[position] = self.encode(vector.reshape(1, -1))[0]
+
+    def vectors(self, selection=None) -> np.ndarray:
+        """
+        The stored vectors as float32 in the original space (a view for float32
+        storage, a reconstruction otherwise). `selection` is a slice or positions.
+        """
+        codes = self.codes if selection is None else self.codes[selection]
+        return self.decode(codes, slice(None) if selection is None else selection)
+
+    def scores(self, query: np.ndarray, positions: np.ndarray | None = None) -> np.ndarray:
+        """Similarity of one normalized question to every stored vector (or those at `positions`)."""
+        return self.scores_many(query.reshape(1, -1), positions)[0]
+
+    def scores_many(self, queries: np.ndarray, positions: np.ndarray | None = None) -> np.ndarray:
+        """(m, n) similarities of normalized questions to the stored vectors."""
+        prepared = self.prepare(queries)
+        if positions is not None:
+            return prepared @ self.decode(self.codes[positions], positions).T
+
+        out = np.empty((len(queries), self._size), dtype=np.float32)
+        for start in range(0, self._size, _DECODE_CHUNK):
+            chunk = slice(start, min(start + _DECODE_CHUNK, self._size))
+            out[:, chunk] = prepared @ self.decode(self._buffer[chunk], chunk).T
+        return out
+
+
+class Float32Store(VectorStore):
+    """Scores the float32 matrix directly, without the decode loop."""
+
+    def scores_many(self, queries: np.ndarray, positions: np.ndarray | None = None) -> np.ndarray:
+        codes = self.codes if positions is None else self.codes[positions]
+        return queries @ codes.T
+
+
+class Float16Store(VectorStore):
+    name = "float16"
+    dtype = np.float16
+
+
+class Int8Store(VectorStore):
+    """Symmetric int8 quantization with one float32 scale per vector."""
+
+    name = "int8"
+    dtype = np.int8
+
+    def __init__(self, dim: int):
+        super().__init__(dim)
+        self._scales = np.zeros(0, dtype=np.float32)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self._scales[:self._size].nbytes
+
+    def _quantize(self, vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return self._quantize(vectors)[0]
+
+    def decode(self, codes: np.ndarray, selection) -> np.ndarray:
+        return codes.astype(np.float32) * self._scales[:self._size][selection][:, None]
+
+    def append(self, vectors: np.ndarray) -> None:
+        codes, scales = self._quantize(vectors)
+        needed = self._size + len(codes)
+        if needed > len(self._scales):
+            grown = np.zeros(max(16, 2 * needed), dtype=np.float32)
+            grown[:self._size] = self._scales[:self._size]
+            self._scales = grown
+        self._scales[self._size:needed] = scales
+        # The scales go in first: a concurrent search may only see rows whose scale is set.
+        super().append(vectors)
+
+    def set(self, position: int, vector: np.ndarray) -> None:
+        codes, scales = self._quantize(vector.reshape(1, -1))
+        self._buffer[position] = codes[0]
+        self._scales[position] = scales[0]
+
+
+class PCAStore(VectorStore):
+    """
+    Vectors projected onto the top principal directions of the corpus (uncentered, so
+    dot products are preserved as well as possible). Fitted once, when the index is built;
+    FAQs added later are projected with the same directions. Corpora smaller than the
+    target dimension are stored unprojected.
+    """
+
+    name = "pca"
+
+    def __init__(self, dim: int, components: int = FAQ_PCA_DIM):
+        self.components = np.eye(dim, dtype=np.float32)  # Identity until fitted
+        self.target_dim = min(components, dim)
+        super().__init__(dim)
+
+    @property
+    def code_dim(self) -> int:
+        return self.components.shape[0]
+
+    def fit(self, vectors: np.ndarray) -> None:
+        if len(vectors) < self.target_dim or self.target_dim >= self.dim or self._size:
+            return
+        if len(vectors) > _PCA_SAMPLE:
+            vectors = vectors[np.random.default_rng(0).choice(len(vectors), size=_PCA_SAMPLE, replace=False)]
+        _, _, vt = np.linalg.svd(np.asarray(vectors, dtype=np.float32), full_matrices=False)
+        self.components = np.ascontiguousarray(vt[:self.target_dim], dtype=np.float32)
+        self._buffer = np.zeros((0, self.code_dim), dtype=self.dtype)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return np.asarray(vectors, dtype=np.float32) @ self.components.T
+
+    def prepare(self, queries: np.ndarray) -> np.ndarray:
+        return queries @ self.components.T
+
+    def vectors(self, selection=None) -> np.ndarray:
+        codes = self.codes if selection is None else self.codes[selection]
+        return codes @ self.components
+
+    def scores_many(self, queries: np.ndarray, positions: np.ndarray | None = None) -> np.ndarray:
+        codes = self.codes if positions is None else self.codes[positions]
+        return self.prepare(queries) @ codes.T
+
+
+STORES = {store.name: store for store in (Float32Store, Float16Store, Int8Store, PCAStore)}
+
+
+def make_store(dim: int, storage: str = FAQ_VECTOR_STORAGE) -> VectorStore:
+    """Creates an empty store for the storage mode selected by `FAQ_VECTOR_STORAGE`."""
+    try:
+        return STORES[storage](dim)
+    except KeyError:
+        raise ValueError(f"Unknown FAQ_VECTOR_STORAGE '{storage}'. Must be one of {', '.join(STORES)}.")
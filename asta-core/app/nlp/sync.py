@@ -0,0 +1,110 @@
+import asyncio
+import os
+from dotenv import load_dotenv
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import ReadSessionLocal, engine
+from app.nlp import utils
+from app.nlp.engine import load_engine
+from app.nlp.loader import (
+    FAQ_SYNC_CHANNEL, build_matchers, install_matchers, loaded_matchers, read_active_embedding, sync_faq_matcher
+)
+from app.nlp.training import train_due_indexes
+from app.nlp.workers import nlp_pool, start_nlp_executor
+
+load_dotenv()
+
+# Seconds between checks of the database corpus version; 0 disables cross-worker syncing.
+# On Postgres, writes also NOTIFY listening workers, so this is only the fallback delay there.
+FAQ_SYNC_INTERVAL = float(os.getenv("FAQ_SYNC_INTERVAL", 2.0))
+
+_wakeup = asyncio.Event()
+_tasks: list[asyncio.Task] = []
+_unavailable_models: set[str] = set()  # Activated models this worker failed to load (reported once)
+
+async def adopt_embedding_model(db: AsyncSession) -> bool:
+    """
+    Switches this worker to the activated embedding model, if it isn't using it yet.
+    The new engine, NLP pool and indexes are prepared while questions are still answered
+    with the old ones, then swapped in together. Returns whether it switched.
+    """
+    active = await read_active_embedding(db)
+    if active is None or active[0] == utils.EMBEDDING_MODEL or active[0] in _unavailable_models:
+        return False
+    model, source = active
+
+    print(f"Switching FAQ embeddings from {utils.EMBEDDING_MODEL} to {model}...")
+    try:
+        new_engine = await asyncio.to_thread(load_engine, source)
+        if new_engine.model_id != model:
+            raise RuntimeError(f"'{source}' loads {new_engine.model_id} here")
+    except Exception as e:
+        _unavailable_models.add(model)
+        print(f"Can't load the active embedding model {model} ({e}); still answering with {utils.EMBEDDING_MODEL}.")
+        return False
+    executor = await start_nlp_executor(new_engine)
+    matchers = await build_matchers(db, new_engine)
+
+    # Nothing awaits from here on, so every question sees either the old model or the new one.
+    utils.use_engine(new_engine)
+    previous = nlp_pool.replace_executor(executor)
+    install_matchers(matchers)
+    if previous is not None:
+        previous.shutdown(wait=False)  # Questions already submitted finish with the old model
+    print(f"FAQ embeddings switched to {model}.")
+    return True
+
+async def _poll() -> None:
+    """
+    Syncs the loaded FAQ matchers whenever the corpus version moves, and switches embedding
+    models when another one is activated (checked every interval, or on NOTIFY).
+    """
+    while True:
+        try:
+            await asyncio.wait_for(_wakeup.wait(), FAQ_SYNC_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+
+        try:
+            # Reads only (on the primary, which is never behind); index backfills write through their own session
+            async with ReadSessionLocal() as db:
+                await adopt_embedding_model(db)
+                # Nothing to keep in sync until a question loads a tenant.
+                if loaded_matchers():
+                    await sync_faq_matcher(db)
+                    train_due_indexes()
+        except Exception as e:
+            print(f"FAQ sync failed: {e}")
+
+async def _listen() -> None:
+    """Wakes the poller as soon as another worker commits an FAQ write (Postgres only)."""
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.add_listener(FAQ_SYNC_CHANNEL, lambda *args: _wakeup.set())
+        await asyncio.Event().wait()  # Keep the connection (and the listener) open until cancelled.
+
+async def _listen_forever() -> None:
+    while True:
+        try:
+            await _listen()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"FAQ sync listener lost ({e}); relying on polling until it reconnects.")
+            await asyncio.sleep(max(FAQ_SYNC_INTERVAL, 1.0) * 5)
+
+def start_faq_sync() -> None:
+    """Starts keeping this worker's FAQ matchers in step with writes made by other workers."""
+    if FAQ_SYNC_INTERVAL <= 0:
+        return
+    _tasks.append(asyncio.create_task(_poll()))
+    if engine.dialect.name == "postgresql":
+        _tasks.append(asyncio.create_task(_listen_forever()))
+
+async def stop_faq_sync() -> None:
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
@@ -0,0 +1,75 @@
+"""
+Index maintenance off the event loop. FAQ writes and syncs only patch the loaded indexes
+(cheap). The expensive part runs here in the background, in the NLP pool, on a copy of
+the vectors, and the result is swapped in at once; until then the old index keeps answering:
+
+- retraining an IVF index that has grown (k-means over the whole corpus)
+- rebuilding a category partition that FAQs were moved out of
+"""
+import asyncio
+import os
+from dotenv import load_dotenv
+
+from app.nlp.ann import make_index, train_clusters
+from app.nlp.loader import loaded_matchers
+from app.nlp.workers import nlp_pool
+
+load_dotenv()
+
+# Seconds a background training job may take (k-means on 100k FAQs takes a few).
+FAQ_INDEX_TRAIN_TIMEOUT = float(os.getenv("FAQ_INDEX_TRAIN_TIMEOUT", 300))
+
+_tasks: set[asyncio.Task] = set()
+
+def _start(job) -> None:
+    task = asyncio.create_task(job)
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+async def _train(index) -> None:
+    try:
+        clusters = await nlp_pool.run(train_clusters, *index.training_job(), timeout=FAQ_INDEX_TRAIN_TIMEOUT)
+        index.install(clusters)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"FAQ index training failed ({e!r}); searching with the previous partitions.")
+    finally:
+        index.training = False
+
+async def _rebuild(router, category: str, job) -> None:
+    while job is not None:
+        rows, vectors, changes = job
+        try:
+            partition = await nlp_pool.run(make_index, rows, vectors, router.dim, timeout=FAQ_INDEX_TRAIN_TIMEOUT)
+        except asyncio.CancelledError:
+            router.install_partition(category, None, changes)
+            raise
+        except Exception as e:
+            router.install_partition(category, None, changes)
+            print(f"Rebuilding the FAQ index of category '{category}' failed ({e!r}); moved FAQs stay hidden in it.")
+            return
+        if router.install_partition(category, partition, changes):
+            return
+        # The category was written to meanwhile: start over with that write included.
+        job = router.rebuild_job(category) if category in router.rebuilds_due() else None
+
+def train_due_indexes() -> None:
+    """
+    Starts background training for every loaded FAQ index that has grown enough to need it,
+    and rebuilds of the category partitions FAQs were moved out of.
+    """
+    for matcher in loaded_matchers().values():
+        for category in matcher.index.rebuilds_due():
+            # Snapshot now: that marks the rebuild as running, so it is started only once.
+            _start(_rebuild(matcher.index, category, matcher.index.rebuild_job(category)))
+        for partition in matcher.index.partitions.values():
+            if partition.training_due and not partition.training:
+                partition.training = True
+                _start(_train(partition))
+
+async def stop_index_training() -> None:
+    for task in list(_tasks):
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
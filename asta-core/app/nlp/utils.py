@@ -1,33 +1,120 @@
-import spacy
-from typing import List
+import threading
+import numpy as np
+from typing import List, Tuple
 from app.models.faq import FAQ
+from app.nlp.index import FAQIndex
+from app.nlp.ann import make_index
+from app.nlp.engine import load_engine
 
-# Load the medium English model.
-nlp = spacy.load("en_core_web_md")
+# Load the NLP engine (the medium English model by default, see `app.nlp.engine`).
+# It is replaced, with `use_engine`, when another embedding model is activated.
+engine = load_engine()
 
-def find_most_similar_faq(user_question: str, faqs: List[FAQ]) -> FAQ | None:
+# Identifies which model produced a stored embedding, e.g. "en_core_web_md-3.7.0".
+# Vectors from a different model are never mixed into the same index.
+EMBEDDING_MODEL = engine.model_id
+EMBEDDING_DIM = engine.dim
+
+# NLP pool threads are pinned to the engine their pool was started with (see `bind_thread_engine`).
+_thread = threading.local()
+
+# Minimum similarity for a FAQ to be returned as an answer.
+SIMILARITY_THRESHOLD = 0.6
+
+def use_engine(new_engine) -> None:
+    """Makes `new_engine` the active one for this process (new embeddings, new indexes)."""
+    global engine, EMBEDDING_MODEL, EMBEDDING_DIM
+    engine = new_engine
+    EMBEDDING_MODEL = new_engine.model_id
+    EMBEDDING_DIM = new_engine.dim
+
+def bind_thread_engine(thread_engine) -> None:
     """
-    Compares a user's question to a list of FAQs and returns the most similar one.
-    Uses spaCy's word vector similarity.
+    Pins the calling thread to an engine, so an NLP pool thread keeps embedding with
+    the model of the indexes it was started for even after another model is activated.
     """
-    if not faqs:
-        return None
+    _thread.engine = thread_engine
+
+def current_engine():
+    return getattr(_thread, "engine", engine)
 
-    user_doc = nlp(user_question.lower().strip())
+def normalize_question(text: str) -> str:
+    """Normalizes question text the same way for FAQs and incoming questions."""
+    return text.lower().strip()
 
-    best_faq = None
-    highest_similarity = -1.0
+def embed_question(text: str) -> np.ndarray:
+    """Returns the document vector (mean of word vectors) for a question."""
+    return current_engine().embed(normalize_question(text))
 
-    for faq in faqs:
-        faq_doc = nlp(faq.question.lower().strip())
-        similarity = user_doc.similarity(faq_doc)
-        print(f"DEBUG: '{user_question}' vs '{faq.question}' = {similarity}")
-        
-        if similarity > highest_similarity:
-            highest_similarity = similarity
-            best_faq = faq
+def embed_questions(texts: List[str], using=None) -> np.ndarray:
+    """
+    Embeds many questions at once and returns an (n, dim) matrix.
+    The texts are streamed through the engine (`using`, else the current one) in batches (`nlp.pipe`).
+    """
+    using = using or current_engine()
+    if not texts:
+        return np.zeros((0, using.dim), dtype=np.float32)
+    return np.stack(using.embed_many(normalize_question(text) for text in texts))
+
+def build_faq_index(faqs: List[FAQ], vectors: np.ndarray | None = None) -> FAQIndex:
+    """
+    Packs FAQs and their vectors into the configured index (exact or IVF, see `app.nlp.ann`).
+    If no precomputed vectors are given, every FAQ question is embedded once here.
+    """
+    if not faqs:
+        return make_index([], dim=EMBEDDING_DIM)
 
-    if highest_similarity < 0.6:
+    if vectors is None:
+        vectors = embed_questions([faq.question for faq in faqs])
+    return make_index(faqs, vectors)
+
+def find_most_similar_faq(user_question: str, faqs: List[FAQ] | FAQIndex) -> FAQ | None:
+    """
+    Compares a user's question to the FAQs and returns the most similar one.
+    Uses spaCy's word vector similarity.
+    Pass a prebuilt FAQIndex to avoid re-embedding the FAQs on every call.
+    """
+    if not isinstance(faqs, FAQIndex):
+        faqs = build_faq_index(faqs)
+
+    if len(faqs) == 0:
         return None
 
+    best_faq, _ = match_vector(embed_question(user_question), faqs)
     return best_faq
+
+def match_vector(vector: np.ndarray, faq_index: FAQIndex) -> Tuple[FAQ | None, float]:
+    """
+    Returns (best FAQ, similarity score) for an already-embedded question.
+    The FAQ is None if the score is below the threshold.
+    """
+    best_faq, highest_similarity = faq_index.search(vector)
+
+    if highest_similarity < SIMILARITY_THRESHOLD:
+        return None, highest_similarity
+
+    return best_faq, highest_similarity
+
+def find_most_similar_faqs(user_questions: List[str], faqs: List[FAQ] | FAQIndex) -> List[Tuple[FAQ | None, float]]:
+    """
+    Batch version of `find_most_similar_faq`.
+    Returns (best FAQ or None if below the threshold, similarity score) for each question.
+    """
+    if not isinstance(faqs, FAQIndex):
+        faqs = build_faq_index(faqs)
+
+    if len(faqs) == 0:
+        return [(None, 0.0) for _ in user_questions]
+
+    return match_vectors(embed_questions(user_questions), faqs)
+
+def match_vectors(vectors: np.ndarray, faq_index: FAQIndex) -> List[Tuple[FAQ | None, float]]:
+    """Batch version of `match_vector`; also returns each best score."""
+    if len(faq_index) == 0:
+        return [(None, 0.0) for _ in vectors]
+
+    matches = faq_index.search_many(vectors)
+    return [
+        (best_faq if score >= SIMILARITY_THRESHOLD else None, score)
+        for best_faq, score in matches
+    ]
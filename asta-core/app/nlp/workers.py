@@ -0,0 +1,120 @@
+import asyncio
+import os
+import numpy as np
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Tuple
+from dotenv import load_dotenv
+
+from app.core.executor import BoundedExecutor
+from app.models.faq import FAQ
+from app.nlp import utils
+from app.nlp.cascade import FAQMatcher, LayeredMatcher
+from app.nlp.engine import load_engine
+from app.nlp.utils import bind_thread_engine, embed_question, embed_questions
+from app.nlp.cache import answer_cache, answer_key
+
+load_dotenv()
+
+# Where question embedding runs, so it never blocks the event loop:
+# "process" - worker processes (spaCy parsing holds the GIL, so threads would still contend)
+# "thread"  - a thread pool; enough with NLP_ENGINE=vectors or light traffic
+NLP_EXECUTOR = os.getenv("NLP_EXECUTOR", "process")
+NLP_WORKERS = int(os.getenv("NLP_WORKERS", os.cpu_count() or 2))
+NLP_QUEUE_SIZE = int(os.getenv("NLP_QUEUE_SIZE", 64))  # Calls allowed to wait for a worker
+NLP_TIMEOUT = float(os.getenv("NLP_TIMEOUT", 5.0))     # Seconds, including time spent waiting
+
+def _warm_up() -> None:
+    """Runs once in each worker process, so the model is loaded before the first question."""
+    embed_question("warm up")
+
+def _start_process(source: str) -> None:
+    """Runs once in each worker process: loads the engine its pool was made for, then warms it up."""
+    if utils.engine.source != source:
+        utils.use_engine(load_engine(source))
+    _warm_up()
+
+def make_nlp_executor(max_workers: int, engine=None) -> Executor:
+    """An executor whose workers embed with `engine` (the active one by default) for as long as they live."""
+    engine = engine or utils.engine
+    if NLP_EXECUTOR == "process":
+        return ProcessPoolExecutor(max_workers=max_workers, initializer=_start_process, initargs=(engine.source,))
+    if NLP_EXECUTOR == "thread":
+        return ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="nlp",
+            initializer=bind_thread_engine, initargs=(engine,),
+        )
+    raise ValueError(f"Unknown NLP_EXECUTOR '{NLP_EXECUTOR}'. Must be 'process' or 'thread'.")
+
+nlp_pool = BoundedExecutor("nlp", make_nlp_executor, NLP_WORKERS, NLP_QUEUE_SIZE, NLP_TIMEOUT)
+
+async def start_nlp_executor(engine) -> Executor:
+    """Creates and warms up an executor for `engine`, for switching the NLP pool to another model."""
+    executor = make_nlp_executor(NLP_WORKERS, engine)
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(loop.run_in_executor(executor, _warm_up) for _ in range(NLP_WORKERS)))
+    return executor
+
+async def start_nlp_pool() -> None:
+    """Starts the workers (and loads the model in each) at startup instead of on the first ask."""
+    await asyncio.gather(*(nlp_pool.run(_warm_up) for _ in range(NLP_WORKERS)))
+
+async def embed_question_async(question: str) -> Tuple[str, np.ndarray]:
+    """Embeds one question in the NLP pool. Returns the embedding model along with the vector."""
+    # Read in the same step as the call is submitted: a model switch replaces the pool and the model together.
+    model = utils.EMBEDDING_MODEL
+    return model, await nlp_pool.run(embed_question, question)
+
+async def match_question(question: str, matcher: FAQMatcher | LayeredMatcher, category: str | None = None) -> FAQ | None:
+    """
+    Finds the best FAQ for a question without blocking the event loop.
+    Repeated questions come from the answer cache and exact FAQ questions from a
+    dict lookup. Otherwise the question is embedded in the NLP pool and matched
+    (keyword shortlist, then vectors; NumPy releases the GIL) in a thread.
+    With a `category`, only FAQs of that category are considered and routing is skipped.
+    """
+    key = answer_key(matcher.tenants, question, category)
+    cached = answer_cache.get(key)
+    if cached is not None:
+        faq_id, _ = cached
+        return None if faq_id is None else matcher.get(faq_id)
+
+    best_faq = matcher.match_exact(question, category)
+    if best_faq is not None:
+        answer_cache.set(key, (best_faq.id, 1.0))
+        return best_faq
+
+    vector = await nlp_pool.run(embed_question, question)
+    best_faq, score = await asyncio.to_thread(matcher.match_vector, question, vector, category)
+    answer_cache.set(key, (best_faq.id if best_faq else None, score))
+    return best_faq
+
+async def match_questions(
+    questions: List[str], matcher: FAQMatcher | LayeredMatcher, category: str | None = None
+) -> List[Tuple[FAQ | None, float]]:
+    """Batch version of `match_question`: one pool call embeds every question still unanswered."""
+    keys = [answer_key(matcher.tenants, question, category) for question in questions]
+    matches: List[Tuple[FAQ | None, float] | None] = [None] * len(questions)
+    to_embed = []
+
+    for position, (question, key) in enumerate(zip(questions, keys)):
+        cached = answer_cache.get(key)
+        if cached is not None:
+            faq_id, score = cached
+            matches[position] = (None if faq_id is None else matcher.get(faq_id), score)
+            continue
+        best_faq = matcher.match_exact(question, category)
+        if best_faq is not None:
+            matches[position] = (best_faq, 1.0)
+            answer_cache.set(key, (best_faq.id, 1.0))
+            continue
+        to_embed.append(position)
+
+    if to_embed:
+        texts = [questions[position] for position in to_embed]
+        vectors = await nlp_pool.run(embed_questions, texts)
+        found = await asyncio.to_thread(matcher.match_vectors, texts, vectors, category)
+        for position, (best_faq, score) in zip(to_embed, found):
+            matches[position] = (best_faq, score)
+            answer_cache.set(keys[position], (best_faq.id if best_faq else None, score))
+
+    return matches
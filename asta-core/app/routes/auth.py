@@ -2,8 +2,12 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
 from app.schemas.user import Token
-from app.auth.auth_handler import verify_password, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
-from app.db.session import get_db
+from app.auth.auth_handler import (
+    verify_password_async, hashing_errors, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES,
+    oauth2_scheme, get_current_user, revoke_token,
+)
+from app.auth.principal import Principal
+from app.db.session import get_primary_read_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.user import User
@@ -11,7 +15,7 @@ from app.models.user import User
 router = APIRouter(tags=["authentication"])
 
 @router.post("/login", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_primary_read_db)):
     """
     Authenticates a user and returns an access token.
     """
@@ -21,12 +25,22 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     user = result.scalar_one_or_none()
 
     # 2. If user not found or password is wrong, return error
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    #    (bcrypt runs in the hashing pool; when that is full the login is refused with a 503)
+    password_ok = False
+    if user:
+        with hashing_errors():
+            password_ok = await verify_password_async(form_data.password, user.hashed_password)
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This account has been deactivated.",
+        )
 
     # 3. Create the JWT token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -37,3 +51,12 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
 
     # 4. Return the token
     return {"access_token": access_token, "token_type": "bearer"}
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(token: str = Depends(oauth2_scheme), current_user: Principal = Depends(get_current_user)):
+    """
+    Revokes the access token the request was made with: it is rejected from now on, even
+    though it hasn't expired.
+    """
+    await revoke_token(token)
+    return None
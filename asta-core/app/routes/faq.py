@@ -1,29 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import codecs
+from contextlib import contextmanager
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from pydantic import BaseModel
+from sqlalchemy import delete, insert, update
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 
-from app.db.session import get_db
-from app.schemas.faq import FAQ, FAQCreate
+from app.db.session import get_db, get_primary_read_db, get_read_db
+from app.auth.auth_handler import get_current_admin, get_optional_user, get_optional_user_strict, get_tenant
+from app.auth.principal import Principal
+from app.schemas.faq import FAQ, FAQCreate, FAQMatch, FAQImportReport
 from app.models.faq import FAQ as FAQModel
-from app.nlp.utils import find_most_similar_faq
+from app.models.faq_embedding import FAQEmbedding
+from app.core.executor import ExecutorOverloaded
+from app.nlp.loader import (
+    get_search_matcher, add_faq_to_matcher, make_faq_embedding, reload_faq_matcher, claim_faq_version
+)
+from app.nlp.importer import guess_format, import_faqs
+from app.nlp.training import train_due_indexes
+from app.nlp.workers import match_question, match_questions, embed_question_async
 
 class QuestionRequest(BaseModel):
     question: str
+    category: Optional[str] = None  # Only search FAQs of this category (skips category routing)
+
+class BatchQuestionRequest(BaseModel):
+    questions: List[str] = Field(..., min_length=1, max_length=256)
+    category: Optional[str] = None  # Applies to every question in the batch
+
+@contextmanager
+def nlp_errors():
+    """Turns a full or slow NLP pool into 503 / 504 responses."""
+    try:
+        yield
+    except ExecutorOverloaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="ASTA is busy answering other questions. Please try again in a moment.",
+            headers={"Retry-After": "1"},
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Answering took too long. Please try again.",
+        )
 
 router = APIRouter()
 
 @router.post("/ask", response_model=FAQ)
-async def ask_question(request: QuestionRequest, db: AsyncSession = Depends(get_db)):
+async def ask_question(
+    request: QuestionRequest,
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal | None = Depends(get_optional_user),
+):
     """
-    Ask ASTA a question. It will find the most relevant FAQ answer.
+    Ask ASTA a question. It will find the most relevant FAQ answer in the caller's
+    company knowledge base and the shared one (only the shared one for anonymous callers).
     """
-    # 1. Get all FAQs from the database
-    result = await db.execute(select(FAQModel))
-    all_faqs = result.scalars().all()
+    # 1. Get the caller's in-memory FAQ matchers (loaded from the database on first use)
+    matcher = await get_search_matcher(db, get_tenant(user))
 
-    # 2. Use NLP to find the best match
-    best_faq = find_most_similar_faq(request.question, all_faqs)
+    # 2. Use NLP to find the best match (in the NLP pool, off the event loop)
+    with nlp_errors():
+        best_faq = await match_question(request.question, matcher, request.category)
 
     if not best_faq:
         raise HTTPException(
@@ -33,11 +73,137 @@ async def ask_question(request: QuestionRequest, db: AsyncSession = Depends(get_
 
     return best_faq
 
+@router.post("/ask/batch", response_model=List[FAQMatch])
+async def ask_questions(
+    request: BatchQuestionRequest,
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal | None = Depends(get_optional_user),
+):
+    """
+    Ask several questions at once. The questions are embedded together and scored
+    in one pass per FAQ category. Unanswered questions come back with `matched: false`.
+    """
+    matcher = await get_search_matcher(db, get_tenant(user))
+    with nlp_errors():
+        matches = await match_questions(request.questions, matcher, request.category)
+
+    return [
+        FAQMatch(question=question, faq=best_faq, score=score, matched=best_faq is not None)
+        for question, (best_faq, score) in zip(request.questions, matches)
+    ]
+
 @router.post("/", response_model=FAQ, status_code=201)
-async def create_faq(faq_data: FAQCreate, db: AsyncSession = Depends(get_db)):
-    """Create a new FAQ entry (for admin use)."""
-    new_faq = FAQModel(**faq_data.dict())
-    db.add(new_faq)
+async def create_faq(
+    faq_data: FAQCreate,
+    db: AsyncSession = Depends(get_db),
+    user: Principal | None = Depends(get_optional_user_strict),
+):
+    """
+    Create a new FAQ entry (for admin use) in the caller's company knowledge base, or in
+    the shared one when no token is sent.
+    """
+    # Embed the question once, at write time, and store it alongside the FAQ
+    with nlp_errors():
+        model, vector = await embed_question_async(faq_data.question)
+
+    # Stamp it with a new corpus version, so the other workers pick it up
+    version = await claim_faq_version(db)
+    result = await db.execute(
+        insert(FAQModel)
+        .values(**faq_data.dict(), tenant=get_tenant(user), version=version)
+        .returning(FAQModel)  # The new id and server defaults, without a refresh
+    )
+    new_faq = result.scalar_one()
+    db.add(make_faq_embedding(new_faq.id, vector, model))
+
     await db.commit()
-    await db.refresh(new_faq)
+    add_faq_to_matcher(new_faq, vector, model)
+    train_due_indexes()  # If the index has grown enough to retrain (in the background)
     return new_faq
+
+@router.post("/import", response_model=FAQImportReport)
+async def import_faq_file(
+    file: UploadFile = File(...),
+    format: Optional[Literal["ndjson", "csv"]] = Query(None, description="Defaults to the file extension"),
+    db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_primary_read_db),
+    user: Principal = Depends(get_current_admin),
+):
+    """
+    Bulk-import FAQs from an NDJSON or CSV file into the admin's knowledge base (their
+    company's, or the shared one for admins without a company). Rows with a question
+    that already exists update its answer and category. Invalid rows are skipped and
+    listed in the report; the rest are imported.
+    """
+    # 1. Work out the file format
+    fmt = format or guess_format(file.filename)
+    if fmt is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Unknown file format. Upload a .ndjson, .jsonl or .csv file, or pass ?format=.",
+        )
+
+    # 2. Stream the rows into the database in batches
+    tenant = get_tenant(user)
+    try:
+        report = await import_faqs(db, read_db, codecs.iterdecode(file.file, "utf-8-sig"), fmt, tenant)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="The file must be UTF-8 encoded.")
+
+    # 3. Rebuild the tenant's FAQ index once, now that every batch is in. That only reads
+    #    (vector backfills write through their own session, which on SQLite needs the one
+    #    writer connection free), so it runs on a read session.
+    if report.imported:
+        await reload_faq_matcher(read_db, tenant)
+    return report
+
+@router.put("/{faq_id}", response_model=FAQ)
+async def update_faq(
+    faq_id: int,
+    faq_data: FAQCreate,
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_current_admin),
+):
+    """
+    Edit an FAQ entry of the admin's knowledge base (their company's, or the shared one for
+    admins without a company). The stored vector is refreshed if the question changes.
+    """
+    # Only FAQs of the caller's own knowledge base can be edited
+    owned = (FAQModel.id == faq_id, FAQModel.tenant == get_tenant(user))
+    values = faq_data.dict()
+
+    # 1. Same question: its stored vector still matches, so one UPDATE ... RETURNING does it
+    version = await claim_faq_version(db)
+    result = await db.execute(
+        update(FAQModel)
+        .where(*owned, FAQModel.question == faq_data.question)
+        .values(**values, version=version)
+        .returning(FAQModel)
+    )
+    faq = result.scalar_one_or_none()
+
+    model, vector = None, None
+    if faq is None:
+        # 2. The question changed (or the FAQ isn't the caller's). Give the version lock
+        #    back while the new question is embedded, then update by id alone.
+        await db.rollback()
+        with nlp_errors():
+            model, vector = await embed_question_async(faq_data.question)
+
+        version = await claim_faq_version(db)
+        result = await db.execute(
+            update(FAQModel).where(*owned).values(**values, version=version).returning(FAQModel)
+        )
+        faq = result.scalar_one_or_none()
+
+        if not faq:
+            raise HTTPException(status_code=404, detail="FAQ not found.")
+
+        await db.merge(make_faq_embedding(faq.id, vector, model))
+        # Vectors from other models (e.g. one being re-embedded) no longer match the question
+        await db.execute(delete(FAQEmbedding).where(FAQEmbedding.faq_id == faq.id, FAQEmbedding.model != model))
+
+    await db.commit()
+    add_faq_to_matcher(faq, vector, model)
+    train_due_indexes()
+    return faq
@@ -0,0 +1,83 @@
+from typing import Optional
+from fastapi import APIRouter
+
+from app.auth.auth_handler import hash_pool, token_cache_stats
+from app.auth.principal import principal_cache
+from app.db.session import engine, pool_stats, read_engine, read_pool_stats, replica_set
+from app.nlp import utils
+from app.nlp.cache import answer_cache
+from app.nlp.loader import (
+    FAQ_TENANT_MEMORY_MB, cascade_stats, get_corpus_version, get_loaded_matcher,
+    loaded_matchers, loaded_memory_bytes, tenant_stats,
+)
+from app.nlp.workers import nlp_pool
+
+router = APIRouter()
+
+@router.get("/faq")
+async def faq_metrics(tenant: Optional[str] = None):
+    """
+    Answer cache, matching cascade, NLP pool and loaded FAQ index statistics.
+    Pass `tenant` (a company name; "" for the shared FAQs) for that tenant's index.
+    """
+    matchers = loaded_matchers()
+    corpus_size = sum(len(matcher) for matcher in matchers.values())
+    metrics = {
+        "embedding": {"model": utils.EMBEDDING_MODEL, "dim": utils.EMBEDDING_DIM, "source": utils.engine.source},
+        "tenants": {
+            "loaded": len(matchers),
+            "size": corpus_size,
+            "memory_bytes": loaded_memory_bytes(),
+            "memory_budget_bytes": int(FAQ_TENANT_MEMORY_MB * 1024 * 1024),
+            **tenant_stats,
+        },
+        "cache": answer_cache.stats(),
+        "cascade": cascade_stats.stats(corpus_size),
+        "nlp_pool": nlp_pool.stats(),
+    }
+
+    if tenant is not None:
+        matcher = get_loaded_matcher(tenant)
+        metrics["index"] = {
+            "tenant": tenant,
+            "corpus_version": get_corpus_version(tenant),
+            "loaded": matcher is not None,
+            "size": len(matcher) if matcher is not None else 0,
+            "memory_bytes": matcher.memory_bytes() if matcher is not None else 0,
+            "categories": {
+                category: {
+                    "type": type(partition).__name__,
+                    "size": len(partition),
+                    "storage": partition.store.name,
+                    "vector_bytes": partition.store.nbytes,
+                }
+                for category, partition in matcher.index.partitions.items()
+            } if matcher is not None else {},
+        }
+    return metrics
+
+@router.get("/db")
+async def db_metrics():
+    """
+    Database connection pool usage: connections checked out and idle, overflow in use,
+    and how long requests waited for a connection. For sizing DB_POOL_SIZE / DB_MAX_OVERFLOW.
+    Read replicas (if configured) are listed with their health and open read sessions.
+    On SQLite, "primary" is the single writer connection and "primary_reads" the read pool.
+    """
+    metrics = {"primary": pool_stats.stats(engine.sync_engine.pool)}
+    if read_pool_stats is not None:
+        metrics["primary_reads"] = read_pool_stats.stats(read_engine.sync_engine.pool)
+    return {**metrics, **replica_set.stats()}
+
+@router.get("/auth")
+async def auth_metrics():
+    """
+    Password hashing pool (logins and sign-ups): bcrypt calls running and queued, rejected
+    when the queue is full, and how long they took. Plus the hit rates of the verified-token
+    and principal caches.
+    """
+    return {
+        "hashing": hash_pool.stats(),
+        "token_cache": token_cache_stats(),
+        "principal_cache": principal_cache.stats(),
+    }
@@ -3,12 +3,13 @@ import httpx
 from fastapi.background import BackgroundTasks
 from fastapi import APIRouter, HTTPException, status, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, insert, update, delete
+from functools import lru_cache
 from typing import List, Optional
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.task import Task
-from app.models.user import User
+from app.auth.principal import Principal
 from app.schemas.task import TaskCreate, Task as TaskSchema, TaskStatus, TaskCategory
 from app.auth.auth_handler import get_current_user
 
@@ -45,6 +46,29 @@ def validate_sort_params(sort_by: str, sort_order: str) -> None:
             detail=f"Invalid sort order '{sort_order}'. Must be 'asc' or 'desc'"
         )
 
+# ==== PRECOMPILED QUERIES =====
+# The task reads run on most requests, so their statements are built once, with bound
+# parameters: SQLAlchemy then skips constructing and cache-keying them per request, and
+# asyncpg reuses one prepared statement per variant.
+task_by_id_query = select(Task).where(Task.id == bindparam("task_id"), Task.user_id == bindparam("user_id"))
+
+@lru_cache(maxsize=None)
+def task_list_query(by_status: bool, by_category: bool, by_importance: bool, sort_by: str, sort_order: str):
+    """
+    The task list statement for one combination of filters and sorting (at most 64 of them).
+    Bound parameters: user_id, plus status / category / is_important for the filters in use.
+    """
+    query = select(Task).where(Task.user_id == bindparam("user_id"))
+    if by_status:
+        query = query.where(Task.status == bindparam("status"))
+    if by_category:
+        query = query.where(Task.category == bindparam("category"))
+    if by_importance:
+        query = query.where(Task.is_important == bindparam("is_important"))
+
+    sort_column = getattr(Task, sort_by)
+    return query.order_by(sort_column.asc() if sort_order == "asc" else sort_column.desc())
+
 # ===== ROUTES =====
 router = APIRouter()
 
@@ -53,18 +77,17 @@ async def create_task(
     task_data: TaskCreate,
     background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Create a new task for the authenticated user."""
-    new_task = Task(
-        **task_data.dict(),
-        user_id=current_user.id,
-        status='pending'
+    # INSERT ... RETURNING: the new row (id, server defaults) comes back with the insert itself
+    result = await db.execute(
+        insert(Task)
+        .values(**task_data.dict(), user_id=current_user.id, status='pending')
+        .returning(Task)
     )
-
-    db.add(new_task)
+    new_task = result.scalar_one()
     await db.commit()
-    await db.refresh(new_task)
 
     if new_task.is_important:
         webhook_payload = {
@@ -89,8 +112,8 @@ async def get_tasks(
     is_important: Optional[bool] = None,
     sort_by: Optional[str] = "created_at",
     sort_order: Optional[str] = "desc",
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get all tasks for the authenticated user with filtering and sorting.
@@ -101,27 +124,15 @@ async def get_tasks(
     - sort_by: Field to sort by (created_at, updated_at, due_date, title)
     - sort_order: Sort order (asc, desc)
     """
-    # Start with base query - only tasks for current user
-    query = select(Task).where(Task.user_id == current_user.id)
-
-    # Apply filters
-    if status:
-        query = query.where(Task.status == status)
-    if category:
-        query = query.where(Task.category == category)
-    if is_important is not None:
-        query = query.where(Task.is_important == is_important)
-
-    # Validate and apply sorting
+    # Validate the sorting first: it selects one of the precompiled statements
     validate_sort_params(sort_by, sort_order)
 
-    if sort_order.lower() == "asc":
-        query = query.order_by(getattr(Task, sort_by).asc())
-    else:
-        query = query.order_by(getattr(Task, sort_by).desc())
+    # Pick the statement for this filter/sort combination - always only the current user's tasks
+    query = task_list_query(status is not None, category is not None, is_important is not None, sort_by, sort_order)
+    params = {"user_id": current_user.id, "status": status, "category": category, "is_important": is_important}
 
-    # Execute query
-    result = await db.execute(query)
+    # Execute query, binding the parameters of the filters in use
+    result = await db.execute(query, {key: value for key, value in params.items() if value is not None})
     tasks = result.scalars().all()
 
     return tasks
@@ -129,12 +140,11 @@ async def get_tasks(
 @router.get("/{task_id}", response_model=TaskSchema)
 async def get_task(
     task_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get a specific task. User can only access their own tasks."""
-    query = select(Task).where(Task.id == task_id, Task.user_id == current_user.id)
-    result = await db.execute(query)
+    result = await db.execute(task_by_id_query, {"task_id": task_id, "user_id": current_user.id})
     task = result.scalar_one_or_none()
 
     if not task:
@@ -150,10 +160,17 @@ async def update_task(
     task_id: int,
     task_data: TaskCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update a specific task. User can only update their own tasks."""
-    query = select(Task).where(Task.id == task_id, Task.user_id == current_user.id)
+    # One UPDATE ... RETURNING; the user_id condition is the ownership check,
+    # so another user's task matches no row, exactly like a missing one.
+    query = (
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == current_user.id)
+        .values(**task_data.dict())
+        .returning(Task)
+    )
     result = await db.execute(query)
     task = result.scalar_one_or_none()
 
@@ -163,33 +180,27 @@ async def update_task(
             detail="Task not found."
         )
 
-    # Update the task attributes
-    for field, value in task_data.dict().items():
-        setattr(task, field, value)
-
     await db.commit()
-    await db.refresh(task)
- 
+
     return task
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete a specific task. User can only delete their own tasks."""
-    query = select(Task).where(Task.id == task_id, Task.user_id == current_user.id)
+    query = delete(Task).where(Task.id == task_id, Task.user_id == current_user.id).returning(Task.id)
     result = await db.execute(query)
-    task = result.scalar_one_or_none()
+    deleted_id = result.scalar_one_or_none()
 
-    if not task:
+    if deleted_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found."
         )
 
-    await db.delete(task)
     await db.commit()
 
     return None
@@ -1,57 +1,69 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update
+from sqlalchemy.exc import IntegrityError
 from typing import List
 
-from app.db.session import get_db
+from app.db.session import get_db, get_primary_read_db, get_read_db
 from app.models.user import User
 from app.schemas.user import UserCreate, User as UserSchema
-from app.auth.auth_handler import get_password_hash, get_current_user
+from app.auth.auth_handler import get_password_hash_async, hashing_errors, get_current_user
+from app.auth.principal import Principal, invalidate_principal
 
 router = APIRouter()
 
 @router.post("/", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-async def create_user(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
+async def create_user(
+    user_data: UserCreate,
+    db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_primary_read_db),
+):
     """
     Create a new user.
-    - Checks if email already exists.
+    - Rejects an email that already exists, before paying for the password hash.
     - Hashes the password before storing.
-    - Saves the new user to the database.
+    - Inserts the user and reads back the stored row in one statement.
     - Returns the created user (without password).
     """
-    # 1. Check if user with email already exists
-    existing_user_query = select(User).where(User.email == user_data.email)
-    result = await db.execute(existing_user_query)
-    existing_user = result.scalar_one_or_none()
-    
-    if existing_user:
+    # 1. A known email is refused up front: bcrypt is the expensive part of a sign-up.
+    #    Read outside the write transaction, which would otherwise stay open during the hash.
+    query = select(User.id).where(User.email == user_data.email)
+    if (await read_db.execute(query)).first() is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A user with this email already exists.",
         )
 
-    # 2. Hash the password
-    hashed_password = get_password_hash(user_data.password)
+    # 2. Hash the password (in the hashing pool, off the event loop)
+    with hashing_errors():
+        hashed_password = await get_password_hash_async(user_data.password)
 
-    # 3. Create new user object
-    new_user = User(
+    # 3. INSERT ... RETURNING the new row (id and database-generated timestamps)
+    query = insert(User).values(
         email=user_data.email,
         hashed_password=hashed_password,
         full_name=user_data.full_name,
         company_name=user_data.company_name,
-    )
+    ).returning(User)
 
-    # 4. Add to database and commit
-    db.add(new_user)
-    await db.commit()
-    await db.refresh(new_user)  # Refresh to get the database-generated values like ID
+    # 4. The unique email constraint catches a concurrent sign-up with the same email
+    try:
+        result = await db.execute(query)
+        new_user = result.scalar_one()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A user with this email already exists.",
+        )
 
     # 5. Return the created user (matches UserSchema which excludes password)
     return new_user
 
 @router.get("/", response_model=List[UserSchema])
 async def get_all_users(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)  # Basic protection
 ):
     """
@@ -69,7 +81,7 @@ async def get_all_users(
 @router.get("/{user_id}", response_model=UserSchema)
 async def get_user(
     user_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)  # Basic protection
 ):
     """
@@ -87,3 +99,32 @@ async def get_user(
         )
     
     return user.to_schema()
+
+@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def deactivate_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Deactivate a user: the user themselves, or an admin. The row is kept (their tasks
+    reference it), but they can no longer sign in and their tokens are refused.
+    """
+    if current_user.id != user_id and not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can deactivate other users."
+        )
+
+    query = update(User).where(User.id == user_id).values(is_active=False).returning(User.id)
+    result = await db.execute(query)
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with ID {user_id} not found."
+        )
+    await db.commit()
+
+    # The cached principal would keep them signed in until it expires
+    await invalidate_principal(user_id)
+    return None
@@ -1,3 +1,3 @@
 from .user import User, UserCreate, UserLogin
 from .task import Task, TaskCreate, TaskFilterSort
-from .faq import FAQ, FAQCreate
+from .faq import FAQ, FAQCreate, FAQMatch, FAQImportError, FAQImportReport
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import List, Optional
 
 class FAQBase(BaseModel):
     question: str
@@ -13,3 +14,22 @@ class FAQ(FAQBase):
 
     class Config:
         from_attributes = True  # Allows ORM mode (formerly 'orm_mode')
+
+# One result of a batch ask. `faq` is None (and `matched` False) when nothing scored above the threshold.
+class FAQMatch(BaseModel):
+    question: str
+    faq: Optional[FAQ] = None
+    score: float
+    matched: bool
+
+# A row of a bulk import that could not be imported. `row` is its line number in the file.
+class FAQImportError(BaseModel):
+    row: int
+    error: str
+
+class FAQImportReport(BaseModel):
+    rows: int = 0                # Data rows read from the file
+    imported: int = 0            # FAQs inserted or updated
+    embedded: int = 0            # Questions embedded (new or changed questions only)
+    failed: int = 0
+    errors: List[FAQImportError] = []  # The first FAQ_IMPORT_MAX_ERRORS failures
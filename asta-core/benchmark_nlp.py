@@ -0,0 +1,320 @@
+# benchmark_nlp.py
+"""
+Benchmarks the FAQ matching strategies on synthetic corpora.
+
+For each corpus size it generates FAQs (with categories) and questions whose right
+answer is known, then measures every strategy:
+
+    baseline   find_most_similar_faq() with a plain FAQ list (re-embeds every FAQ per question)
+    exact      brute-force FAQIndex
+    ivf-pN     IVFIndex probing N partitions (always trained, whatever FAQ_IVF_MIN_SIZE says)
+    cascade    the served FAQMatcher: exact lookup -> keyword shortlist -> routed vector search
+
+Reported per strategy: p50/p99 latency and questions/sec (one question at a time, and
+batched where the strategy supports it), build time, memory held by the index, top-1
+recall against the known answers, agreement with the exact strategy, and rows scored
+per question. Question embedding is measured once per corpus, since it is the same
+for every strategy. Results are written as JSON. Run it from asta-core/:
+
+    python benchmark_nlp.py --sizes 100 1000 10000 100000 --output benchmark.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.nlp.ann import FAQ_IVF_LISTS, FAQ_IVF_PROBE, IVFIndex
+from app.nlp.cascade import FAQMatcher
+from app.nlp.index import FAQEntry, FAQIndex
+from app.nlp.utils import (
+    EMBEDDING_DIM, EMBEDDING_MODEL, SIMILARITY_THRESHOLD,
+    embed_question, embed_questions, find_most_similar_faq, match_vector,
+)
+
+# Vocabulary for the synthetic corpus. Every FAQ uses a unique combination of the
+# slot words, so a question built from the same slots has exactly one right answer.
+TOPICS = {
+    "tax": ["tax", "vat", "deduction", "return", "refund", "allowance", "expense", "receipt",
+            "income", "audit", "penalty", "rate", "credit", "filing", "declaration"],
+    "finance": ["invoice", "payment", "budget", "loan", "account", "bank", "transfer", "balance",
+                "statement", "cash", "mortgage", "interest", "fee", "currency", "card"],
+    "payroll": ["salary", "employee", "pension", "bonus", "overtime", "contract", "holiday", "wage",
+                "payslip", "benefit", "insurance", "leave", "hire", "shift", "contractor"],
+    "general": ["password", "login", "email", "profile", "report", "export", "setting", "notification",
+                "document", "upload", "team", "calendar", "task", "reminder", "language"],
+}
+ACTIONS = ["calculate", "submit", "change", "check", "cancel", "request", "update", "find",
+           "track", "claim", "download", "review", "split", "record", "approve"]
+QUALIFIERS = ["monthly", "annual", "late", "foreign", "new", "shared", "quarterly", "missing",
+              "personal", "small", "online", "second", "urgent", "final", "current"]
+TEMPLATES = [
+    "How do I {action} my {qualifier} {noun} for the {noun2}?",
+    "Can I {action} a {qualifier} {noun} after the {noun2}?",
+    "Where can I {action} the {noun} and {qualifier} {noun2}?",
+    "What happens if I {action} a {noun} with a {qualifier} {noun2}?",
+    "Why can't I {action} my {noun} on the {qualifier} {noun2}?",
+]
+# Another way to open each template, for reworded questions.
+REWORDINGS = [
+    ("How do I", "how can i"),
+    ("Can I", "am i allowed to"),
+    ("Where can I", "where do i"),
+    ("What happens if I", "what if i"),
+    ("Why can't I", "why am i unable to"),
+]
+
+# How benchmark questions are derived from an FAQ (share of the query set):
+# repeat     - the FAQ question itself, in other casing (answerable by the exact lookup)
+# reworded   - the FAQ question with its opening words changed and no question mark
+# keywords   - only the slot words, no sentence
+QUERY_KINDS = {"repeat": 0.2, "reworded": 0.6, "keywords": 0.2}
+
+BASELINE_QUERIES = 50  # The baseline re-embeds the corpus per question, so it gets fewer questions
+
+
+def make_corpus(size: int, rng: np.random.Generator):
+    """`size` FAQEntry rows plus the slots and template each question was built from."""
+    categories = list(TOPICS)
+    seen = set()
+    rows, slots = [], []
+    while len(rows) < size:
+        category = categories[rng.integers(len(categories))]
+        nouns = TOPICS[category]
+        noun, noun2 = rng.choice(len(nouns), size=2, replace=False)
+        slot = (category, ACTIONS[rng.integers(len(ACTIONS))], QUALIFIERS[rng.integers(len(QUALIFIERS))],
+                nouns[noun], nouns[noun2])
+        if slot in seen:
+            continue
+        seen.add(slot)
+        template = int(rng.integers(len(TEMPLATES)))
+        question = _render(TEMPLATES[template], slot)
+        rows.append(FAQEntry(len(rows) + 1, question, f"Answer {len(rows) + 1}", category))
+        slots.append((slot, template))
+    return rows, slots
+
+
+def _render(template: str, slot: tuple) -> str:
+    _, action, qualifier, noun, noun2 = slot
+    return template.format(action=action, qualifier=qualifier, noun=noun, noun2=noun2)
+
+
+def make_queries(rows, slots, count: int, rng: np.random.Generator):
+    """(question, right FAQ id, kind) triples."""
+    kinds = rng.choice(list(QUERY_KINDS), size=count, p=list(QUERY_KINDS.values()))
+    queries = []
+    for kind in kinds:
+        position = int(rng.integers(len(rows)))
+        slot, template = slots[position]
+        if kind == "repeat":
+            question = rows[position].question.upper()
+        elif kind == "reworded":
+            opening, reworded = REWORDINGS[template]
+            question = rows[position].question.replace(opening, reworded, 1).rstrip("?")
+        else:
+            question = " ".join(slot[1:])
+        queries.append((question, rows[position].id, str(kind)))
+    return queries
+
+
+def _timed_build(build):
+    """Builds twice: once traced for memory, once untraced for the build time."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    index = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del index
+
+    started = time.perf_counter()
+    index = build()
+    return index, time.perf_counter() - started, current - before, peak - before
+
+
+def _summary(name, queries, answers, latencies, exact_answers, build_seconds=0.0,
+             memory=(0, 0), batch_seconds=None, rows_scored=None):
+    latencies = np.asarray(latencies)
+    expected = [faq_id for _, faq_id, _ in queries]
+    hits = [answer == faq_id for answer, faq_id in zip(answers, expected)]
+    by_kind = {}
+    for kind in QUERY_KINDS:
+        kind_hits = [hit for hit, (_, _, k) in zip(hits, queries) if k == kind]
+        if kind_hits:
+            by_kind[kind] = round(float(np.mean(kind_hits)), 4)
+
+    result = {
+        "strategy": name,
+        "queries": len(queries),
+        "latency_ms": {
+            "p50": round(float(np.percentile(latencies, 50)) * 1000, 4),
+            "p99": round(float(np.percentile(latencies, 99)) * 1000, 4),
+            "mean": round(float(latencies.mean()) * 1000, 4),
+        },
+        "qps": round(len(latencies) / float(latencies.sum()), 1),
+        "batch_qps": round(len(queries) / batch_seconds, 1) if batch_seconds else None,
+        "build_seconds": round(build_seconds, 4),
+        "memory_bytes": memory[0],
+        "build_peak_bytes": memory[1],
+        "recall_at_1": round(float(np.mean(hits)), 4),
+        "recall_by_kind": by_kind,
+        "agreement_with_exact": None,
+        "rows_scored_per_question": round(rows_scored / len(queries), 2) if rows_scored is not None else None,
+    }
+    if exact_answers is not None:
+        agreement = [a == b for a, b in zip(answers, exact_answers[:len(answers)])]
+        result["agreement_with_exact"] = round(float(np.mean(agreement)), 4)
+    return result
+
+
+def bench_baseline(rows, queries):
+    queries = queries[:BASELINE_QUERIES]
+    answers, latencies = [], []
+    for question, _, _ in queries:
+        started = time.perf_counter()
+        best = find_most_similar_faq(question, rows)
+        latencies.append(time.perf_counter() - started)
+        answers.append(best.id if best else None)
+    return queries, answers, latencies
+
+
+def bench_index(index, query_vectors):
+    answers, latencies = [], []
+    scored_before = index.rows_scored
+    for vector in query_vectors:
+        started = time.perf_counter()
+        best, _ = match_vector(vector, index)
+        latencies.append(time.perf_counter() - started)
+        answers.append(best.id if best else None)
+    rows_scored = index.rows_scored - scored_before
+
+    started = time.perf_counter()
+    index.search_many(query_vectors)
+    return answers, latencies, time.perf_counter() - started, rows_scored
+
+
+def bench_cascade(matcher, queries, query_vectors):
+    answers, latencies = [], []
+    for (question, _, _), vector in zip(queries, query_vectors):
+        started = time.perf_counter()
+        best = matcher.match_exact(question)
+        if best is None:
+            best, _ = matcher.match_vector(question, vector)
+        latencies.append(time.perf_counter() - started)
+        answers.append(best.id if best else None)
+    stats = matcher.stats.stats(len(matcher))
+
+    questions = [question for question, _, _ in queries]
+    started = time.perf_counter()
+    remaining = [i for i, question in enumerate(questions) if matcher.match_exact(question) is None]
+    matcher.match_vectors([questions[i] for i in remaining], query_vectors[remaining])
+    return answers, latencies, time.perf_counter() - started, stats
+
+
+def run_size(size, n_queries, probes, baseline_max, seed):
+    rng = np.random.default_rng(seed)
+    rows, slots = make_corpus(size, rng)
+    queries = make_queries(rows, slots, n_queries, rng)
+
+    started = time.perf_counter()
+    vectors = embed_questions([row.question for row in rows])
+    corpus_embed_seconds = time.perf_counter() - started
+
+    embed_latencies = []
+    query_vectors = np.empty((len(queries), EMBEDDING_DIM), dtype=np.float32)
+    for i, (question, _, _) in enumerate(queries):
+        started = time.perf_counter()
+        query_vectors[i] = embed_question(question)
+        embed_latencies.append(time.perf_counter() - started)
+
+    results = []
+
+    index, build_seconds, memory, peak = _timed_build(lambda: FAQIndex(rows, vectors))
+    exact_answers, latencies, batch_seconds, rows_scored = bench_index(index, query_vectors)
+    results.append(_summary("exact", queries, exact_answers, latencies, None, build_seconds, (memory, peak),
+                            batch_seconds, rows_scored))
+    results[-1]["agreement_with_exact"] = 1.0
+    del index
+
+    for probe in probes:
+        index, build_seconds, memory, peak = _timed_build(
+            lambda: IVFIndex(rows, vectors, n_lists=FAQ_IVF_LISTS, n_probe=probe, min_size=0)
+        )
+        answers, latencies, batch_seconds, rows_scored = bench_index(index, query_vectors)
+        results.append(_summary(f"ivf-p{probe}", queries, answers, latencies, exact_answers, build_seconds,
+                                (memory, peak), batch_seconds, rows_scored))
+        results[-1]["ivf_lists"] = len(index.lists)
+        del index
+
+    matcher, build_seconds, memory, peak = _timed_build(lambda: FAQMatcher(rows, vectors, EMBEDDING_DIM))
+    answers, latencies, batch_seconds, cascade_stats = bench_cascade(matcher, queries, query_vectors)
+    result = _summary("cascade", queries, answers, latencies, exact_answers, build_seconds, (memory, peak),
+                      batch_seconds)
+    result["rows_scored_per_question"] = cascade_stats["avg_rows_scored"]
+    result["stages"] = cascade_stats["stages"]
+    results.append(result)
+    del matcher
+
+    if size <= baseline_max:
+        baseline_queries, answers, latencies = bench_baseline(rows, queries)
+        results.append(_summary("baseline", baseline_queries, answers, latencies, exact_answers))
+
+    return {
+        "corpus_size": size,
+        "categories": {category: sum(row.category == category for row in rows) for category in TOPICS},
+        "embedding": {
+            "corpus_seconds": round(corpus_embed_seconds, 4),
+            "question_p50_ms": round(float(np.percentile(embed_latencies, 50)) * 1000, 4),
+            "question_p99_ms": round(float(np.percentile(embed_latencies, 99)) * 1000, 4),
+        },
+        "strategies": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FAQ matching strategies on synthetic corpora.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=1000, help="Questions per corpus size")
+    parser.add_argument("--ivf-probes", type=int, nargs="+", default=sorted({4, FAQ_IVF_PROBE, 16}))
+    parser.add_argument("--baseline-max", type=int, default=1000,
+                        help="Largest corpus the (slow) baseline strategy runs on")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_nlp.json")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "embedding_model": EMBEDDING_MODEL,
+            "embedding_dim": EMBEDDING_DIM,
+            "similarity_threshold": SIMILARITY_THRESHOLD,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        },
+        "results": [],
+    }
+
+    for size in args.sizes:
+        print(f"Corpus of {size} FAQs...", file=sys.stderr)
+        result = run_size(size, args.queries, args.ivf_probes, args.baseline_max, args.seed)
+        report["results"].append(result)
+        for strategy in result["strategies"]:
+            print(
+                f"  {strategy['strategy']:<10} p50 {strategy['latency_ms']['p50']:>9.3f} ms"
+                f"  p99 {strategy['latency_ms']['p99']:>9.3f} ms  {strategy['qps']:>10.1f} q/s"
+                f"  recall {strategy['recall_at_1']:.3f}",
+                file=sys.stderr,
+            )
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
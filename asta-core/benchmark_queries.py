@@ -0,0 +1,131 @@
+# benchmark_queries.py
+"""
+Per-request Python overhead of the hottest statements: built on every call (as the routes
+did before) vs. built once with bound parameters and reused (`user_by_id_query`,
+`task_by_id_query`, `task_list_query`). Reported per statement, in microseconds per call:
+
+    build_us      constructing the statement and computing its cache key, which
+                  SQLAlchemy needs to find the compiled SQL in its cache
+    execute_us    the whole ORM execute of that statement, rows included, on an
+                  in-memory SQLite database (so the database itself costs next to nothing)
+
+Run it from asta-core/. Importing the app's statements needs DATABASE_URL (e.g. from .env),
+but that database is never connected to:
+
+    python benchmark_queries.py --iterations 20000 --output queries.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+import sqlalchemy
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.auth.auth_handler import user_by_id_query
+from app.db.base import Base
+from app.models.task import Task
+from app.models.user import User
+from app.routes.task import task_by_id_query, task_list_query
+
+LIST_FILTERS = {"status": "pending", "category": "work", "is_important": True}
+
+
+def build_user_by_id(user_id: int):
+    return select(User).where(User.id == user_id)
+
+
+def build_task_by_id(task_id: int, user_id: int):
+    return select(Task).where(Task.id == task_id, Task.user_id == user_id)
+
+
+def build_task_list(user_id: int, status: str, category: str, is_important: bool):
+    """GET /tasks/ with every filter in use, built the way the route did before."""
+    query = select(Task).where(Task.user_id == user_id)
+    query = query.where(Task.status == status)
+    query = query.where(Task.category == category)
+    query = query.where(Task.is_important == is_important)
+    return query.order_by(Task.created_at.desc())
+
+
+def cases():
+    """(name, statement built per call, prebuilt statement, its parameters)."""
+    return [
+        ("user_by_id", lambda: build_user_by_id(1), lambda: user_by_id_query, {"user_id": 1}),
+        ("task_by_id", lambda: build_task_by_id(1, 1), lambda: task_by_id_query, {"task_id": 1, "user_id": 1}),
+        (
+            "task_list_3_filters",
+            lambda: build_task_list(1, **LIST_FILTERS),
+            lambda: task_list_query(True, True, True, "created_at", "desc"),
+            {"user_id": 1, **LIST_FILTERS},
+        ),
+    ]
+
+
+def per_call_us(fn, iterations: int) -> float:
+    fn()  # Warm-up: fills SQLAlchemy's compiled cache
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return 1e6 * (time.perf_counter() - started) / iterations
+
+
+def make_database(tasks: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.execute(insert(User).values(id=1, email="bench@example.com", hashed_password="x"))
+        session.execute(insert(Task), [
+            {"user_id": 1, "title": f"Task {i}", "status": "pending", "category": "work", "is_important": i % 2 == 0}
+            for i in range(tasks)
+        ])
+        session.commit()
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-call overhead of statements built per request vs. reused.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--tasks", type=int, default=20, help="Tasks of the user (rows the list returns, half of them)")
+    parser.add_argument("--output", default="queries.json")
+    args = parser.parse_args()
+
+    engine = make_database(args.tasks)
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "iterations": args.iterations,
+        },
+        "results": [],
+    }
+
+    with Session(engine) as session:
+        for name, built, reused, params in cases():
+            result = {"statement": name}
+            # A statement built per call has its values in it; a reused one takes them as parameters.
+            for variant, make, values in (("per_call", built, {}), ("reused", reused, params)):
+                result[variant] = {
+                    "build_us": round(per_call_us(lambda: make()._generate_cache_key(), args.iterations), 3),
+                    "execute_us": round(per_call_us(
+                        lambda: session.execute(make(), values).scalars().all(), args.iterations
+                    ), 3),
+                }
+            report["results"].append(result)
+            print(
+                f"  {name:<20} build {result['per_call']['build_us']:>8.2f} -> {result['reused']['build_us']:>6.2f} us"
+                f"   execute {result['per_call']['execute_us']:>8.2f} -> {result['reused']['execute_us']:>8.2f} us",
+                file=sys.stderr,
+            )
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
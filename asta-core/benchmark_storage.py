@@ -0,0 +1,183 @@
+# benchmark_storage.py
+"""
+Accuracy vs. speed of the FAQ vector storage modes (FAQ_VECTOR_STORAGE).
+
+Every mode is compared with the reference scores: what spaCy's `Doc.similarity`
+returns for the question and FAQ docs, i.e. the cosine of their vectors computed
+in float64. Reported per mode:
+
+    bytes_per_faq / memory_bytes     resident size of the stored vectors
+    latency_ms p50/p99, qps          one question at a time, brute-force index
+    batch_qps                        all questions in one search_many call
+    top1_agreement                   same best FAQ as the reference
+    decision_agreement               same answer/no-answer decision at the similarity threshold
+    score_error mean/max             |score - reference score| of the returned FAQ
+
+By default the corpus is synthetic (see benchmark_nlp.py). Use --from-db to measure
+the FAQs of this deployment (DATABASE_URL), asking --questions (one per line) or,
+without it, the FAQ questions with their first word dropped. Run it from asta-core/:
+
+    python benchmark_storage.py --sizes 1000 10000 --output storage.json
+    python benchmark_storage.py --from-db --questions asked.txt
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.nlp.index import FAQEntry, FAQIndex
+from app.nlp.storage import FAQ_PCA_DIM, STORES
+from app.nlp.utils import EMBEDDING_DIM, EMBEDDING_MODEL, SIMILARITY_THRESHOLD, embed_questions
+from benchmark_nlp import make_corpus, make_queries
+
+
+def reference_scores(faq_vectors: np.ndarray, query_vectors: np.ndarray) -> np.ndarray:
+    """(queries, faqs) cosine similarities in float64, as `Doc.similarity` computes them (0 for empty docs)."""
+    faqs = np.asarray(faq_vectors, dtype=np.float64)
+    queries = np.asarray(query_vectors, dtype=np.float64)
+    faq_norms = np.linalg.norm(faqs, axis=1)
+    query_norms = np.linalg.norm(queries, axis=1)
+    faq_norms[faq_norms == 0] = np.inf
+    query_norms[query_norms == 0] = np.inf
+    return (queries / query_norms[:, None]) @ (faqs / faq_norms[:, None]).T
+
+
+def measure(storage, rows, vectors, query_vectors, reference):
+    started = time.perf_counter()
+    index = FAQIndex(rows, vectors, storage=storage)
+    build_seconds = time.perf_counter() - started
+
+    positions = {row.id: position for position, row in enumerate(rows)}
+    latencies, best_positions, scores = [], [], []
+    for vector in query_vectors:
+        started = time.perf_counter()
+        best, score = index.search(vector)
+        latencies.append(time.perf_counter() - started)
+        best_positions.append(positions[best.id])
+        scores.append(score)
+
+    started = time.perf_counter()
+    index.search_many(query_vectors)
+    batch_seconds = time.perf_counter() - started
+
+    latencies = np.asarray(latencies)
+    best_positions = np.asarray(best_positions)
+    scores = np.asarray(scores)
+    reference_best = reference.argmax(axis=1)
+    reference_top = reference.max(axis=1)
+    # What the reference scores the FAQ this mode picked, to separate ranking from score errors.
+    reference_of_pick = reference[np.arange(len(reference)), best_positions]
+    score_error = np.abs(scores - reference_of_pick)
+
+    return {
+        "storage": storage,
+        "dim": index.store.code_dim,
+        "memory_bytes": index.store.nbytes,
+        "bytes_per_faq": round(index.store.nbytes / max(len(rows), 1), 1),
+        "build_seconds": round(build_seconds, 4),
+        "latency_ms": {
+            "p50": round(float(np.percentile(latencies, 50)) * 1000, 4),
+            "p99": round(float(np.percentile(latencies, 99)) * 1000, 4),
+        },
+        "qps": round(len(latencies) / float(latencies.sum()), 1),
+        "batch_qps": round(len(query_vectors) / batch_seconds, 1),
+        "top1_agreement": round(float(np.mean(best_positions == reference_best)), 4),
+        "decision_agreement": round(float(np.mean(
+            (scores >= SIMILARITY_THRESHOLD) == (reference_top >= SIMILARITY_THRESHOLD)
+        )), 4),
+        "score_error": {
+            "mean": round(float(score_error.mean()), 6),
+            "max": round(float(score_error.max()), 6),
+        },
+    }
+
+
+def synthetic_corpora(sizes, n_queries, seed):
+    for size in sizes:
+        rng = np.random.default_rng(seed)
+        rows, slots = make_corpus(size, rng)
+        questions = [question for question, _, _ in make_queries(rows, slots, n_queries, rng)]
+        yield f"synthetic-{size}", rows, embed_questions([row.question for row in rows]), questions
+
+
+async def _load_from_db():
+    from app.db.session import AsyncSessionLocal, engine
+    from app.nlp.loader import _faq_rows_query
+    from app.nlp.index import vectors_from_bytes
+
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(_faq_rows_query(EMBEDDING_MODEL))).all()
+    await engine.dispose()
+
+    entries = [FAQEntry.from_model(faq) for faq, _ in rows]
+    if all(blob is not None for _, blob in rows):
+        vectors = vectors_from_bytes([blob for _, blob in rows], EMBEDDING_DIM)
+    else:
+        vectors = embed_questions([entry.question for entry in entries])
+    return entries, vectors
+
+
+def database_corpus(questions_path):
+    rows, vectors = asyncio.run(_load_from_db())
+    if questions_path:
+        with open(questions_path) as f:
+            questions = [line.strip() for line in f if line.strip()]
+    else:
+        questions = [row.question.split(" ", 1)[-1] for row in rows]
+    yield "database", rows, vectors, questions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare FAQ vector storage modes against Doc.similarity.")
+    parser.add_argument("--storage", nargs="+", default=list(STORES), choices=list(STORES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--from-db", action="store_true", help="Use this deployment's FAQs instead")
+    parser.add_argument("--questions", help="File with one question per line (with --from-db)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_storage.json")
+    args = parser.parse_args()
+
+    corpora = database_corpus(args.questions) if args.from_db else synthetic_corpora(args.sizes, args.queries, args.seed)
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "embedding_model": EMBEDDING_MODEL,
+            "embedding_dim": EMBEDDING_DIM,
+            "pca_dim": FAQ_PCA_DIM,
+            "similarity_threshold": SIMILARITY_THRESHOLD,
+            "reference": "Doc.similarity (float64 cosine of the doc vectors)",
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+        },
+        "results": [],
+    }
+
+    for name, rows, vectors, questions in corpora:
+        print(f"{name}: {len(rows)} FAQs, {len(questions)} questions...", file=sys.stderr)
+        if not rows or not questions:
+            continue
+        query_vectors = embed_questions(questions)
+        reference = reference_scores(vectors, query_vectors)
+        modes = [measure(storage, rows, vectors, query_vectors, reference) for storage in args.storage]
+        report["results"].append({"corpus": name, "faqs": len(rows), "questions": len(questions), "modes": modes})
+        for mode in modes:
+            print(
+                f"  {mode['storage']:<8} {mode['bytes_per_faq']:>8.1f} B/FAQ"
+                f"  p50 {mode['latency_ms']['p50']:>8.3f} ms  {mode['batch_qps']:>10.1f} q/s batched"
+                f"  top-1 {mode['top1_agreement']:.4f}  max error {mode['score_error']['max']:.5f}",
+                file=sys.stderr,
+            )
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Tests run the app against a throwaway SQLite database (migrated on startup, like any
+deployment) with the NLP pool in threads. Run them from asta-core/: `python -m pytest`.
+"""
+import os
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+
+_db_dir = tempfile.mkdtemp(prefix="asta-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/asta.db"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("NLP_EXECUTOR", "thread")
+os.environ.setdefault("NLP_WORKERS", "2")
+os.environ.setdefault("AUTH_HASH_WORKERS", "2")
+os.environ.setdefault("FAQ_SYNC_INTERVAL", "0")  # Tests sync explicitly (see app.nlp.sync)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def make_user(client):
+    """Signs up a user and returns their auth headers."""
+
+    def make_user(email: str, company_name: str | None = None) -> dict:
+        response = client.post(
+            "/users/", json={"email": email, "password": "secret", "company_name": company_name}
+        )
+        assert response.status_code == 201, response.text
+        response = client.post("/login", data={"username": email, "password": "secret"})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return make_user
+
+
+@pytest.fixture(scope="session")
+def make_admin(make_user):
+    """Signs up a user with the superuser flag (not settable through the API) and returns their auth headers."""
+
+    def make_admin(email: str, company_name: str | None = None) -> dict:
+        headers = make_user(email, company_name)
+        # Before the user's first request, so the principal cache doesn't have them yet
+        with sqlite3.connect(make_url(os.environ["DATABASE_URL"]).database) as conn:
+            conn.execute("UPDATE users SET is_superuser = 1 WHERE email = ?", (email,))
+        return headers
+
+    return make_admin
+
+
+@pytest.fixture
+def count_queries():
+    """`with count_queries() as queries:` collects the SQL statements run on every engine meanwhile."""
+    from app.db.session import engine, read_engine
+
+    @contextmanager
+    def count_queries():
+        queries = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if not statement.startswith("PRAGMA"):  # SQLite connection setup
+                queries.append(statement)
+
+        engines = {engine.sync_engine, read_engine.sync_engine}
+        for sync_engine in engines:
+            event.listen(sync_engine, "before_cursor_execute", record)
+        try:
+            yield queries
+        finally:
+            for sync_engine in engines:
+                event.remove(sync_engine, "before_cursor_execute", record)
+
+    return count_queries
@@ -0,0 +1,94 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+from app.nlp import loader, workers
+from app.nlp.index import FAQEntry
+from app.nlp.utils import normalize_question
+from app.nlp.workers import match_question, match_questions
+
+TENANT = "answer-cache"
+
+
+class CountingMatcher:
+    """Answers exact questions only, counting how often the matcher is actually consulted."""
+
+    def __init__(self, tenant: str = TENANT):
+        self.tenants = (tenant,)
+        questions = ("How do I export my data?", "Is there a free plan?", "Can I change my email?")
+        self.rows = {i: FAQEntry(id=i, question=q, answer=f"a{i}") for i, q in enumerate(questions, start=1)}
+        self.lookups = 0
+
+    def get(self, faq_id):
+        return self.rows.get(faq_id)
+
+    def match_exact(self, question, category=None):
+        self.lookups += 1
+        return next((row for row in self.rows.values() if normalize_question(row.question) == normalize_question(question)), None)
+
+
+@pytest.fixture
+def answer_cache(monkeypatch):
+    def use(max_size: int = 100, ttl: float = 300) -> TTLCache:
+        cache = TTLCache(max_size, ttl)
+        monkeypatch.setattr(workers, "answer_cache", cache)
+        return cache
+
+    return use
+
+
+def _ask(matcher, question: str):
+    return asyncio.run(match_question(question, matcher))
+
+
+def test_repeated_questions_come_from_the_cache(answer_cache):
+    cache = answer_cache()
+    matcher = CountingMatcher()
+
+    assert _ask(matcher, "How do I export my data?").id == 1
+    assert _ask(matcher, "  how do i EXPORT my data?").id == 1  # Same normalized question
+    assert asyncio.run(match_questions(["How do I export my data?"], matcher))[0][0].id == 1
+    assert matcher.lookups == 1 and cache.hits == 2
+
+
+def test_faq_write_invalidates_cached_answers(answer_cache):
+    answer_cache()
+    matcher = CountingMatcher()
+    _ask(matcher, "How do I export my data?")
+
+    loader._bump_corpus_version(TENANT)  # What every FAQ write and index reload does
+    _ask(matcher, "How do I export my data?")
+    assert matcher.lookups == 2
+
+    # Tenants never share answers
+    _ask(CountingMatcher("another-tenant"), "How do I export my data?")
+    assert matcher.lookups == 2
+
+
+def test_entries_expire_and_are_bounded(answer_cache, monkeypatch):
+    clock = SimpleNamespace(monotonic=lambda: 0.0)
+    monkeypatch.setattr(cache_module, "time", clock)
+    cache = answer_cache(max_size=2, ttl=60)
+    matcher = CountingMatcher()
+
+    for question in ("How do I export my data?", "Is there a free plan?", "Can I change my email?"):
+        _ask(matcher, question)
+    assert len(cache) == 2 and cache.evictions == 1
+    _ask(matcher, "How do I export my data?")  # Evicted as least recently used
+    assert matcher.lookups == 4
+
+    clock.monotonic = lambda: 61.0
+    _ask(matcher, "Can I change my email?")
+    assert matcher.lookups == 5
+
+
+def test_no_answer_is_cached_until_an_faq_is_written(client):
+    question = {"question": "Do you support single sign-on?", "category": "answer-cache-e2e"}
+    assert client.post("/faq/ask", json=question).status_code == 404
+    assert client.post("/faq/ask", json=question).status_code == 404
+
+    client.post("/faq/", json={**question, "answer": "Yes, SAML."})
+    assert client.post("/faq/ask", json=question).json()["answer"] == "Yes, SAML."
@@ -0,0 +1,80 @@
+import numpy as np
+
+from app.nlp.cascade import FAQMatcher
+from app.nlp.index import FAQEntry
+
+DIM = 8
+QUESTIONS = [
+    ("When is my invoice due?", "billing"),
+    ("Can an invoice be split?", "billing"),
+    ("How do I reset my password?", "account"),
+    ("Where are travel receipts submitted?", "expenses"),
+]
+
+
+def _matcher():
+    rows = [FAQEntry(id=i, question=q, answer=f"a{i}", category=c) for i, (q, c) in enumerate(QUESTIONS)]
+    return FAQMatcher(rows, np.eye(len(rows), DIM, dtype=np.float32), DIM), rows
+
+
+def _near(i: int) -> np.ndarray:
+    vector = np.full(DIM, 0.05, dtype=np.float32)
+    vector[i] = 1.0
+    return vector
+
+
+def _stage(matcher, stage: str) -> dict:
+    return matcher.stats.stats(len(matcher))["stages"][stage]
+
+
+def test_exact_question_needs_no_embedding():
+    matcher, rows = _matcher()
+
+    assert matcher.match_exact("  how do I RESET my password?") is rows[2]
+    assert matcher.match_exact("How do I reset my password?", category="billing") is None
+    assert matcher.match_exact("How do I reset it?") is None
+    assert (_stage(matcher, "exact")["attempts"], _stage(matcher, "exact")["hits"]) == (3, 1)
+
+
+def test_keyword_shortlist_is_reranked_by_vector():
+    matcher, rows = _matcher()
+
+    # Both invoice FAQs are shortlisted; the vector picks the second one
+    best, score = matcher.match_vector("Split the invoice?", _near(1))
+    assert best is rows[1] and score > 0.9
+    assert _stage(matcher, "lexical")["hits"] == 1
+    assert _stage(matcher, "vector")["attempts"] == 0
+    assert matcher.stats.rows_scored == 2  # Only the shortlist, not the corpus
+
+
+def test_vector_stage_answers_without_shared_keywords():
+    matcher, rows = _matcher()
+
+    best, _ = matcher.match_vector("Expense slips go where?", _near(3))
+    assert best is rows[3]
+    assert (_stage(matcher, "lexical")["attempts"], _stage(matcher, "lexical")["hits"]) == (1, 0)
+    assert _stage(matcher, "vector")["hits"] == 1
+
+    # Below the threshold: no answer, but the score is reported
+    best, score = matcher.match_vector("Something else entirely", np.ones(DIM, dtype=np.float32))
+    assert best is None and 0 < score < 0.6
+    assert _stage(matcher, "vector")["hit_rate"] == 0.5
+
+
+def test_batch_matches_single_questions():
+    matcher, _ = _matcher()
+    questions = ["Split the invoice?", "Expense slips go where?", "Something else entirely"]
+    vectors = np.stack([_near(1), _near(3), np.ones(DIM, dtype=np.float32)])
+
+    single = [matcher.match_vector(q, v) for q, v in zip(questions, vectors)]
+    batch = matcher.match_vectors(questions, vectors)
+    assert [row for row, _ in batch] == [row for row, _ in single]
+    assert np.allclose([score for _, score in batch], [score for _, score in single])
+    assert matcher.stats.questions == 6
+
+
+def test_category_hint_limits_every_stage():
+    matcher, rows = _matcher()
+
+    assert matcher.match_vector("Split the invoice?", _near(1), category="account")[0] is None
+    assert matcher.match_vector("Expense slips go where?", _near(3), category="expenses")[0] is rows[3]
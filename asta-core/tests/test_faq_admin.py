@@ -0,0 +1,23 @@
+QUESTION = "How do I reset my password?"
+
+
+def test_only_admins_edit_faqs(client, make_user, make_admin):
+    faq_id = client.post("/faq/", json={"question": QUESTION, "answer": "original"}).json()["id"]
+    edit = {"question": QUESTION, "answer": "rewritten"}
+
+    assert client.put(f"/faq/{faq_id}", json=edit).status_code == 401
+    assert client.put(f"/faq/{faq_id}", json=edit, headers={"Authorization": "Bearer junk"}).status_code == 401
+    assert client.put(f"/faq/{faq_id}", json=edit, headers=make_user("not-admin@example.com")).status_code == 403
+    assert client.post("/faq/ask", json={"question": QUESTION}).json()["answer"] == "original"
+
+    response = client.put(f"/faq/{faq_id}", json=edit, headers=make_admin("admin@example.com"))
+    assert response.status_code == 200
+    assert client.post("/faq/ask", json={"question": QUESTION}).json()["answer"] == "rewritten"
+
+
+def test_admins_only_edit_their_own_knowledge_base(client, make_admin):
+    faq_id = client.post("/faq/", json={"question": "Is there a mobile app?", "answer": "shared"}).json()["id"]
+
+    headers = make_admin("company-admin@example.com", "Umbrella")
+    response = client.put(f"/faq/{faq_id}", json={"question": "Is there a mobile app?", "answer": "x"}, headers=headers)
+    assert response.status_code == 404
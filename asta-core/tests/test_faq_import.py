@@ -0,0 +1,91 @@
+import pytest
+
+from app.nlp import importer
+from app.routes import faq as faq_routes
+
+NDJSON = "\n".join([
+    '{"question": "Do you offer refunds?", "answer": "Within 30 days."}',
+    "",
+    "{not json",
+    "[1, 2]",
+    '{"question": "Is there an answer missing?"}',
+    '{"question": "Which cards do you accept?", "answer": "Visa.", "category": "billing"}',
+])
+
+CSV = "\n".join([
+    "question,answer,category",
+    '"Do you ship abroad, too?",Yes,shipping',
+    "Is this answer empty?,,general",
+])
+
+
+@pytest.fixture(scope="module")
+def admin(make_admin):
+    return make_admin("importer@example.com", "Hooli")
+
+
+def _import(client, headers, content: str | bytes, filename: str):
+    if isinstance(content, str):
+        content = content.encode()
+    return client.post("/faq/import", files={"file": (filename, content)}, headers=headers)
+
+
+def _ask(client, headers, question: str) -> dict:
+    return client.post("/faq/ask", json={"question": question}, headers=headers).json()
+
+
+def test_only_admins_import(client, make_user):
+    assert _import(client, {}, NDJSON, "faqs.ndjson").status_code == 401
+    assert _import(client, make_user("import-user@example.com", "Hooli"), NDJSON, "faqs.ndjson").status_code == 403
+
+
+def test_ndjson_import_reports_bad_rows(client, admin):
+    response = _import(client, admin, NDJSON, "faqs.ndjson")
+    assert response.status_code == 200
+    report = response.json()
+
+    assert (report["rows"], report["imported"], report["embedded"], report["failed"]) == (5, 2, 2, 3)
+    assert [error["row"] for error in report["errors"]] == [3, 4, 5]
+    assert report["errors"][0]["error"].startswith("Invalid JSON")
+    assert report["errors"][2]["error"].startswith("answer:")
+    assert _ask(client, admin, "Which cards do you accept?")["category"] == "billing"
+
+
+def test_csv_import(client, admin):
+    report = _import(client, admin, CSV, "faqs.csv").json()
+
+    assert (report["rows"], report["imported"], report["failed"]) == (2, 1, 1)
+    assert report["errors"][0]["row"] == 3
+    assert _ask(client, admin, "Do you ship abroad, too?")["answer"] == "Yes"
+
+
+def test_unreadable_files_are_rejected(client, admin):
+    assert _import(client, admin, NDJSON, "faqs.txt").status_code == 400
+    assert _import(client, admin, "question,answer\nCaf\xe9?,Yes".encode("latin-1"), "faqs.csv").status_code == 400
+
+
+def test_duplicate_question_updates_the_faq(client, admin):
+    _import(client, admin, '{"question": "Can I pay by invoice?", "answer": "No."}', "faqs.ndjson")
+
+    report = _import(client, admin, '{"question": "Can I pay by invoice?", "answer": "Yes, from 100 EUR."}', "faqs.ndjson").json()
+    # Same question: the stored vector is kept, only the answer changes
+    assert (report["imported"], report["embedded"], report["failed"]) == (1, 0, 0)
+    assert _ask(client, admin, "Can I pay by invoice?")["answer"] == "Yes, from 100 EUR."
+
+
+def test_index_is_rebuilt_once_per_import(client, admin, monkeypatch):
+    reloads = []
+    reload_faq_matcher = faq_routes.reload_faq_matcher
+
+    async def counting_reload(db, tenant):
+        reloads.append(tenant)
+        return await reload_faq_matcher(db, tenant)
+
+    monkeypatch.setattr(faq_routes, "reload_faq_matcher", counting_reload)
+    monkeypatch.setattr(importer, "FAQ_IMPORT_BATCH_SIZE", 2)
+    lines = "\n".join(f'{{"question": "Batch question {i}?", "answer": "{i}"}}' for i in range(5))
+
+    report = _import(client, admin, lines, "faqs.jsonl").json()
+    assert (report["imported"], report["failed"]) == (5, 0)
+    assert reloads == ["Hooli"]
+    assert _ask(client, admin, "Batch question 4?")["answer"] == "4"
@@ -0,0 +1,39 @@
+import os
+import sqlite3
+
+from sqlalchemy.engine import make_url
+
+from app.db.session import ReadSessionLocal
+from app.nlp.loader import sync_faq_matcher
+
+
+def _insert_from_another_worker(question: str) -> int:
+    """Writes an FAQ straight to the database, as another worker would (this one doesn't see it)."""
+    with sqlite3.connect(make_url(os.environ["DATABASE_URL"]).database) as conn:
+        cursor = conn.execute(
+            "INSERT INTO faqs (tenant, question, answer, category, version) VALUES ('', ?, 'first', 'general', 0)",
+            (question,),
+        )
+        return cursor.lastrowid
+
+
+async def _sync() -> None:
+    """One round of the FAQ sync loop (FAQ_SYNC_INTERVAL=0 in the tests)."""
+    async with ReadSessionLocal() as db:
+        await sync_faq_matcher(db)
+
+
+def test_edit_of_faq_not_synced_yet(client, make_admin):
+    admin = make_admin("sync-admin@example.com")
+    # Load the shared matcher before the other worker writes
+    client.post("/faq/ask", json={"question": "anything"})
+    question = "Can I deduct my home office?"
+    faq_id = _insert_from_another_worker(question)
+
+    response = client.put(f"/faq/{faq_id}", json={"question": question, "answer": "second"}, headers=admin)
+    assert response.status_code == 200
+    assert response.json()["answer"] == "second"
+
+    # The next sync indexes it (with its stored vector, or embedding it)
+    client.portal.call(_sync)
+    assert client.post("/faq/ask", json={"question": question}).json()["answer"] == "second"
@@ -0,0 +1,47 @@
+import pytest
+
+SHARED_QUESTION = "When are quarterly tax payments due?"
+COMPANY_QUESTION = "Where do I submit travel receipts?"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shared_faq(client):
+    response = client.post("/faq/", json={"question": SHARED_QUESTION, "answer": "shared"})
+    assert response.status_code == 201
+
+
+def test_company_user_is_answered_from_the_shared_base(client, make_user):
+    headers = make_user("shared-reader@example.com", "Acme")
+
+    response = client.post("/faq/ask", json={"question": SHARED_QUESTION}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["answer"] == "shared"
+
+    response = client.post("/faq/ask/batch", json={"questions": [SHARED_QUESTION]}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()[0]["faq"]["answer"] == "shared"
+
+
+def test_company_faq_wins_over_the_shared_one(client, make_user):
+    headers = make_user("owner@example.com", "Globex")
+    client.post("/faq/", json={"question": COMPANY_QUESTION, "answer": "shared"})
+    response = client.post("/faq/", json={"question": COMPANY_QUESTION, "answer": "globex"}, headers=headers)
+    assert response.status_code == 201
+
+    response = client.post("/faq/ask", json={"question": COMPANY_QUESTION}, headers=headers)
+    assert response.json()["answer"] == "globex"
+    # Other companies and anonymous callers never see it
+    other = make_user("other@example.com", "Initech")
+    assert client.post("/faq/ask", json={"question": COMPANY_QUESTION}, headers=other).json()["answer"] == "shared"
+    assert client.post("/faq/ask", json={"question": COMPANY_QUESTION}).json()["answer"] == "shared"
+
+
+def test_invalid_token_asks_anonymously_but_cannot_write(client):
+    bad = {"Authorization": "Bearer not-a-token"}
+
+    response = client.post("/faq/ask", json={"question": SHARED_QUESTION}, headers=bad)
+    assert response.status_code == 200
+    assert client.post("/faq/ask/batch", json={"questions": [SHARED_QUESTION]}, headers=bad).status_code == 200
+
+    response = client.post("/faq/", json={"question": "Written with a bad token?", "answer": "no"}, headers=bad)
+    assert response.status_code == 401
@@ -0,0 +1,55 @@
+import numpy as np
+
+from app.nlp.ann import IVFIndex, train_clusters
+from app.nlp.index import FAQEntry
+
+DIM = 16
+
+
+def _faqs(start: int, count: int, rng):
+    rows = [FAQEntry(id=i, question=f"q{i}", answer=f"a{i}") for i in range(start, start + count)]
+    return rows, rng.normal(size=(count, DIM)).astype(np.float32)
+
+
+def _assert_every_faq_in_one_partition(index: IVFIndex):
+    positions = np.sort(np.concatenate(index.lists))
+    assert positions.tolist() == list(range(len(index)))
+    assert len(index.clusters.assignment) == len(index)
+
+
+def test_add_never_trains_on_the_caller():
+    rng = np.random.default_rng(0)
+    index = IVFIndex(*_faqs(0, 40, rng), n_lists=4, n_probe=4, min_size=20)
+    clusters = index.clusters
+    assert clusters.trained_size == 40 and not index.training_due
+
+    rows, vectors = _faqs(40, 40, rng)
+    for row, vector in zip(rows, vectors):
+        index.add(row, vector)
+
+    assert index.clusters is clusters  # Still the same partitioning, extended in place
+    assert index.training_due
+    _assert_every_faq_in_one_partition(index)
+
+
+def test_background_training_is_installed_in_one_swap():
+    rng = np.random.default_rng(1)
+    index = IVFIndex(*_faqs(0, 10, rng), n_lists=3, n_probe=1, min_size=20)
+    assert not index.is_trained
+    rows, vectors = _faqs(10, 10, rng)
+    for row, vector in zip(rows, vectors):
+        index.add(row, vector)
+    assert index.training_due and not index.is_trained
+
+    job = index.training_job()
+    # FAQs added while the job runs are assigned when it is installed
+    rows, vectors = _faqs(20, 5, rng)
+    for row, vector in zip(rows, vectors):
+        index.add(row, vector)
+    index.install(train_clusters(*job))
+
+    assert index.clusters.trained_size == 20 and len(index.clusters.centroids) == 3
+    assert not index.training_due
+    _assert_every_faq_in_one_partition(index)
+    for row, vector in zip(rows, vectors):
+        assert index.search(vector)[0].id == row.id
@@ -0,0 +1,98 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.core.config import db_settings
+from app.db import migrations
+from app.db.migrations import head_revisions, migrate_database
+from app.db.pool import PoolStats
+from app.db.session import _create_engine
+
+# What the old startup (`Base.metadata.create_all`, before Alembic ran on startup) made on SQLite
+CREATE_ALL_SCHEMA = """
+CREATE TABLE users (
+    id INTEGER NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    hashed_password VARCHAR(255) NOT NULL,
+    full_name VARCHAR(255),
+    company_name VARCHAR(255),
+    is_active BOOLEAN NOT NULL,
+    is_superuser BOOLEAN NOT NULL,
+    created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+    updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+    PRIMARY KEY (id)
+);
+CREATE INDEX ix_users_id ON users (id);
+CREATE UNIQUE INDEX ix_users_email ON users (email);
+CREATE TABLE faqs (
+    id INTEGER NOT NULL,
+    question VARCHAR NOT NULL,
+    answer TEXT NOT NULL,
+    category VARCHAR,
+    PRIMARY KEY (id),
+    UNIQUE (question)
+);
+CREATE INDEX ix_faqs_id ON faqs (id);
+CREATE TABLE tasks (
+    id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    title VARCHAR(255) NOT NULL,
+    description TEXT,
+    due_date DATETIME,
+    category VARCHAR(100),
+    status VARCHAR(50) NOT NULL,
+    is_important BOOLEAN NOT NULL,
+    created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+    updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(user_id) REFERENCES users (id)
+);
+CREATE INDEX ix_tasks_id ON tasks (id);
+INSERT INTO users (id, email, hashed_password, is_active, is_superuser) VALUES (1, 'old@example.com', 'x', 1, 0);
+INSERT INTO faqs (id, question, answer, category) VALUES (1, 'What is ASTA?', 'An assistant.', 'general');
+"""
+
+
+@pytest.fixture
+def create_all_database(tmp_path, monkeypatch):
+    """A database made by `create_all` (no alembic_version table), which `migrate_database` runs on."""
+    path = tmp_path / "create_all.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(CREATE_ALL_SCHEMA)
+    monkeypatch.setattr(migrations, "engine", _create_engine(f"sqlite+aiosqlite:///{path}", PoolStats()))
+    return path
+
+
+def _migrate() -> None:
+    async def migrate():
+        try:
+            await migrate_database()
+        finally:
+            await migrations.engine.dispose()
+
+    asyncio.run(migrate())
+
+
+def test_create_all_database_is_upgraded_to_head(create_all_database, monkeypatch):
+    monkeypatch.setattr(db_settings, "migrations", "upgrade")
+    _migrate()
+
+    with sqlite3.connect(create_all_database) as conn:
+        assert {row[0] for row in conn.execute("SELECT version_num FROM alembic_version")} == head_revisions()
+        assert conn.execute("SELECT tenant, question FROM faqs").fetchall() == [("", "What is ASTA?")]
+        # The create_all unique constraint on the question alone is gone: tenants can share questions
+        conn.execute("INSERT INTO faqs (tenant, question, answer, category, version) VALUES ('Acme', 'What is ASTA?', 'Ours.', 'general', 0)")
+        assert conn.execute("SELECT email FROM users").fetchall() == [("old@example.com",)]
+
+    _migrate()  # At the head now: nothing left to do
+
+
+def test_check_refuses_to_start_on_a_database_behind(create_all_database, monkeypatch):
+    monkeypatch.setattr(db_settings, "migrations", "check")
+
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        _migrate()
+    with sqlite3.connect(create_all_database) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert tables == {"users", "faqs", "tasks"}  # Left untouched
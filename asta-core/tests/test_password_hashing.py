@@ -0,0 +1,38 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.auth import auth_handler
+from app.auth.auth_handler import hash_pool
+
+
+def test_full_hashing_queue_sheds_logins(client, make_user, monkeypatch):
+    make_user("busy@example.com")
+    credentials = {"username": "busy@example.com", "password": "secret"}
+    # As with AUTH_HASH_WORKERS=1 and AUTH_HASH_QUEUE_SIZE=0: one hash at a time, none waiting
+    monkeypatch.setattr(hash_pool, "max_workers", 1)
+    monkeypatch.setattr(hash_pool, "max_queue", 0)
+
+    release = threading.Event()
+    verify_password = auth_handler.verify_password
+
+    def slow_verify_password(plain_password, hashed_password):
+        release.wait(10)
+        return verify_password(plain_password, hashed_password)
+
+    monkeypatch.setattr(auth_handler, "verify_password", slow_verify_password)
+    rejected = client.get("/metrics/auth").json()["hashing"]["rejected"]
+
+    with ThreadPoolExecutor(max_workers=1) as background:
+        first = background.submit(client.post, "/login", data=credentials)
+        deadline = time.monotonic() + 10
+        while hash_pool.in_flight == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        response = client.post("/login", data=credentials)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert client.get("/metrics/auth").json()["hashing"]["rejected"] == rejected + 1
+
+        release.set()
+        assert first.result().status_code == 200
@@ -0,0 +1,110 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.auth import auth_handler, principal as principal_module
+from app.auth.principal import LocalPrincipalCache, Principal, load_backend
+from app.core import cache as cache_module
+
+
+class RecordingBackend(LocalPrincipalCache):
+    """A backend loaded by name, as AUTH_PRINCIPAL_CACHE_BACKEND=package.module:factory would be."""
+
+    def __init__(self, max_size: int, ttl: float):
+        super().__init__(max_size, ttl)
+        self.calls = []
+
+    async def get(self, user_id):
+        self.calls.append(("get", user_id))
+        return await super().get(user_id)
+
+    async def set(self, principal):
+        self.calls.append(("set", principal.id))
+        await super().set(principal)
+
+
+@pytest.fixture
+def principal_cache(monkeypatch):
+    """Swaps in a fresh backend (the routes reach it through both modules)."""
+
+    def use(backend):
+        monkeypatch.setattr(auth_handler, "principal_cache", backend)
+        monkeypatch.setattr(principal_module, "principal_cache", backend)
+        return backend
+
+    return use
+
+
+def _user_id(client, headers, email: str) -> int:
+    return next(user["id"] for user in client.get("/users/", headers=headers).json() if user["email"] == email)
+
+
+def test_authenticated_request_costs_one_query(client, make_user, count_queries):
+    headers = make_user("one-query@example.com")
+    task_id = client.post("/tasks/", json={"title": "Cached"}, headers=headers).json()["id"]
+    assert client.get(f"/tasks/{task_id}", headers=headers).status_code == 200
+
+    with count_queries() as queries:
+        assert client.get(f"/tasks/{task_id}", headers=headers).status_code == 200
+    assert len(queries) == 1
+    assert "FROM tasks" in queries[0]
+
+
+def test_ttl_and_size_bound(monkeypatch):
+    clock = SimpleNamespace(monotonic=lambda: 0.0)
+    monkeypatch.setattr(cache_module, "time", clock)
+    backend = LocalPrincipalCache(max_size=2, ttl=60)
+
+    async def scenario():
+        for user_id in (1, 2, 3):
+            await backend.set(Principal(id=user_id, email=f"{user_id}@example.com"))
+        assert await backend.get(1) is None  # Least recently used, evicted
+        assert (await backend.get(3)).email == "3@example.com"
+
+        clock.monotonic = lambda: 61.0
+        assert await backend.get(3) is None
+
+    asyncio.run(scenario())
+    assert backend.stats()["evictions"] == 1
+
+
+def test_deactivation_evicts_the_principal(client, make_user, make_admin, principal_cache):
+    backend = principal_cache(LocalPrincipalCache(100, 3600))
+    headers = make_user("leaver@example.com")
+    assert client.get("/tasks/", headers=headers).status_code == 200
+    user_id = _user_id(client, headers, "leaver@example.com")
+    assert asyncio.run(backend.get(user_id)) is not None
+
+    # Only the user themselves or an admin may deactivate them
+    other = make_user("bystander@example.com")
+    assert client.delete(f"/users/{user_id}", headers=other).status_code == 403
+
+    admin = make_admin("user-admin@example.com")
+    assert client.delete(f"/users/{user_id}", headers=admin).status_code == 204
+    assert asyncio.run(backend.get(user_id)) is None
+    assert client.get("/tasks/", headers=headers).status_code == 401
+    response = client.post("/login", data={"username": "leaver@example.com", "password": "secret"})
+    assert response.status_code == 403
+
+
+def test_inactive_cached_principal_is_refused(client, make_user, principal_cache):
+    backend = principal_cache(LocalPrincipalCache(100, 3600))
+    headers = make_user("stale@example.com")
+    user_id = _user_id(client, headers, "stale@example.com")
+    # Deactivated by another worker: this worker's cache says so before the database is read again
+    asyncio.run(backend.set(Principal(id=user_id, email="stale@example.com", is_active=False)))
+
+    assert client.get("/tasks/", headers=headers).status_code == 401
+
+
+def test_backend_is_pluggable(client, make_user, principal_cache):
+    backend = principal_cache(load_backend("test_principal_cache:RecordingBackend"))
+    headers = make_user("plugged@example.com")
+
+    client.get("/tasks/", headers=headers)
+    client.get("/tasks/", headers=headers)
+    user_id = _user_id(client, headers, "plugged@example.com")
+    assert backend.calls[:3] == [("get", user_id), ("set", user_id), ("get", user_id)]
+    with pytest.raises(ValueError):
+        load_backend("redis")
@@ -0,0 +1,31 @@
+from sqlalchemy import text
+
+from app.db.session import AsyncSessionLocal, ReadSessionLocal
+
+
+async def _driver_in_transaction(sessionmaker) -> bool:
+    """Whether SQLite itself has a transaction open after the session's first query."""
+    async with sessionmaker() as db:
+        await db.execute(text("SELECT 1"))
+        raw = await (await db.connection()).get_raw_connection()
+        return raw.driver_connection.in_transaction
+
+
+def test_read_sessions_run_without_a_transaction(client, count_queries):
+    with count_queries() as queries:
+        assert client.portal.call(_driver_in_transaction, ReadSessionLocal) is False
+    assert queries == ["SELECT 1"]  # No BEGIN, and nothing to COMMIT or roll back
+
+    # Unlike a writing session (BEGIN IMMEDIATE on SQLite)
+    with count_queries() as queries:
+        assert client.portal.call(_driver_in_transaction, AsyncSessionLocal) is True
+    assert queries[0] == "BEGIN IMMEDIATE"
+
+
+def test_read_only_route_sends_only_its_query(client, make_user, count_queries):
+    headers = make_user("reader@example.com")
+    client.get("/tasks/", headers=headers)  # Caches the principal
+
+    with count_queries() as queries:
+        assert client.get("/tasks/", headers=headers).status_code == 200
+    assert len(queries) == 1 and queries[0].lstrip().startswith("SELECT")
@@ -0,0 +1,81 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from app.db import replicas as replicas_module, session as session_module
+from app.db.replicas import ReplicaSet
+from app.db.session import _make_replica, read_session
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(monotonic=lambda: 1000.0)
+    monkeypatch.setattr(replicas_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def replicas(tmp_path):
+    """A reachable replica (a database file of its own) and an unreachable one."""
+    path = tmp_path / "replica.db"
+    sqlite3.connect(path).close()
+    up = _make_replica(f"sqlite+aiosqlite:///{path}")
+    down = _make_replica(f"sqlite+aiosqlite:///{tmp_path}/missing-dir/replica.db")
+    return up, down
+
+
+def _use(monkeypatch, *replicas):
+    replica_set = ReplicaSet(list(replicas), "round_robin", retry_seconds=30)
+    monkeypatch.setattr(session_module, "replica_set", replica_set)
+    return replica_set
+
+
+async def _read_from(replicas) -> str:
+    """The database file a read session got, and each replica's open read sessions during it."""
+    async with read_session() as db:
+        in_use = [replica.in_use for replica in replicas]
+        return (await db.connection()).engine.url.database, in_use
+
+
+def test_unreachable_replica_is_skipped_for_the_retry_window(client, replicas, clock, monkeypatch):
+    up, down = replicas
+    _use(monkeypatch, down, up)
+
+    database, in_use = client.portal.call(_read_from, replicas)
+    assert database == up.engine.url.database and in_use == [1, 0]
+    assert up.in_use == 0  # Released with the session
+    assert (down.failures, down.available) == (1, False)
+
+    client.portal.call(_read_from, replicas)
+    assert down.failures == 1  # Not tried again within the window
+
+    clock.monotonic = lambda: 1031.0
+    assert client.portal.call(_read_from, replicas)[0] == up.engine.url.database
+    assert down.failures == 2
+    client.portal.call(up.engine.dispose)
+
+
+def test_reads_fall_back_to_the_primary(client, replicas, clock, monkeypatch):
+    _, down = replicas
+    _use(monkeypatch, down)
+
+    primary = session_module.read_engine.url.database
+    assert client.portal.call(_read_from, [down])[0] == primary
+    assert client.portal.call(_read_from, [down])[0] == primary
+    assert down.failures == 1
+
+
+def test_balancing_policies():
+    a, b, c = (SimpleNamespace(name=name, available=True, in_use=0) for name in "abc")
+
+    round_robin = ReplicaSet([a, b, c], "round_robin", 30)
+    assert [round_robin.candidates()[0].name for _ in range(4)] == ["a", "b", "c", "a"]
+    assert [replica.name for replica in round_robin.candidates()] == ["b", "c", "a"]  # The rest are fallbacks
+
+    a.in_use, b.in_use, c.in_use = 3, 0, 1
+    least_connections = ReplicaSet([a, b, c], "least_connections", 30)
+    assert [replica.name for replica in least_connections.candidates()] == ["b", "c", "a"]
+
+    b.available = False
+    assert [replica.name for replica in least_connections.candidates()] == ["c", "a"]
@@ -0,0 +1,85 @@
+import numpy as np
+
+from app.nlp.ann import make_index
+from app.nlp.index import FAQEntry
+from app.nlp.routing import CategoryRouter
+
+DIM = 8
+
+
+def _router():
+    rng = np.random.default_rng(0)
+    rows = [FAQEntry(id=i, question=f"q{i}", answer=f"a{i}", category="tax" if i < 6 else "billing") for i in range(10)]
+    vectors = rng.normal(size=(10, DIM)).astype(np.float32)
+    return CategoryRouter(rows, vectors, DIM), rows, vectors
+
+
+def _rebuild(router, category):
+    rows, vectors, changes = router.rebuild_job(category)
+    return router.install_partition(category, make_index(rows, vectors, router.dim), changes)
+
+
+def test_move_hides_faq_in_old_partition_until_rebuilt():
+    router, rows, vectors = _router()
+    tax = router.partitions["tax"]
+    router.upsert(FAQEntry(id=2, question="q2", answer="moved", category="billing"), None)
+
+    assert router.partitions["tax"] is tax  # Not rebuilt on the caller
+    assert router.get(2).answer == "moved"
+    assert router.sizes() == {"tax": 5, "billing": 5} and len(router) == 10
+    assert router.search(vectors[2], "tax")[0].id != 2
+    assert router.search(vectors[2], "billing")[0].answer == "moved"
+    assert router.search_many(vectors[[2]], "tax")[0][0].id != 2
+
+    assert router.rebuilds_due() == ["tax"]
+    assert _rebuild(router, "tax")
+    assert len(router.partitions["tax"]) == 5 and router.rebuilds_due() == []
+    assert router.search(vectors[2])[0].answer == "moved"
+
+
+def test_rebuild_started_before_a_write_is_discarded():
+    router, rows, vectors = _router()
+    router.upsert(FAQEntry(id=2, question="q2", answer="moved", category="billing"), None)
+    job = router.rebuild_job("tax")
+    router.upsert(FAQEntry(id=3, question="q3", answer="edited", category="tax"), None)
+
+    assert not router.install_partition("tax", make_index(job[0], job[1], DIM), job[2])
+    assert router.rebuilds_due() == ["tax"]
+    assert _rebuild(router, "tax")
+    assert router.get(3).answer == "edited" and router.partitions["tax"].get(3).answer == "edited"
+
+
+def test_moving_back_before_the_rebuild():
+    router, rows, vectors = _router()
+    router.upsert(FAQEntry(id=2, question="q2", answer="moved", category="billing"), None)
+    router.upsert(FAQEntry(id=2, question="q2", answer="back", category="tax"), None)
+
+    assert router.sizes() == {"tax": 6, "billing": 4}
+    assert router.search(vectors[2], "tax")[0].answer == "back"
+    assert router.search(vectors[2], "billing")[0].id != 2
+
+
+def test_moving_the_last_faq_drops_the_partition():
+    router, rows, vectors = _router()
+    router.upsert(FAQEntry(id=11, question="q11", answer="a11", category="payroll"), vectors[0])
+    router.upsert(FAQEntry(id=11, question="q11", answer="a11", category="tax"), None)
+    assert "payroll" not in router.partitions and router.rebuilds_due() == []
+
+
+def test_partition_dropped_after_routing_is_skipped():
+    router, rows, vectors = _router()
+    route = router.route
+
+    def route_then_drop(query):
+        # upsert on the event loop empties and drops "billing" while a search in the pool has routed to it
+        categories = route(query)
+        router.partitions.pop("billing", None)
+        return categories
+
+    router.route = route_then_drop
+    assert router.search(vectors[8])[0].category == "tax"
+    assert all(row.category == "tax" for row, _ in router.search_many(vectors[[7, 8]]))
+    router.route = route
+
+    assert router.get(8) is None
+    assert router.search_among(vectors[8], [1, 8])[0].id == 1
@@ -0,0 +1,29 @@
+from app.auth.auth_handler import hash_pool
+
+
+def test_tasks_of_other_users_are_not_found(client, make_user):
+    owner = make_user("task-owner@example.com")
+    intruder = make_user("task-intruder@example.com")
+    task_id = client.post("/tasks/", json={"title": "Private"}, headers=owner).json()["id"]
+    edit = {"title": "Taken over"}
+
+    assert client.get(f"/tasks/{task_id}", headers=intruder).status_code == 404
+    assert client.put(f"/tasks/{task_id}", json=edit, headers=intruder).status_code == 404
+    assert client.delete(f"/tasks/{task_id}", headers=intruder).status_code == 404
+    assert client.get(f"/tasks/{task_id}", headers=owner).json()["title"] == "Private"
+
+    response = client.put(f"/tasks/{task_id}", json=edit, headers=owner)
+    assert response.status_code == 200
+    assert response.json()["title"] == "Taken over"
+    assert client.delete(f"/tasks/{task_id}", headers=owner).status_code == 204
+    assert client.get(f"/tasks/{task_id}", headers=owner).status_code == 404
+    assert client.delete(f"/tasks/{task_id}", headers=owner).status_code == 404
+
+
+def test_duplicate_sign_up_is_refused_without_hashing(client, make_user):
+    make_user("taken@example.com")
+    hashed = hash_pool.completed
+
+    response = client.post("/users/", json={"email": "taken@example.com", "password": "other"})
+    assert response.status_code == 400
+    assert hash_pool.completed == hashed
@@ -0,0 +1,113 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from jose import JWTError, jwt
+
+from app.auth import auth_handler
+from app.auth.auth_handler import create_access_token, _token_digest
+from app.auth.revocation import LocalTokenDenylist, load_backend
+from app.core.cache import TTLCache
+
+
+def verify_access_token(token: str) -> int:
+    return asyncio.run(auth_handler.verify_access_token(token))
+
+
+@pytest.fixture
+def token_cache(monkeypatch):
+    """A fresh verified-token cache for one test."""
+
+    def make(max_size: int = 100) -> TTLCache:
+        cache = TTLCache(max_size, 3600)
+        monkeypatch.setattr(auth_handler, "token_cache", cache)
+        return cache
+
+    return make
+
+
+@pytest.fixture
+def denylist(monkeypatch):
+    denylist = LocalTokenDenylist()
+    monkeypatch.setattr(auth_handler, "token_denylist", denylist)
+    return denylist
+
+
+def test_repeat_requests_skip_the_jwt_check(client, make_user, token_cache):
+    cache = token_cache()
+    headers = make_user("cached@example.com")
+
+    assert client.get("/tasks/", headers=headers).status_code == 200
+    assert client.get("/tasks/", headers=headers).status_code == 200
+    assert (len(cache), cache.hits) == (1, 1)
+
+
+def test_cached_token_is_rejected_once_expired(client, token_cache):
+    cache = token_cache()
+    token = create_access_token({"sub": "1"}, expires_delta=timedelta(seconds=-10))
+    # As if it had been verified while still valid: the entry outlives the token
+    cache.set(_token_digest(token), (1, jwt.get_unverified_claims(token)["exp"]), ttl=3600)
+
+    with pytest.raises(JWTError):
+        verify_access_token(token)
+    response = client.get("/tasks/", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+
+
+def test_cache_is_bounded(token_cache):
+    cache = token_cache(max_size=2)
+    tokens = [create_access_token({"sub": str(user_id)}) for user_id in (1, 2, 3)]
+
+    assert [verify_access_token(token) for token in tokens] == [1, 2, 3]
+    assert (len(cache), cache.evictions) == (2, 1)
+    assert cache.get(_token_digest(tokens[0])) is None
+    # An evicted token is simply verified again
+    assert verify_access_token(tokens[0]) == 1
+
+
+def test_disabled_cache_still_verifies(token_cache):
+    cache = token_cache(max_size=0)
+    token = create_access_token({"sub": "7"})
+
+    assert verify_access_token(token) == 7
+    assert verify_access_token(token) == 7
+    assert len(cache) == 0
+
+
+def test_invalid_tokens_are_not_cached(token_cache):
+    cache = token_cache()
+    forged = jwt.encode({"sub": "1"}, "not-the-secret", algorithm=auth_handler.ALGORITHM)
+
+    for token in ("not-a-token", forged):
+        with pytest.raises(JWTError):
+            verify_access_token(token)
+    assert len(cache) == 0
+
+
+def test_revoked_token_is_rejected_while_cached(token_cache, denylist):
+    cache = token_cache()
+    token = create_access_token({"sub": "1"})
+    assert verify_access_token(token) == 1
+
+    # Revoked through a denylist shared with another worker: this worker's cache still has it
+    claims = jwt.get_unverified_claims(token)
+    asyncio.run(denylist.revoke(_token_digest(token), claims["exp"]))
+    assert cache.get(_token_digest(token)) is not None
+
+    with pytest.raises(JWTError):
+        verify_access_token(token)
+
+
+def test_logout_revokes_the_token(client, make_user, denylist):
+    headers = make_user("logout@example.com")
+    assert client.get("/tasks/", headers=headers).status_code == 200
+
+    assert client.post("/logout", headers=headers).status_code == 204
+    assert client.get("/tasks/", headers=headers).status_code == 401
+    assert client.get("/metrics/auth").json()["token_cache"]["revoked"]["size"] == 1
+
+
+def test_denylist_backend_is_pluggable():
+    assert isinstance(load_backend("app.auth.revocation:LocalTokenDenylist"), LocalTokenDenylist)
+    with pytest.raises(ValueError):
+        load_backend("redis")